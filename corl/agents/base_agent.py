@@ -22,11 +22,12 @@ from typing import Any, Dict, List, MutableMapping, Union
 import flatten_dict
 import gym
 from pydantic import BaseModel, PyObject, validator
+from ray.rllib.utils.spaces.repeated import Repeated
 
 from corl.dones.done_func_base import DoneFuncBase
 from corl.dones.episode_length_done import EpisodeLengthDone
 from corl.episode_parameter_providers import EpisodeParameterProvider, Randomness
-from corl.glues.base_glue import BaseAgentGlue
+from corl.glues.base_glue import BaseAgentGlue, TrainingExportBehavior
 from corl.libraries.env_space_util import EnvSpaceUtil
 from corl.libraries.environment_dict import DoneDict, RewardDict
 from corl.libraries.factory import Factory
@@ -260,6 +261,16 @@ class BaseAgentParser(BaseModel):
         return f.numerator / f.denominator
 
 
+def _holds_repeated(space: gym.spaces.Space) -> bool:
+    """True when the space or one of its sub spaces is a Repeated space"""
+    if isinstance(space, Repeated):
+        return True
+    if isinstance(space, (gym.spaces.Dict, gym.spaces.Tuple)):
+        children = space.spaces.values() if isinstance(space, gym.spaces.Dict) else space.spaces
+        return any(_holds_repeated(child) for child in children)
+    return False
+
+
 class BaseAgent:  # pylint: disable=too-many-public-methods
     """
     Base class representing an agent in an environment.
@@ -271,6 +282,9 @@ class BaseAgent:  # pylint: disable=too-many-public-methods
         self.agent_reward_dict = RewardDict()
         self.agent_done_dict = DoneDict()
         # self._agent_glue_obs_export_behavior = {}
+        # observations of the last get_observations call, the platforms have not changed since
+        self._last_observations: typing.Optional[collections.OrderedDict] = None
+        self._export_plan: typing.Optional[collections.OrderedDict] = None
 
         # Sample parameter provider
         # This RNG only used here.  Normal use uses the one from the environment.
@@ -386,6 +400,8 @@ class BaseAgent:  # pylint: disable=too-many-public-methods
         None
         """
         self.agent_glue_dict.clear()
+        self._last_observations = None
+        self._export_plan = None
         for glue_dict in self.config.glues:
             created_glue = glue_dict.create_functor_object(
                 platform=platform,
@@ -509,7 +525,9 @@ class BaseAgent:  # pylint: disable=too-many-public-methods
         None
         """
         raw_action_dict = collections.OrderedDict()
-        obs = self.get_observations()
+        # the simulator has not stepped since the environment collected the observations, glues are not
+        # observed twice per step (stateful glues such as FrameStackGlue advance on every observation)
+        obs = self._last_observations if self._last_observations is not None else self.get_observations()
         for glue_name, glue_object in self.agent_glue_dict.items():
             if glue_name in action_dict:
                 normalized_action = action_dict[glue_name]
@@ -538,6 +556,11 @@ class BaseAgent:  # pylint: disable=too-many-public-methods
         """
         ...
 
+    @property
+    def thread_safe_observations(self) -> bool:
+        """Whether every glue of the agent declares a thread safe get_observation"""
+        return all(glue_object.thread_safe for glue_object in self.agent_glue_dict.values())
+
     def get_observations(self):
         """
         Gets combined observation from agent glues.
@@ -552,6 +575,7 @@ class BaseAgent:  # pylint: disable=too-many-public-methods
             glue_obs = glue_object.get_observation()
             if glue_obs:
                 return_observation[glue_name] = glue_obs
+        self._last_observations = return_observation
         return return_observation
 
     def get_info_dict(self):
@@ -678,6 +702,27 @@ class BaseAgent:  # pylint: disable=too-many-public-methods
             return glue_obj.normalize_observation(obs)
         return None
 
+    def export_plan(self) -> collections.OrderedDict:
+        """
+        The normalize functions of the observations exported for training, built once per set of glues
+
+        Returns
+        -------
+        OrderedDict[str, typing.Callable]
+            A dictionary of the glues with an INCLUDE training export behavior in the form {glue_name: normalize_fn}
+        """
+        if self._export_plan is None:
+            self._export_plan = collections.OrderedDict()
+            for glue_name, glue_obj in self.agent_glue_dict.items():
+                if glue_obj.config.training_export_behavior != TrainingExportBehavior.INCLUDE:
+                    continue
+                if _holds_repeated(glue_obj.observation_space()):
+                    # the lists of Repeated samples are scaled in place, the raw observation must not change
+                    self._export_plan[glue_name] = lambda obs, glue_obj=glue_obj: glue_obj.normalize_observation(copy.deepcopy(obs))
+                else:
+                    self._export_plan[glue_name] = glue_obj.normalize_observation
+        return self._export_plan
+
     def normalize_observations(self, observations: collections.OrderedDict) -> collections.OrderedDict:
         """
         Normalizes glue observations according to glue definition.
@@ -18,7 +18,7 @@ from enum import Enum
 import numpy as np
 from pydantic import BaseModel
 
-from corl.libraries.env_func_base import EnvFuncBase
+from corl.libraries.env_func_base import BatchedEnvFunc, EnvFuncBase
 from corl.libraries.environment_dict import DoneDict
 from corl.libraries.state_dict import StateDict
 from corl.simulators.base_parts import BaseTimeSensor
@@ -120,6 +120,46 @@ class DoneFuncBase(EnvFuncBase):
         ...
 
 
+class BatchedDoneFuncBase(BatchedEnvFunc, DoneFuncBase):
+    """Done functor evaluated for all the agents sharing it in a single call
+
+    Subclasses implement batch_call instead of __call__, the DoneDict of each functor is expected to go through
+    _set_all_done like the per agent done functors.
+    """
+
+    @classmethod
+    @abc.abstractmethod
+    def batch_call(  # pylint: disable=arguments-differ
+        cls,
+        functors: typing.Sequence['BatchedDoneFuncBase'],
+        observation: OrderedDict,
+        action: OrderedDict,
+        next_observation: OrderedDict,
+        next_state: StateDict,
+        observation_space: StateDict,
+        observation_units: StateDict,
+    ) -> typing.List[DoneDict]:
+        """The DoneDict of each functor, see BatchedEnvFunc.batch_call"""
+
+    def __call__(
+        self,
+        observation: OrderedDict,
+        action: OrderedDict,
+        next_observation: OrderedDict,
+        next_state: StateDict,
+        observation_space: StateDict,
+        observation_units: StateDict,
+    ) -> DoneDict:
+        return self._pop_batched_result(
+            observation=observation,
+            action=action,
+            next_observation=next_observation,
+            next_state=next_state,
+            observation_space=observation_space,
+            observation_units=observation_units,
+        )
+
+
 class SharedDoneFuncBaseValidator(BaseModel):
     """
     name : str
@@ -10,18 +10,20 @@ limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
 Done condition for OpenAIGymSimulator
 """
-from corl.dones.done_func_base import DoneFuncBase
+from corl.dones.done_func_base import BatchedDoneFuncBase
 from corl.libraries.environment_dict import DoneDict
 
 
-class OpenAIGymDone(DoneFuncBase):
+class OpenAIGymDone(BatchedDoneFuncBase):
     """
     A done functor that simply mirrors the done condition coming from the sim state
     this only works with the OpenAIGymSimulator
     """
 
-    def __call__(
-        self,
+    @classmethod
+    def batch_call(
+        cls,
+        functors,
         observation,
         action,
         next_observation,
@@ -29,7 +31,9 @@ class OpenAIGymDone(DoneFuncBase):
         observation_space,
         observation_units,
     ):
-        done = DoneDict()
-        done[self.config.agent_name] = next_state.dones[self.config.agent_name]
-        self._set_all_done(done)
-        return done
+        dones = []
+        for functor in functors:
+            done = DoneDict()
+            done[functor.config.agent_name] = next_state.dones[functor.config.agent_name]
+            dones.append(functor._set_all_done(done))  # pylint: disable=protected-access
+        return dones
@@ -13,10 +13,7 @@ EnvironmentDefaultCallbacks
 # pylint: disable=arguments-differ, W0613
 import typing
 import warnings
-from collections import defaultdict
 
-import numpy as np
-from flatten_dict import flatten
 from gym.utils import seeding
 from ray.rllib import BaseEnv
 from ray.rllib.agents.callbacks import DefaultCallbacks
@@ -27,6 +24,8 @@ from ray.rllib.utils.typing import AgentID, PolicyID
 
 from corl.dones.done_func_base import DoneStatusCodes
 from corl.environment.multi_agent_env import ACT3MultiAgentEnv
+from corl.environment.utils.flat_metrics import FlatMetrics
+from corl.environment.utils.metric_reduction import METRIC_OPS, MetricReducer
 
 SHORT_EPISODE_THRESHOLD = 5
 
@@ -82,16 +81,35 @@ class EnvironmentDefaultCallbacks(DefaultCallbacks):
     Make sure you call the super function for all derived functions or else there will be unexpected callback behavior
     """
 
-    DEFAULT_METRIC_OPS = {
-        "min": np.min,
-        "max": np.max,
-        "median": np.median,
-        "mean": np.mean,
-        "var": np.var,
-        "std": np.std,
-        "sum": np.sum,
-        "nonzero": np.count_nonzero,
-    }
+    DEFAULT_METRIC_OPS = METRIC_OPS
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # compiled key plans per (sub environment, metric group), reused by every episode run on that sub environment
+        self._flat_metrics: typing.Dict[typing.Tuple[int, str], FlatMetrics] = {}
+        self._metric_reducer: typing.Optional[MetricReducer] = None
+
+    def flat_metrics(self, env_id: int, group: str, prefix: str = "") -> FlatMetrics:
+        """The flattener of a metric group for a sub environment
+
+        Parameters
+        ----------
+        env_id : int
+            index of the sub environment running the episode
+        group : str
+            name of the metric group
+        prefix : str
+            prepended to every flat key of the group
+
+        Returns
+        -------
+        FlatMetrics
+            flattener whose compiled key plan persists across episodes
+        """
+        flat_metrics = self._flat_metrics.get((env_id, group))
+        if flat_metrics is None:
+            flat_metrics = self._flat_metrics[(env_id, group)] = FlatMetrics(prefix)
+        return flat_metrics
 
     def on_episode_start(
         self,
@@ -119,7 +137,9 @@ class EnvironmentDefaultCallbacks(DefaultCallbacks):
         """
         super().on_episode_start(worker=worker, base_env=base_env, policies=policies, episode=episode, **kwargs)
 
-        episode.user_data["rewards_accumulator"] = defaultdict(float)  # default dict with default value of 0.0
+        rewards_accumulator = self.flat_metrics(episode.env_id, "rewards_cumulative", "rewards_cumulative/")
+        rewards_accumulator.reset()
+        episode.user_data["rewards_accumulator"] = rewards_accumulator
 
     def on_episode_step(
         self,
@@ -152,10 +172,7 @@ class EnvironmentDefaultCallbacks(DefaultCallbacks):
         env = base_env.get_sub_environments()[episode.env_id]
 
         if env.reward_info:
-            rewards_accumulator = episode.user_data["rewards_accumulator"]
-            for reward_name, reward_val in flatten(env.reward_info, reducer="path").items():
-                key = f"rewards_cumulative/{reward_name}"
-                rewards_accumulator[key] += reward_val
+            episode.user_data["rewards_accumulator"].accumulate(env.reward_info)
 
     def on_episode_end(  # pylint: disable=too-many-branches
         self,
@@ -205,29 +222,22 @@ class EnvironmentDefaultCallbacks(DefaultCallbacks):
 
         env = base_env.get_sub_environments()[episode.env_id]
         if env.glue_info:  # pylint: disable=too-many-nested-blocks
-            for glue_name, metric_val in flatten(env.glue_info, reducer="path").items():
-                episode.custom_metrics[glue_name] = metric_val
+            episode.custom_metrics.update(self.flat_metrics(episode.env_id, "glue_info").items(env.glue_info))
 
         if env.reward_info:
-            for reward_name, reward_val in flatten(env.reward_info, reducer="path").items():
-                key = f"rewards/{reward_name}"
-                episode.custom_metrics[key] = reward_val
+            episode.custom_metrics.update(self.flat_metrics(episode.env_id, "rewards", "rewards/").items(env.reward_info))
 
         log_done_info(env, episode)
 
         log_done_status(env, episode)
 
         # Variables
-        for key, value in flatten(env.local_variable_store, reducer="path").items():
-            try:
-                episode.custom_metrics[f'variable/env/{key}'] = float(value.value)
-            except ValueError:
-                pass
-
-        for agent_name, agent_data in env.agent_dict.items():
-            for key, value in flatten(agent_data.local_variable_store, reducer="path").items():
+        variable_stores = [("env", env.local_variable_store)]
+        variable_stores.extend((agent_name, agent_data.local_variable_store) for agent_name, agent_data in env.agent_dict.items())
+        for store_name, store in variable_stores:
+            for key, value in self.flat_metrics(episode.env_id, f"variable/{store_name}", f"variable/{store_name}/").items(store):
                 try:
-                    episode.custom_metrics[f'variable/{agent_name}/{key}'] = float(value.value)
+                    episode.custom_metrics[key] = float(value.value)
                 except ValueError:
                     pass
 
@@ -242,8 +252,36 @@ class EnvironmentDefaultCallbacks(DefaultCallbacks):
                 episode.custom_metrics[f'adr/{agent_name}/{k}'] = v
 
         # Cumulative Rewards
-        for key, value in episode.user_data["rewards_accumulator"].items():
-            episode.custom_metrics[key] = value
+        episode.custom_metrics.update(episode.user_data["rewards_accumulator"].items())
+
+        if env.config.episode_metrics is not None:
+            env.episode_metrics_writer.record(
+                {
+                    "episode_id": episode.episode_id,
+                    "worker_index": env.config.worker_index,
+                    "env_id": episode.env_id,
+                    "length": episode.length,
+                    "total_reward": episode.total_reward,
+                },
+                episode.custom_metrics
+            )
+
+        self.reduce_custom_metrics(env, episode)
+
+    def reduce_custom_metrics(self, env, episode) -> None:
+        """Apply the metric selection and reduction of the environment config to the episode custom metrics
+
+        The worker reducer is built from the config of the first environment that ends an episode.
+        Metrics added by derived classes after calling on_episode_end are reported as is.
+        """
+        if self._metric_reducer is None:
+            self._metric_reducer = MetricReducer(env.config.metrics)
+        if self._metric_reducer.passthrough:
+            return
+        metrics = self._metric_reducer.reduce(episode.custom_metrics)
+        # rllib keeps a reference to the dict, it has to be updated in place
+        episode.custom_metrics.clear()
+        episode.custom_metrics.update(metrics)
 
     def on_postprocess_trajectory(
         self,
@@ -21,6 +21,7 @@ import pickle
 import sys
 import typing
 from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from itertools import chain
 from json import JSONEncoder, dumps, loads
@@ -39,6 +40,15 @@ import corl.environment.utils.env_creation as env_creation
 from corl.agents.base_agent import AgentParseInfo
 from corl.dones.done_func_base import DoneFuncBase, SharedDoneFuncBase
 from corl.dones.episode_length_done import EpisodeLengthDone
+from corl.environment.utils.episode_data_recorder import (
+    EpisodeDataRecorder,
+    EpisodeDataRecorderConfig,
+    platform_state,
+    platform_state_space,
+    platform_static_attributes,
+)
+from corl.environment.utils.episode_metrics_writer import EpisodeMetricsWriter, EpisodeMetricsWriterConfig
+from corl.environment.utils.metric_reduction import MetricReductionConfig
 from corl.environment.utils.obs_buffer import ObsBuffer
 from corl.environment.utils.space_sort import gym_space_sort
 from corl.episode_parameter_providers import EpisodeParameterProvider
@@ -48,11 +58,13 @@ from corl.glues.base_multi_wrapper import BaseMultiWrapperGlue
 from corl.glues.base_wrapper import BaseWrapperGlue
 from corl.glues.common.controller_glue import ControllerGlue
 from corl.libraries.collection_utils import get_dictionary_subset
+from corl.libraries.env_func_base import evaluate_batched
 from corl.libraries.env_space_util import EnvSpaceUtil
 from corl.libraries.environment_dict import DoneDict, RewardDict
 from corl.libraries.factory import Factory
 from corl.libraries.functor import Functor, ObjectStoreElem
-from corl.libraries.observation_util import filter_observations, mutate_observations
+from corl.libraries.nan_check import nan_check_observations
+from corl.libraries.observation_util import export_observations
 from corl.libraries.parameters import Parameter
 from corl.libraries.plugin_library import PluginLibrary
 from corl.libraries.state_dict import StateDict
@@ -143,6 +155,8 @@ class ACT3MultiAgentEnvValidator(BaseModel):
     vector_index: typing.Optional[NonNegativeInt] = None
     remote: bool = False
     deep_sanity_check: bool = True
+    nan_check: bool = True  # vectorized nan check of every agent observation at each step
+    functor_threads: NonNegativeInt = 0  # threads running the thread safe functors and agent glue observations, 0 runs them in sequence
 
     seed: PositiveInt = 0
     horizon: PositiveInt = 1000
@@ -178,6 +192,9 @@ class ACT3MultiAgentEnvValidator(BaseModel):
     max_agent_rate: int = 20  # the maximum rate (in Hz) that an agent may be run at
     timestep_epsilon: float = 1e-3
     sim_warmup_steps: int = 0  # number of times to step simulator before getting initial obs
+    metrics: MetricReductionConfig = MetricReductionConfig()  # selection and reduction of the episode custom metrics
+    episode_metrics: typing.Optional[EpisodeMetricsWriterConfig] = None  # per episode records written under output_path
+    episode_recorder: typing.Optional[EpisodeDataRecorderConfig] = None  # per step episode data written under output_path
 
     @property
     def epp(self) -> EpisodeParameterProvider:
@@ -395,8 +412,14 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         # Random numbers
         self.seed(self.config.seed)
 
+        # thread safe functors and glues are evaluated concurrently when enabled
+        self._executor: typing.Optional[ThreadPoolExecutor] = None
+        if self.config.functor_threads > 0:
+            self._executor = ThreadPoolExecutor(max_workers=self.config.functor_threads, thread_name_prefix="ACT3MultiAgentEnv")
+
         # setup default instance variables
-        self._actions: list = []
+        # the last actions are kept for the crash dumps, as many as the ring buffer of the episode recorder holds
+        self._actions: deque = deque(maxlen=(self.config.episode_recorder or EpisodeDataRecorderConfig()).buffer_steps)
         self._obs_buffer = ObsBuffer()
         self._reward: RewardDict = RewardDict()
         self._done: DoneDict = DoneDict()
@@ -422,7 +445,11 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         }
 
         self.agent_dict, extra_sim_init_args["agent_configs"] = env_creation.create_agent_sim_configs(
-            self.config.agents, self.config.agent_platforms, self.config.simulator.type, self.config.platforms, self.config.epp_registry,
+            self.config.agents,
+            self.config.agent_platforms,
+            self.config.simulator.type.parts_simulator(self.config.simulator.config),
+            self.config.platforms,
+            self.config.epp_registry,
             multiple_workers=(self.config.num_workers > 0)
         )
 
@@ -529,6 +556,27 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
 
         self._skip_action = False
 
+        self._episode_metrics_writer: typing.Optional[EpisodeMetricsWriter] = None
+        self._episode_recorder: typing.Optional[EpisodeDataRecorder] = None
+        if self.config.episode_recorder is not None:
+            recorder_config = self.config.episode_recorder
+            recorder_spaces = {
+                "action": self._normalized_action_space,
+                "observation": self._observation_space,
+                "normalized_observation": self._normalized_observation_space,
+            }
+            static_attributes = None
+            if recorder_config.record_platforms:
+                recorder_spaces["platform"] = platform_state_space(self._state.sim_platforms, recorder_config.platform_attributes)
+                static_attributes = platform_static_attributes(self._state.sim_platforms, recorder_config.static_platform_attributes)
+            self._episode_recorder = EpisodeDataRecorder(
+                os.path.join(self.config.output_path, recorder_config.directory),
+                recorder_spaces,
+                list(self.agent_dict),
+                recorder_config,
+                static_attributes,
+            )
+
     @property
     def get_validator(self) -> typing.Type[ACT3MultiAgentEnvValidator]:
         """Get the validator for this class."""
@@ -547,8 +595,8 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         self._make_dones()
         self._shared_done: DoneDict = self._make_shared_dones()
 
-        self._reward: RewardDict = RewardDict()
-        self._done: DoneDict = DoneDict()
+        self._reward.clear()
+        self._done.clear()
         self._done_info.clear()
 
         self.set_default_done_reward()
@@ -592,6 +640,12 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
             self._state.episode_history[platform.name].clear()
             self._state.episode_state[platform.name] = OrderedDict()
 
+        if self.config.nan_check:
+            try:
+                nan_check_observations(self._obs_buffer.observation)
+            except ValueError as err:
+                self._save_state_pickle(err)
+
         # Sanity Checks and Scale
         # The current deep sanity check will not raise error if values are from sample are different from space during reset
         if self.config.deep_sanity_check:
@@ -611,6 +665,14 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         # OrderedDicts
         #####################################################################
         trainable_observations, _ = self.create_training_observations(agent_list, self._obs_buffer)
+        if self._episode_recorder is not None:
+            self._episode_recorder.start_episode(self._episode, self._episode_id)
+            self._episode_recorder.record(
+                self._state.sim_time,
+                observation=self._obs_buffer.observation,
+                normalized_observation=trainable_observations,
+                platform=self._recorded_platform_state(),
+            )
         return trainable_observations
 
     def _reset_simulator(self, agent_configs=None) -> typing.Tuple[StateDict, typing.Dict[str, typing.Any]]:
@@ -756,7 +818,7 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
             next_state=self._state,
             observation_space=self._observation_space,
             observation_units=self._observation_units,
-            local_dones=copy.deepcopy(agents_done),
+            local_dones=OrderedDict(agents_done),
             local_done_info=copy.deepcopy(self._done_info)
         )
 
@@ -822,6 +884,12 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         # default to every time if not specified... Once the limits are good we it is
         # recommended to increase this for training
 
+        if self.config.nan_check:
+            try:
+                nan_check_observations(self._obs_buffer.observation)
+            except ValueError as err:
+                self._save_state_pickle(err)
+
         if self.config.deep_sanity_check:
             if self._episode_length % self.config.sanity_check_obs == 0:
                 try:
@@ -875,6 +943,19 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
             if plat_name in platforms_deleted:
                 trainable_dones[agent_key] = True
 
+        if self._episode_recorder is not None:
+            self._episode_recorder.record(
+                self._state.sim_time,
+                action=action_dict,
+                observation=self._obs_buffer.observation,
+                normalized_observation=complete_trainable_observations,
+                reward=trainable_rewards,
+                done=trainable_dones,
+                platform=self._recorded_platform_state(),
+            )
+            if agents_done['__all__']:
+                self._episode_recorder.end_episode()
+
         #####################################################################
         # return results to RLLIB - Note that RLLIB does not do a recursive
         # isinstance call and as such need to make sure items are
@@ -891,18 +972,28 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         merge_strategies.append((bool, or_merge))
         or_merger = deepmerge.Merger(merge_strategies, [], [])
 
+        call_kwargs = {
+            "observation": self._obs_buffer.observation,
+            "action": raw_action_dict,
+            "next_observation": self._obs_buffer.next_observation,
+            "next_state": self._state,
+            "observation_space": self._observation_space,
+            "observation_units": self._observation_units,
+        }
+        # batched done functors are evaluated once for all the agents sharing them
+        evaluate_batched(
+            chain.from_iterable(self.agent_dict[agent_id].agent_done_dict.filtered_process_callbacks for agent_id in alive_agents),
+            **call_kwargs
+        )
+        if self._executor is not None:
+            for agent_id in alive_agents:
+                self.agent_dict[agent_id].agent_done_dict.submit(self._executor, **call_kwargs)
+
         done = OrderedDict()
         done["__all__"] = False
         for agent_id in alive_agents:
             agent_class = self.agent_dict[agent_id]
-            platform_done, done_info = agent_class.get_dones(
-                observation=self._obs_buffer.observation,
-                action=raw_action_dict,
-                next_observation=self._obs_buffer.next_observation,
-                next_state=self._state,
-                observation_space=self._observation_space,
-                observation_units=self._observation_units
-            )
+            platform_done, done_info = agent_class.get_dones(**call_kwargs)
             done[agent_id] = platform_done[agent_class.platform_name]
             # get around reduction
             done["__all__"] = done["__all__"] if done["__all__"] else platform_done.get("__all__", False)
@@ -911,18 +1002,28 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         return done
 
     def __get_reward_from_agents(self, alive_agents: typing.Iterable[str], raw_action_dict):
+        call_kwargs = {
+            "observation": self._obs_buffer.observation,
+            "action": raw_action_dict,
+            "next_observation": self._obs_buffer.next_observation,
+            "state": self._state,
+            "next_state": self._state,
+            "observation_space": self._observation_space,
+            "observation_units": self._observation_units,
+        }
+        # batched reward functors are evaluated once for all the agents sharing them
+        evaluate_batched(
+            chain.from_iterable(self.agent_dict[agent_id].agent_reward_dict.filtered_process_callbacks for agent_id in alive_agents),
+            **call_kwargs
+        )
+        if self._executor is not None:
+            for agent_id in alive_agents:
+                self.agent_dict[agent_id].agent_reward_dict.submit(self._executor, **call_kwargs)
+
         reward = OrderedDict()
         for agent_id in alive_agents:
             agent_class = self.agent_dict[agent_id]
-            agent_reward, reward_info = agent_class.get_rewards(
-                observation=self._obs_buffer.observation,
-                action=raw_action_dict,
-                next_observation=self._obs_buffer.next_observation,
-                state=self._state,
-                next_state=self._state,
-                observation_space=self._observation_space,
-                observation_units=self._observation_units
-            )
+            agent_reward, reward_info = agent_class.get_rewards(**call_kwargs)
             # it is possible to have a HL policy that does not compute an reward
             # in this case just return a zero for reward value
             if agent_id in agent_reward:
@@ -973,21 +1074,8 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
                     " obs from the previous timestep as a fallback"
                 )
 
-        def do_export(agent_id, obs_name, _obs):
-            if agent_id in alive_agents:
-                glue_obj = self.agent_dict[agent_id].get_glue(obs_name)
-                if glue_obj is not None:
-                    return glue_obj.config.training_export_behavior == TrainingExportBehavior.INCLUDE
-            return False
-
-        filtered_observations = filter_observations(this_steps_obs, do_export)
-
-        normalized_observations = mutate_observations(
-            filtered_observations,
-            lambda agent_id,  # type: ignore
-            obs_name,
-            obs: self.agent_dict[agent_id].normalize_observation(obs_name, obs)  # type: ignore
-        )
+        export_plan = {agent_id: self.agent_dict[agent_id].export_plan() for agent_id in this_steps_obs}
+        normalized_observations, filtered_observations = export_observations(this_steps_obs, export_plan)
 
         return normalized_observations, filtered_observations
 
@@ -1002,6 +1090,13 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         """
         return_observation: OrderedDict = OrderedDict()
         p_names = [item.name for item in self._state.sim_platforms]
+        futures = {}
+        if self._executor is not None:
+            futures = {
+                agent_id: self._executor.submit(self.agent_dict[agent_id].get_observations)
+                for agent_id in alive_agents
+                if self.agent_dict[agent_id].platform_name in p_names and self.agent_dict[agent_id].thread_safe_observations
+            }
         for agent_id in alive_agents:
             agent_class = self.agent_dict[agent_id]
             # TODO: Why is this check required here?
@@ -1013,7 +1108,7 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
                 )
                 agent_class.set_removed(True)
             else:
-                glue_obj_obs = agent_class.get_observations()
+                glue_obj_obs = futures[agent_id].result() if agent_id in futures else agent_class.get_observations()
                 if len(glue_obj_obs) > 0:
                     return_observation[agent_id] = glue_obj_obs
         return return_observation
@@ -1401,7 +1496,9 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
         def to_dict(input_ordered_dict):
             return loads(dumps(input_ordered_dict, cls=NumpyArrayEncoder))
 
-        p_dict['action'] = self._actions  # type: ignore
+        p_dict['action'] = list(self._actions)  # type: ignore
+        if self._episode_recorder is not None:
+            p_dict['recent_steps'] = self._episode_recorder.recent()
         p_dict["observation"] = self._obs_buffer.observation  # type: ignore
         p_dict["dones"] = to_dict(self._done_info)  # type: ignore
         # p_dict["env_config"] = copy.deepcopy(self.env_config)  # type: ignore
@@ -1411,6 +1508,33 @@ class ACT3MultiAgentEnv(MultiAgentEnv):
 
         raise ValueError(f"Error occurred: {err} \n Saving sanity check failure output pickle to file: {out_pickle}")
 
+    def _recorded_platform_state(self) -> typing.Optional[OrderedDict]:
+        """States of the platforms for the episode recorder, None unless it records the platforms"""
+        recorder_config = self.config.episode_recorder
+        if recorder_config is None or not recorder_config.record_platforms:
+            return None
+        return platform_state(self._state.sim_platforms, recorder_config.platform_attributes)
+
+    @property
+    def episode_metrics_writer(self) -> typing.Optional[EpisodeMetricsWriter]:
+        """The writer of the per episode records configured by episode_metrics, started on first use"""
+        if self._episode_metrics_writer is None and self.config.episode_metrics is not None:
+            self._episode_metrics_writer = EpisodeMetricsWriter(
+                os.path.join(self.config.output_path, self.config.episode_metrics.directory), self.config.episode_metrics
+            )
+        return self._episode_metrics_writer
+
+    def close(self):
+        """Write the buffered episode data and stop the writer and functor threads, rllib calls it when a worker stops"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            # an env used after close evaluates its functors serially
+            self._executor = None
+        if self._episode_metrics_writer is not None:
+            self._episode_metrics_writer.close()
+        if self._episode_recorder is not None:
+            self._episode_recorder.close()
+
     def seed(self, seed=None):
         """generates environment seed through rllib
 
@@ -0,0 +1,471 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Compact per step recording of the episodes of an environment
+
+Every step is one fixed width row per column (sim time, actions, raw and normalized observations,
+rewards, dones and optionally the platform states replayed by the ReplaySimulator), the samples of
+the agents are flattened with the SpaceLayout of their space. Rows go to a bounded ring buffer, which
+also provides the last steps to crash dumps. Full chunks of rows are handed to a background thread that
+writes them as compressed arrays into one file per episode:
+
+    <episode file>.npz
+        meta.json                 columns, agents, chunk size and number of steps
+        spaces.pkl                pickled spaces used to unflatten the samples
+        static.pkl                pickled static attributes of the platforms
+        <column>/<chunk>.npy      chunk_steps rows of a column, the last chunk may be shorter
+
+The file is a regular npz archive, EpisodeDataReader loads single chunks to access any step.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import pickle
+import queue
+import threading
+import time
+import typing
+import zipfile
+from collections import OrderedDict
+
+import gym
+import numpy as np
+from pydantic import BaseModel, PositiveInt, conint, root_validator
+
+from corl.environment.utils.shared_memory_runner import SpaceLayout
+
+_logger = logging.getLogger(__name__)
+
+_OPEN = 0
+_CHUNK = 1
+_FINISH = 2
+_CLOSE = 3
+
+ALL_DONE = "__all__"
+
+# columns flattened with the layout of a space and their dtype
+SPACE_COLUMNS: typing.Dict[str, typing.Any] = OrderedDict(
+    [("action", np.float32), ("observation", np.float64), ("normalized_observation", np.float32), ("platform", np.float64)]
+)
+
+
+class EpisodeDataRecorderConfig(BaseModel):
+    """Configuration of the episode data recorder
+
+    directory: written under the environment output_path
+    chunk_steps: number of steps compressed together, the unit of random access
+    buffer_steps: steps kept in the in memory ring buffer, also the steps saved by crash dumps
+    max_queued_chunks: chunks waiting for the writer thread, recording blocks once the queue is full
+    compression_level: zlib level of the chunks, 0 stores them uncompressed
+    record_platforms: record the sensor measurements and operability of the platforms, needed by the ReplaySimulator
+    platform_attributes: attributes of the platforms recorded every step with record_platforms, e.g. position
+    static_platform_attributes: attributes of the platforms recorded once, e.g. the action_space used by some parts
+    """
+    directory: str = "episode_data"
+    chunk_steps: PositiveInt = 256
+    buffer_steps: PositiveInt = 1024
+    max_queued_chunks: PositiveInt = 64
+    compression_level: conint(ge=0, le=9) = 1  # type: ignore[valid-type]
+    record_platforms: bool = False
+    platform_attributes: typing.List[str] = []
+    static_platform_attributes: typing.List[str] = []
+
+    @root_validator(skip_on_failure=True)
+    def buffer_holds_a_chunk(cls, values):
+        """A chunk is copied out of the ring buffer, it must fit in it"""
+        if values["buffer_steps"] < values["chunk_steps"]:
+            raise ValueError(f"buffer_steps ({values['buffer_steps']}) must be at least chunk_steps ({values['chunk_steps']})")
+        return values
+
+
+class _RingBuffer:
+    """Fixed capacity rows of several columns, row i of the episode is stored at i % capacity"""
+
+    def __init__(self, columns: typing.Mapping[str, typing.Tuple[typing.Tuple[int, ...], typing.Any]], capacity: int) -> None:
+        self.capacity = capacity
+        self.arrays: typing.Dict[str, np.ndarray] = {
+            name: np.zeros((capacity, ) + shape, dtype=dtype) for name, (shape, dtype) in columns.items()
+        }
+        self.count = 0
+
+    def clear(self) -> None:
+        """Forget the rows, the arrays are reused"""
+        self.count = 0
+
+    def next_row(self) -> int:
+        """Index of a new zeroed row"""
+        index = self.count % self.capacity
+        for array in self.arrays.values():
+            array[index] = 0
+        self.count += 1
+        return index
+
+    def rows(self, start: int, stop: int) -> typing.Dict[str, np.ndarray]:
+        """Copy of the rows [start, stop) of the episode, they must still be in the buffer"""
+        assert self.count - self.capacity <= start <= stop <= self.count
+        first, last = start % self.capacity, stop % self.capacity
+        if stop - start == self.capacity or (first >= last and stop > start):
+            return {name: np.concatenate((array[first:], array[:last])) for name, array in self.arrays.items()}
+        return {name: array[first:last].copy() for name, array in self.arrays.items()}
+
+
+class EpisodeDataRecorder:
+    """Records the steps of the episodes of an environment into one compressed columnar file per episode
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        spaces: typing.Mapping[str, gym.spaces.Dict],
+        agents: typing.Sequence[str],
+        config: typing.Optional[EpisodeDataRecorderConfig] = None,
+        static: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        output_dir : str
+            directory receiving the episode files, created if needed
+        spaces : typing.Mapping[str, gym.spaces.Dict]
+            multi agent space of each column of SPACE_COLUMNS, platform is optional
+        agents : typing.Sequence[str]
+            agents of the rewards and dones
+        config : EpisodeDataRecorderConfig
+            buffering and compression of the records
+        static : typing.Optional[typing.Mapping[str, typing.Any]]
+            picklable data stored once in every episode file, e.g. the static attributes of the platforms
+        """
+        self._config = config or EpisodeDataRecorderConfig()
+        self._output_dir = output_dir
+        self._spaces = {name: spaces[name] for name in SPACE_COLUMNS if name != "platform" or name in spaces}
+        self._static = pickle.dumps(dict(static or {}))
+        self._layouts = {name: SpaceLayout(space) for name, space in self._spaces.items()}
+        self._agents = list(agents)
+        self._agent_index = {agent: index for index, agent in enumerate(self._agents)}
+        self._done_index = {**self._agent_index, ALL_DONE: len(self._agents)}
+
+        columns: typing.Dict[str, typing.Tuple[typing.Tuple[int, ...], typing.Any]] = {"sim_time": ((), np.float64)}
+        for name, layout in self._layouts.items():
+            columns[name] = ((layout.size, ), SPACE_COLUMNS[name])
+            columns[f"{name}_present"] = ((len(layout.agents), ), np.bool_)
+        columns["reward"] = ((len(self._agents), ), np.float32)
+        columns["reward_present"] = ((len(self._agents), ), np.bool_)
+        columns["done"] = ((len(self._done_index), ), np.bool_)
+        columns["done_present"] = ((len(self._done_index), ), np.bool_)
+        self._buffer = _RingBuffer(columns, self._config.buffer_steps)
+
+        # names the files of this recorder apart from the ones of a previous process writing to the same directory
+        self._run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._episode: typing.Optional[int] = None
+        self._flushed = 0
+        self._chunk = 0
+        self._closed = False
+        self._queue: queue.Queue = queue.Queue(maxsize=self._config.max_queued_chunks)
+        os.makedirs(self._output_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="EpisodeDataRecorder", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def output_dir(self) -> str:
+        """Directory receiving the episode files"""
+        return self._output_dir
+
+    @property
+    def recording(self) -> bool:
+        """True between start_episode and end_episode"""
+        return self._episode is not None
+
+    def start_episode(self, episode: int, episode_id: typing.Optional[int] = None) -> None:
+        """Start the file of a new episode, the episode being recorded is ended first
+
+        Parameters
+        ----------
+        episode : int
+            number of the episode in this environment, names the file with the start time and pid of the recorder
+        episode_id : typing.Optional[int]
+            id given by the episode parameter provider, stored in the metadata
+        """
+        if self._closed:
+            return
+        self.end_episode()
+        self._episode = episode
+        self._flushed = 0
+        self._chunk = 0
+        self._buffer.clear()
+        meta = {
+            "episode": episode,
+            "episode_id": episode_id,
+            "chunk_steps": self._config.chunk_steps,
+            "columns": list(self._buffer.arrays),
+            "agents": {name: layout.agents for name, layout in self._layouts.items()},
+            "reward_agents": self._agents,
+            "done_agents": list(self._done_index),
+        }
+        path = os.path.join(self._output_dir, f"episode-{self._run_id}-{episode:06d}.npz")
+        self._queue.put((_OPEN, path, meta, pickle.dumps(self._spaces), self._static))
+
+    def record(
+        self,
+        sim_time: float,
+        action: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        observation: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        normalized_observation: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        reward: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        done: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        platform: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+    ) -> None:
+        """Append a step to the episode, the agents missing from a sample are flagged as not present
+
+        Parameters
+        ----------
+        sim_time : float
+            simulation time of the step
+        action : typing.Optional[typing.Mapping[str, typing.Any]]
+            actions given to the environment, by agent
+        observation : typing.Optional[typing.Mapping[str, typing.Any]]
+            raw observations of the glues, by agent
+        normalized_observation : typing.Optional[typing.Mapping[str, typing.Any]]
+            observations handed to the policies, by agent
+        reward : typing.Optional[typing.Mapping[str, typing.Any]]
+            rewards by agent
+        done : typing.Optional[typing.Mapping[str, typing.Any]]
+            dones by agent and __all__
+        platform : typing.Optional[typing.Mapping[str, typing.Any]]
+            states of the platforms, see platform_state, ignored unless the recorder has a platform space
+        """
+        if self._episode is None:
+            return
+        row = self._buffer.next_row()
+        arrays = self._buffer.arrays
+        arrays["sim_time"][row] = sim_time
+        samples = {"action": action, "observation": observation, "normalized_observation": normalized_observation, "platform": platform}
+        for name, layout in self._layouts.items():
+            sample = samples[name]
+            if sample is not None:
+                layout.write(arrays[name][row], arrays[f"{name}_present"][row], sample)
+        for name, sample, index in (("reward", reward, self._agent_index), ("done", done, self._done_index)):
+            if sample is not None:
+                for key, value in sample.items():
+                    column = index.get(key)
+                    if column is not None:
+                        arrays[name][row, column] = value
+                        arrays[f"{name}_present"][row, column] = True
+
+        if self._buffer.count - self._flushed >= self._config.chunk_steps:
+            self._flush()
+
+    def end_episode(self) -> None:
+        """Write the remaining steps and complete the file of the episode"""
+        if self._episode is None:
+            return
+        self._flush()
+        self._queue.put((_FINISH, self._buffer.count))
+        self._episode = None
+
+    def recent(self) -> typing.Dict[str, np.ndarray]:
+        """Columns of the last buffer_steps steps of the episode, oldest first"""
+        start = max(self._buffer.count - self._buffer.capacity, 0)
+        recent = self._buffer.rows(start, self._buffer.count)
+        recent["step"] = np.arange(start, self._buffer.count)
+        return recent
+
+    def close(self) -> None:
+        """Complete the episode being recorded and stop the writer thread"""
+        if self._closed:
+            return
+        self.end_episode()
+        self._closed = True
+        self._queue.put((_CLOSE, ))
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _flush(self) -> None:
+        if self._buffer.count > self._flushed:
+            self._queue.put((_CHUNK, self._chunk, self._buffer.rows(self._flushed, self._buffer.count)))
+            self._chunk += 1
+            self._flushed = self._buffer.count
+
+    def _run(self) -> None:
+        archive: typing.Optional[zipfile.ZipFile] = None
+        path = tmp_path = ""
+        meta: typing.Dict[str, typing.Any] = {}
+        while True:
+            message = self._queue.get()
+            if message[0] == _CLOSE:
+                break
+            try:
+                if message[0] == _OPEN:
+                    _, path, meta, spaces, static = message
+                    # written next to the final name and renamed once complete so readers never load a partial episode
+                    tmp_path = path + ".tmp"
+                    archive = zipfile.ZipFile(  # pylint: disable=consider-using-with
+                        tmp_path, "w", compression=zipfile.ZIP_DEFLATED if self._config.compression_level else zipfile.ZIP_STORED,
+                        compresslevel=self._config.compression_level or None
+                    )
+                    archive.writestr("spaces.pkl", spaces)
+                    archive.writestr("static.pkl", static)
+                elif archive is None:
+                    # the episode failed to open, its messages are dropped
+                    continue
+                elif message[0] == _CHUNK:
+                    _, chunk, columns = message
+                    for name, array in columns.items():
+                        with archive.open(f"{name}/{chunk:05d}.npy", "w") as fp:
+                            np.lib.format.write_array(fp, array, allow_pickle=False)
+                elif message[0] == _FINISH:
+                    archive.writestr("meta.json", json.dumps({**meta, "num_steps": message[1]}))
+                    archive.close()
+                    archive = None
+                    os.replace(tmp_path, path)
+            except Exception as err:  # pylint: disable=broad-except
+                # the writer thread must survive a bad episode, the environment does not depend on it
+                _logger.error(f"Failed to write episode data {path}: {err}")
+                if archive is not None:
+                    archive.close()
+                    archive = None
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+
+def platform_state_space(platforms: typing.Iterable[typing.Any], attributes: typing.Sequence[str] = ()) -> gym.spaces.Dict:
+    """Space of the platform states recorded with record_platforms, by platform name
+
+    The state of a platform holds its operability, the measurements of its sensors with their validity and whether
+    they had a measurement, and the values of the given attributes. Empty groups are left out as they cannot be flattened.
+    """
+    spaces = OrderedDict()
+    for platform in platforms:
+        space = OrderedDict([("operable", gym.spaces.Discrete(2))])
+        if platform.sensors:
+            space["sensors"] = gym.spaces.Dict(
+                OrderedDict((sensor.name, sensor.measurement_properties.get_space()) for sensor in platform.sensors)
+            )
+            for flag in ("valid", "measured"):
+                space[flag] = gym.spaces.Dict(OrderedDict((sensor.name, gym.spaces.Discrete(2)) for sensor in platform.sensors))
+        if attributes:
+            space["attributes"] = gym.spaces.Dict(
+                OrderedDict(
+                    (name, gym.spaces.Box(-np.inf, np.inf, shape=np.shape(getattr(platform, name)), dtype=np.float64))
+                    for name in attributes
+                )
+            )
+        spaces[platform.name] = gym.spaces.Dict(space)
+    return gym.spaces.Dict(spaces)
+
+
+def platform_state(platforms: typing.Iterable[typing.Any], attributes: typing.Sequence[str] = ()) -> OrderedDict:
+    """States of the platforms in the layout of platform_state_space, sensors without a measurement record zeros"""
+    states = OrderedDict()
+    for platform in platforms:
+        state: typing.Dict[str, typing.Any] = {"operable": int(platform.operable)}
+        if platform.sensors:
+            state["sensors"], state["valid"], state["measured"] = {}, {}, {}
+            for sensor in platform.sensors:
+                try:
+                    measurement = sensor.get_measurement()
+                    state["measured"][sensor.name] = 1
+                except ValueError:
+                    space = sensor.measurement_properties.get_space()
+                    measurement = gym.spaces.unflatten(space, np.zeros(gym.spaces.flatdim(space)))
+                    state["measured"][sensor.name] = 0
+                state["sensors"][sensor.name] = measurement
+                state["valid"][sensor.name] = int(sensor.valid)
+        if attributes:
+            state["attributes"] = {name: getattr(platform, name) for name in attributes}
+        states[platform.name] = state
+    return states
+
+
+def platform_static_attributes(platforms: typing.Iterable[typing.Any], attributes: typing.Sequence[str]) -> typing.Dict[str, typing.Any]:
+    """Values of attributes that do not change during an episode, by platform name"""
+    return {platform.name: {name: getattr(platform, name) for name in attributes} for platform in platforms}
+
+
+def list_recorded_episodes(output_dir: str) -> typing.List[str]:
+    """Complete episode files of a recorder directory, in episode order"""
+    return sorted(glob.glob(os.path.join(output_dir, "episode-*.npz")))
+
+
+class EpisodeDataReader:
+    """Random access to the steps of an episode file, only the chunks of the requested steps are decompressed
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Parameters
+        ----------
+        path : str
+            episode file written by an EpisodeDataRecorder
+        """
+        self._archive = np.load(path, allow_pickle=False)
+        self.meta: typing.Dict[str, typing.Any] = json.loads(self._archive["meta.json"])
+        self.spaces: typing.Dict[str, gym.spaces.Dict] = pickle.loads(self._archive["spaces.pkl"])
+        self.static: typing.Dict[str, typing.Any] = pickle.loads(self._archive["static.pkl"]) if "static.pkl" in self._archive else {}
+        self._layouts = {name: SpaceLayout(space) for name, space in self.spaces.items()}
+        self._chunk_index: typing.Optional[int] = None
+        self._chunk: typing.Dict[str, np.ndarray] = {}
+
+    def __enter__(self) -> 'EpisodeDataReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.meta["num_steps"]
+
+    def __getitem__(self, step: int) -> typing.Dict[str, typing.Any]:
+        return self.step(step)
+
+    @property
+    def num_chunks(self) -> int:
+        """Number of chunks of each column"""
+        return -(-len(self) // self.meta["chunk_steps"])
+
+    def column(self, name: str) -> np.ndarray:
+        """Every step of a column, e.g. 'reward' or the flattened 'observation'"""
+        if name not in self.meta["columns"]:
+            raise KeyError(f"Unknown column {name}, expected one of {self.meta['columns']}")
+        if not self.num_chunks:
+            return np.zeros((0, ))
+        return np.concatenate([self._archive[f"{name}/{chunk:05d}"] for chunk in range(self.num_chunks)])
+
+    def step(self, step: int) -> typing.Dict[str, typing.Any]:
+        """The recorded data of a step, step 0 is the reset
+
+        Returns
+        -------
+        typing.Dict[str, typing.Any]
+            sim_time, then the samples of the present agents of action, observation, normalized_observation,
+            reward, done and, when recorded, the states of the present platforms
+        """
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError(f"Step {step} is out of range, the episode has {len(self)} steps")
+        chunk, row = divmod(step, self.meta["chunk_steps"])
+        if chunk != self._chunk_index:
+            self._chunk = {name: self._archive[f"{name}/{chunk:05d}"] for name in self.meta["columns"]}
+            self._chunk_index = chunk
+
+        data: typing.Dict[str, typing.Any] = {"sim_time": float(self._chunk["sim_time"][row])}
+        for name, layout in self._layouts.items():
+            data[name] = layout.read(self._chunk[name][row], self._chunk[f"{name}_present"][row])
+        for name, agents in (("reward", self.meta["reward_agents"]), ("done", self.meta["done_agents"])):
+            values, present = self._chunk[name][row], self._chunk[f"{name}_present"][row]
+            data[name] = OrderedDict((agent, values[index].item()) for index, agent in enumerate(agents) if present[index])
+        return data
+
+    def close(self) -> None:
+        """Close the episode file"""
+        self._archive.close()
@@ -0,0 +1,212 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Streaming writer of per episode metric records
+
+Records are handed to a background thread through a bounded queue and written as columnar
+partitions (parquet when pyarrow is installed, numpy .npz otherwise) of a fixed number of
+episodes. A full queue drops the record instead of blocking the rollout.
+"""
+import atexit
+import glob
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import typing
+
+import numpy as np
+from pydantic import BaseModel, PositiveInt
+from typing_extensions import Literal
+
+_logger = logging.getLogger(__name__)
+
+_CLOSE = object()
+
+
+class EpisodeMetricsWriterConfig(BaseModel):
+    """Configuration of the episode metrics writer
+
+    directory: written under the environment output_path
+    prefixes: custom metric prefixes recorded for each episode
+    partition_episodes: number of episodes per partition file
+    max_queued_episodes: records waiting for the writer thread, further records are dropped
+    file_format: 'parquet', 'npz' or 'auto' (parquet if pyarrow is installed)
+    """
+    directory: str = "episode_metrics"
+    prefixes: typing.List[str] = ["done_results/", "done_status/", "rewards/", "rewards_cumulative/", "variable/"]
+    partition_episodes: PositiveInt = 1000
+    max_queued_episodes: PositiveInt = 10000
+    file_format: Literal["auto", "parquet", "npz"] = "auto"
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel,unused-import  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def to_columns(records: typing.Sequence[typing.Mapping[str, typing.Any]]) -> typing.Dict[str, typing.List[typing.Any]]:
+    """Convert records to columns, a key missing from a record is None in its column"""
+    keys: typing.Dict[str, None] = {}
+    for record in records:
+        keys.update(dict.fromkeys(record))
+    return {key: [record.get(key) for record in records] for key in keys}
+
+
+class EpisodeMetricsWriter:
+    """Writes episode records from a background thread into columnar partition files
+    """
+
+    def __init__(self, output_dir: str, config: typing.Optional[EpisodeMetricsWriterConfig] = None) -> None:
+        """
+        Parameters
+        ----------
+        output_dir : str
+            directory receiving the partition files, created if needed
+        config : EpisodeMetricsWriterConfig
+            buffering and format of the partitions
+        """
+        self._config = config or EpisodeMetricsWriterConfig()
+        self._output_dir = output_dir
+        self._file_format = self._config.file_format
+        if self._file_format == "auto":
+            self._file_format = "parquet" if _parquet_available() else "npz"
+        self._prefixes = tuple(self._config.prefixes)
+        self._queue: queue.Queue = queue.Queue(maxsize=self._config.max_queued_episodes)
+        self._dropped = 0
+        self._partition = 0
+        # names the partitions of this writer apart from the ones of a previous process writing to the same directory
+        self._run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._closed = False
+        os.makedirs(self._output_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="EpisodeMetricsWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def output_dir(self) -> str:
+        """Directory receiving the partition files"""
+        return self._output_dir
+
+    @property
+    def file_format(self) -> str:
+        """Format of the partition files, 'parquet' or 'npz'"""
+        return self._file_format
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the queue was full"""
+        return self._dropped
+
+    def record(self, episode_info: typing.Mapping[str, typing.Any], metrics: typing.Mapping[str, typing.Any]) -> None:
+        """Queue the record of an episode, never blocks
+
+        Parameters
+        ----------
+        episode_info : typing.Mapping[str, typing.Any]
+            columns identifying the episode (id, length...), always recorded
+        metrics : typing.Mapping[str, typing.Any]
+            custom metrics of the episode, only the configured prefixes are recorded
+        """
+        if self._closed:
+            return
+        record = dict(episode_info)
+        record.update((key, value) for key, value in metrics.items() if key.startswith(self._prefixes))
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._dropped += 1
+            if self._dropped == 1 or self._dropped % 1000 == 0:
+                _logger.warning(f"Episode metrics writer is behind, {self._dropped} episode records dropped")
+
+    def close(self) -> None:
+        """Write the buffered records and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        records: typing.List[typing.Dict[str, typing.Any]] = []
+        while True:
+            record = self._queue.get()
+            if record is _CLOSE:
+                break
+            records.append(record)
+            if len(records) >= self._config.partition_episodes:
+                self._write(records)
+                records = []
+        if records:
+            self._write(records)
+
+    def _write(self, records: typing.List[typing.Dict[str, typing.Any]]) -> None:
+        filename = os.path.join(self._output_dir, f"part-{self._run_id}-{self._partition:05d}.{self._file_format}")
+        self._partition += 1
+        columns = to_columns(records)
+        # write then rename so readers never load a partial partition
+        fd, tmp_path = tempfile.mkstemp(dir=self._output_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                if self._file_format == "parquet":
+                    import pyarrow  # pylint: disable=import-outside-toplevel
+                    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+                    pyarrow.parquet.write_table(pyarrow.Table.from_pydict(columns), fp)
+                else:
+                    np.savez(fp, **{key: _npz_column(values) for key, values in columns.items()})
+            os.replace(tmp_path, filename)
+        except Exception as err:  # pylint: disable=broad-except
+            # the writer thread must survive a bad partition, the rollout does not depend on it
+            _logger.error(f"Failed to write episode metrics partition {filename}: {err}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+def _npz_column(values: typing.List[typing.Any]) -> np.ndarray:
+    if all(isinstance(value, (int, np.integer)) for value in values):
+        # episode ids do not survive a float64 round trip
+        return np.array(values, dtype=np.int64)
+    if all(value is None or isinstance(value, (bool, int, float, np.number, np.bool_)) for value in values):
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    return np.array(values, dtype=object)
+
+
+def read_episode_metrics(output_dir: str) -> typing.Dict[str, np.ndarray]:
+    """Load every partition written to a directory into one column per key
+
+    Parameters
+    ----------
+    output_dir : str
+        directory of an EpisodeMetricsWriter
+
+    Returns
+    -------
+    typing.Dict[str, np.ndarray]
+        columns over all the episodes in partition order, a key missing from an episode is None (NaN inside a npz partition)
+    """
+    records: typing.List[typing.Dict[str, typing.Any]] = []
+    for filename in sorted(glob.glob(os.path.join(output_dir, "part-*.*"))):
+        if filename.endswith(".parquet"):
+            import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+            columns = pyarrow.parquet.read_table(filename).to_pydict()
+        elif filename.endswith(".npz"):
+            with np.load(filename, allow_pickle=True) as data:
+                columns = {key: data[key].tolist() for key in data.files}
+        else:
+            continue
+        size = len(next(iter(columns.values()), []))
+        records.extend({key: values[index] for key, values in columns.items()} for index in range(size))
+    return {key: np.asarray(values) for key, values in to_columns(records).items()}
@@ -0,0 +1,141 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Flattening of nested metric dictionaries through a precompiled key plan
+"""
+import typing
+from collections.abc import Mapping
+
+import numpy as np
+
+# (key, leaf index) or (key, nested plan)
+_Plan = typing.List[typing.Tuple[typing.Any, typing.Any]]
+
+
+class FlatMetrics:
+    """Flattens nested dicts into '/' separated keys, equivalent to `flatten(nested, reducer="path")`
+
+    The key plan is compiled from the first dict seen and reused as long as the structure does not change,
+    so reading the leaves costs one dict lookup per node and no string formatting. Numeric leaves may be
+    accumulated into a flat array, the keys are only formatted when the values are exported.
+    """
+
+    def __init__(self, prefix: str = "") -> None:
+        """
+        Parameters
+        ----------
+        prefix : str
+            prepended to every flat key, e.g. "rewards_cumulative/"
+        """
+        self._prefix = prefix
+        self._plan: _Plan = []
+        self._keys: typing.List[str] = []
+        self._index: typing.Dict[typing.Tuple, int] = {}
+        # leaves that are part of the plan, smaller than len(self._keys) once a key disappeared
+        self._plan_size = 0
+        self._leaves: typing.List[typing.Any] = []
+        self._step = np.zeros(0)
+        self._totals = np.zeros(0)
+        # leaves of the plan, and leaves accumulated since the last reset
+        self._plan_mask = np.zeros(0, dtype=np.bool_)
+        self._touched = np.zeros(0, dtype=np.bool_)
+
+    @property
+    def keys(self) -> typing.List[str]:
+        """Flat keys in leaf index order"""
+        return self._keys
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Accumulated leaf values in leaf index order"""
+        return self._totals
+
+    def reset(self) -> None:
+        """Zero the accumulated values, the compiled plan is kept"""
+        self._totals[:] = 0.0
+        self._touched[:] = False
+
+    def accumulate(self, nested: typing.Mapping) -> None:
+        """Add the numeric leaves of the dict to the totals"""
+        if len(self._step) != len(self._keys) or not self._fill(self._plan, nested, self._step, self._plan_size):
+            self._compile(nested)
+            self._fill(self._plan, nested, self._step, self._plan_size)
+        self._totals += self._step
+        self._touched |= self._plan_mask
+
+    def items(self, nested: typing.Optional[typing.Mapping] = None) -> typing.Iterator[typing.Tuple[str, typing.Any]]:
+        """Flat (key, value) pairs of the dict, or of the totals accumulated since the last reset when no dict is given"""
+        if nested is None:
+            if self._touched.all():
+                return zip(self._keys, self._totals.tolist())
+            return ((self._keys[index], float(self._totals[index])) for index in np.flatnonzero(self._touched))
+        if not self._fill(self._plan, nested, self._leaves, self._plan_size):
+            self._compile(nested)
+            self._fill(self._plan, nested, self._leaves, self._plan_size)
+        if self._plan_size == len(self._keys):
+            return zip(self._keys, self._leaves)
+        # only the keys present in this dict
+        return ((self._keys[index], self._leaves[index]) for index in self._plan_indices(self._plan))
+
+    def _fill(self, plan: _Plan, nested: typing.Mapping, out: typing.Any, plan_size: int) -> bool:
+        if plan_size != len(self._keys):
+            # leaves no longer in the dict must not carry the previous values
+            out[:] = [0.0] * len(out) if isinstance(out, list) else 0.0
+        return self._fill_node(plan, nested, out)
+
+    def _fill_node(self, plan: _Plan, nested: typing.Mapping, out: typing.Any) -> bool:
+        if len(nested) != len(plan):
+            return False
+        for key, node in plan:
+            try:
+                value = nested[key]
+            except KeyError:
+                return False
+            if node.__class__ is int:
+                if isinstance(value, Mapping):
+                    return False
+                out[node] = value
+            elif not isinstance(value, Mapping) or not self._fill_node(node, value, out):
+                return False
+        return True
+
+    def _compile(self, nested: typing.Mapping) -> None:
+        """Rebuild the plan for the dict, leaves seen before keep their index (and accumulated value)"""
+        self._plan_size = 0
+        self._plan = self._compile_node(nested, ())
+        size = len(self._keys)
+        self._leaves = [None] * size
+        self._step = np.zeros(size)
+        self._totals = np.concatenate([self._totals, np.zeros(size - len(self._totals))])
+        self._touched = np.concatenate([self._touched, np.zeros(size - len(self._touched), dtype=np.bool_)])
+        self._plan_mask = np.zeros(size, dtype=np.bool_)
+        self._plan_mask[list(self._plan_indices(self._plan))] = True
+
+    def _compile_node(self, nested: typing.Mapping, path: typing.Tuple) -> _Plan:
+        plan: _Plan = []
+        for key, value in nested.items():
+            key_path = path + (key, )
+            if isinstance(value, Mapping):
+                plan.append((key, self._compile_node(value, key_path)))
+                continue
+            index = self._index.get(key_path)
+            if index is None:
+                index = self._index[key_path] = len(self._keys)
+                self._keys.append(self._prefix + "/".join(str(part) for part in key_path))
+            plan.append((key, index))
+            self._plan_size += 1
+        return plan
+
+    def _plan_indices(self, plan: _Plan) -> typing.Iterator[int]:
+        for _, node in plan:
+            if node.__class__ is int:
+                yield node
+            else:
+                yield from self._plan_indices(node)
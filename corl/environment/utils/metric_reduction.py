@@ -0,0 +1,122 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Worker side selection and reduction of the episode custom metrics
+"""
+import typing
+from collections import defaultdict
+
+import numpy as np
+from pydantic import BaseModel, PositiveInt, validator
+
+METRIC_OPS: typing.Dict[str, typing.Callable[[np.ndarray], typing.Any]] = {
+    "min": np.min,
+    "max": np.max,
+    "median": np.median,
+    "mean": np.mean,
+    "var": np.var,
+    "std": np.std,
+    "sum": np.sum,
+    "nonzero": np.count_nonzero,
+}
+
+
+class MetricReductionConfig(BaseModel):
+    """Selection and reduction of the custom metrics reported by the environment callbacks
+
+    include: only metrics starting with one of these prefixes are reported, all metrics when empty
+    exclude: metrics starting with one of these prefixes are dropped, applied after include
+    aggregate_episodes: number of episodes reduced on the worker into a single summary, 1 reports every episode as is
+    reductions: names of the METRIC_OPS applied to each metric over the aggregated episodes, reported as {metric}_{op}
+    """
+    include: typing.List[str] = []
+    exclude: typing.List[str] = []
+    aggregate_episodes: PositiveInt = 1
+    reductions: typing.List[str] = ["mean"]
+
+    @validator("reductions", each_item=True)
+    def check_reductions(cls, v):
+        """Check the reductions are known metric ops"""
+        if v not in METRIC_OPS:
+            raise ValueError(f"Unknown metric reduction {v}, expected one of {list(METRIC_OPS)}")
+        return v
+
+
+class MetricReducer:
+    """Filters the custom metrics of each episode and reduces them over a window of episodes
+
+    Episodes that do not complete a window report no custom metrics, the episode completing it reports the summary.
+    Episodes still buffered when the worker stops are not reported.
+    """
+
+    def __init__(self, config: MetricReductionConfig) -> None:
+        self._config = config
+        self._include = tuple(config.include)
+        self._exclude = tuple(config.exclude)
+        # metric keys are stable, the selection is decided once per key
+        self._selected: typing.Dict[str, bool] = {}
+        self._buffer: typing.Dict[str, typing.List[typing.Any]] = defaultdict(list)
+        self._episodes = 0
+
+    @property
+    def config(self) -> MetricReductionConfig:
+        """Configuration of the reducer"""
+        return self._config
+
+    @property
+    def passthrough(self) -> bool:
+        """Whether every metric of every episode is reported unchanged"""
+        return not self._include and not self._exclude and self._config.aggregate_episodes == 1
+
+    def is_selected(self, key: str) -> bool:
+        """Whether the metric passes the include and exclude prefixes"""
+        selected = self._selected.get(key)
+        if selected is None:
+            selected = (not self._include or key.startswith(self._include)) and not (self._exclude and key.startswith(self._exclude))
+            self._selected[key] = selected
+        return selected
+
+    def select(self, metrics: typing.Mapping[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        """The metrics passing the include and exclude prefixes"""
+        if not self._include and not self._exclude:
+            return dict(metrics)
+        return {key: value for key, value in metrics.items() if self.is_selected(key)}
+
+    def reduce(self, metrics: typing.Mapping[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        """Add the metrics of an episode
+
+        Parameters
+        ----------
+        metrics : typing.Mapping[str, typing.Any]
+            custom metrics of the episode
+
+        Returns
+        -------
+        typing.Dict[str, typing.Any]
+            the metrics to report for this episode, empty while the window is not complete
+        """
+        selected = self.select(metrics)
+        if self._config.aggregate_episodes == 1:
+            return selected
+
+        for key, value in selected.items():
+            self._buffer[key].append(value)
+        self._episodes += 1
+        if self._episodes < self._config.aggregate_episodes:
+            return {}
+
+        summary = {}
+        for key, values in self._buffer.items():
+            array = np.asarray(values)
+            for op_name in self._config.reductions:
+                summary[f"{key}_{op_name}"] = METRIC_OPS[op_name](array)
+        self._buffer.clear()
+        self._episodes = 0
+        return summary
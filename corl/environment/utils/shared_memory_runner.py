@@ -0,0 +1,380 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Runner stepping several environments in subprocesses without ray
+
+Observations, actions, rewards and dones are exchanged through shared memory arrays laid out from
+the observation and action spaces of the env, every agent owns a fixed slice of a flat row. The
+processes synchronize with two barriers per command, no dict is pickled after the start up.
+"""
+import multiprocessing
+import threading
+import traceback
+import typing
+from collections import OrderedDict
+from functools import partial
+from multiprocessing import resource_tracker, shared_memory
+
+import gym
+import numpy as np
+
+_RESET = 0
+_STEP = 1
+_CLOSE = 2
+
+
+class SpaceLayout:
+    """Fixed width layout of a Dict space of agents, each agent owns a slice of the flattened row"""
+
+    def __init__(self, space: gym.spaces.Dict) -> None:
+        """
+        Parameters
+        ----------
+        space : gym.spaces.Dict
+            the space of every agent, observation or action space of a multi agent env
+        """
+        self.spaces: typing.Dict[str, gym.spaces.Space] = OrderedDict(space.spaces)
+        self.agents: typing.List[str] = list(self.spaces)
+        self.index: typing.Dict[str, int] = {agent: index for index, agent in enumerate(self.agents)}
+        self.slices: typing.Dict[str, slice] = {}
+        offset = 0
+        for agent, agent_space in self.spaces.items():
+            size = gym.spaces.flatdim(agent_space)
+            self.slices[agent] = slice(offset, offset + size)
+            offset += size
+        self.size = offset
+
+    def write(self, row: np.ndarray, present: np.ndarray, sample: typing.Mapping[str, typing.Any]) -> None:
+        """Flatten the sample of the agents into the row, present flags the agents of the sample"""
+        present[:] = False
+        for agent, value in sample.items():
+            index = self.index.get(agent)
+            if index is not None:
+                row[self.slices[agent]] = gym.spaces.flatten(self.spaces[agent], value)
+                present[index] = True
+
+    def read(self, row: np.ndarray, present: typing.Optional[np.ndarray] = None) -> OrderedDict:
+        """The sample of the present agents (every agent by default) unflattened from the row"""
+        return OrderedDict(
+            (agent, gym.spaces.unflatten(self.spaces[agent], row[self.slices[agent]]))
+            for index, agent in enumerate(self.agents)
+            if present is None or present[index]
+        )
+
+
+class _SharedArray:
+    """A numpy array backed by a named shared memory block"""
+
+    def __init__(self, shape: typing.Tuple[int, ...], dtype, name: typing.Optional[str] = None) -> None:
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        self.spec = (shape, np.dtype(dtype).str)
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        if not self.owner:
+            # only the creating process frees the block, the tracker of an attached process would unlink it at exit
+            resource_tracker.unregister(self.memory._name, "shared_memory")  # type: ignore[attr-defined] # pylint: disable=protected-access
+        self.array: np.ndarray = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf)
+        if self.owner:
+            self.array.fill(0)
+
+    @classmethod
+    def attach(cls, name: str, spec: typing.Tuple[typing.Tuple[int, ...], str]) -> '_SharedArray':
+        """Map a block created by another process"""
+        shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def close(self) -> None:
+        """Unmap the block, the owner also frees it"""
+        del self.array
+        try:
+            self.memory.close()
+        except BufferError:
+            # views handed out by the runner are still alive, the mapping goes away with them
+            pass
+        if self.owner:
+            self.memory.unlink()
+
+
+def create_act3_env(env_config: typing.Mapping[str, typing.Any], index: int):
+    """Create the ACT3MultiAgentEnv of a runner subprocess, every env gets its own seed and output directory
+
+    Parameters
+    ----------
+    env_config : typing.Mapping[str, typing.Any]
+        the environment configuration, as given to an experiment
+    index : int
+        index of the env in the runner
+    """
+    from corl.environment.multi_agent_env import ACT3MultiAgentEnv  # pylint: disable=import-outside-toplevel
+    return ACT3MultiAgentEnv({**env_config, "seed": env_config.get("seed", 0) + index, "vector_index": index})
+
+
+class SharedMemoryEnvRunner:
+    """Steps num_envs multi agent environments in lock step, each in its own process
+
+    After every command the arrays below hold the result of each env, they are views of the shared memory and
+    are overwritten by the next command:
+
+    - observations: (num_envs, observation_layout.size) flattened observations
+    - observation_present: (num_envs, num_agents) agents present in the observation
+    - rewards: (num_envs, num_agents) reward of each agent, 0 when the agent has no reward
+    - dones: (num_envs, num_agents + 1) done of each agent, the last column is __all__
+
+    Info dicts are not exchanged. With auto_reset an env reset as soon as its episode is done, the observation
+    is then the first observation of the next episode while the rewards and dones belong to the last step.
+    """
+
+    def __init__(
+        self,
+        env_creator: typing.Callable[[int], typing.Any],
+        num_envs: int,
+        auto_reset: bool = True,
+        start_method: str = "fork",
+        timeout: typing.Optional[float] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        env_creator : typing.Callable[[int], typing.Any]
+            creates the env of the given index inside its process, must be picklable unless forking
+        num_envs : int
+            number of env processes
+        auto_reset : bool
+            reset the envs whose episode is done during step
+        start_method : str
+            multiprocessing start method of the env processes
+        timeout : typing.Optional[float]
+            seconds to wait for the envs of a command before failing, by default wait forever
+        """
+        context = multiprocessing.get_context(start_method)
+        self._num_envs = num_envs
+        self._timeout = timeout
+        self._closed = False
+        self._shared: typing.Dict[str, _SharedArray] = {}
+        self._start = context.Barrier(num_envs + 1)
+        self._finish = context.Barrier(num_envs + 1)
+        self._connections = []
+        self._processes = []
+        for index in range(num_envs):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_run_env,
+                args=(index, env_creator, child_connection, self._start, self._finish, auto_reset),
+                name=f"SharedMemoryEnvRunner-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+
+        try:
+            spaces = [self._receive(connection) for connection in self._connections]
+            observation_space, action_space = spaces[0]
+            for index, (env_observation_space, env_action_space) in enumerate(spaces):
+                if env_observation_space != observation_space or env_action_space != action_space:
+                    raise RuntimeError(f"The spaces of env {index} differ from the spaces of env 0")
+            self.observation_layout = SpaceLayout(observation_space)
+            self.action_layout = SpaceLayout(action_space)
+
+            num_agents = len(self.observation_layout.agents)
+            self._shared = {
+                "command": _SharedArray((1, ), np.int8),
+                "failed": _SharedArray((num_envs, ), np.bool_),
+                "observations": _SharedArray((num_envs, self.observation_layout.size), np.float64),
+                "observation_present": _SharedArray((num_envs, num_agents), np.bool_),
+                "actions": _SharedArray((num_envs, self.action_layout.size), np.float64),
+                "rewards": _SharedArray((num_envs, num_agents), np.float64),
+                "dones": _SharedArray((num_envs, num_agents + 1), np.bool_),
+            }
+            handles = {key: (shared.memory.name, shared.spec) for key, shared in self._shared.items()}
+            for connection in self._connections:
+                connection.send(handles)
+        except BaseException:
+            self._terminate()
+            raise
+
+    @property
+    def num_envs(self) -> int:
+        """Number of env processes"""
+        return self._num_envs
+
+    @property
+    def observations(self) -> np.ndarray:
+        """Flattened observations of every env"""
+        return self._shared["observations"].array
+
+    @property
+    def observation_present(self) -> np.ndarray:
+        """Agents present in the observation of every env"""
+        return self._shared["observation_present"].array
+
+    @property
+    def actions(self) -> np.ndarray:
+        """Flattened actions of the next step, written by step"""
+        return self._shared["actions"].array
+
+    @property
+    def rewards(self) -> np.ndarray:
+        """Rewards of every env for the last step"""
+        return self._shared["rewards"].array
+
+    @property
+    def dones(self) -> np.ndarray:
+        """Dones of every env for the last step, the last column is __all__"""
+        return self._shared["dones"].array
+
+    def reset(self) -> np.ndarray:
+        """Reset every env
+
+        Returns
+        -------
+        np.ndarray
+            the flattened observations
+        """
+        self._run(_RESET)
+        return self.observations
+
+    def step(self, actions: typing.Union[np.ndarray, typing.Sequence[typing.Mapping[str, typing.Any]]]
+             ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Step every env
+
+        Parameters
+        ----------
+        actions : typing.Union[np.ndarray, typing.Sequence[typing.Mapping[str, typing.Any]]]
+            flattened actions of shape (num_envs, action_layout.size), or the action dict of each env.
+            Only the actions of the agents present in the observation are applied
+
+        Returns
+        -------
+        typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+            the flattened observations, rewards and dones
+        """
+        if isinstance(actions, np.ndarray):
+            np.copyto(self.actions, actions)
+        else:
+            ignored = np.empty(len(self.action_layout.agents), dtype=np.bool_)
+            for row, action in zip(self.actions, actions):
+                self.action_layout.write(row, ignored, action)
+        self._run(_STEP)
+        return self.observations, self.rewards, self.dones
+
+    def read_observations(self, index: int) -> OrderedDict:
+        """The observation dict of the present agents of an env"""
+        return self.observation_layout.read(self.observations[index], self.observation_present[index])
+
+    def close(self) -> None:
+        """Stop the env processes and free the shared memory"""
+        if self._closed:
+            return
+        try:
+            self._shared["command"].array[0] = _CLOSE
+            self._start.wait(self._timeout)
+            for process in self._processes:
+                process.join(self._timeout)
+        finally:
+            self._terminate()
+
+    def __enter__(self) -> 'SharedMemoryEnvRunner':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _run(self, command: int) -> None:
+        if self._closed:
+            raise RuntimeError("The runner is closed")
+        self._shared["command"].array[0] = command
+        try:
+            self._start.wait(self._timeout)
+            self._finish.wait(self._timeout)
+        except BaseException:
+            self._terminate()
+            raise
+        failed = np.flatnonzero(self._shared["failed"].array)
+        if len(failed) > 0:
+            errors = "\n".join(f"env {index}:\n{self._connections[index].recv()}" for index in failed)
+            self._terminate()
+            raise RuntimeError(f"Env processes failed\n{errors}")
+
+    def _receive(self, connection):
+        message = connection.recv()
+        if isinstance(message, str):
+            raise RuntimeError(f"Env process failed to start\n{message}")
+        return message
+
+    def _terminate(self) -> None:
+        self._closed = True
+        self._start.abort()
+        self._finish.abort()
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        for shared in self._shared.values():
+            shared.close()
+        self._shared = {}
+
+
+def _run_env(index, env_creator, connection, start, finish, auto_reset) -> None:  # pylint: disable=too-many-locals
+    """Main loop of an env process"""
+    try:
+        env = env_creator(index)
+        connection.send((env.observation_space, env.action_space))
+    except Exception:  # pylint: disable=broad-except
+        connection.send(traceback.format_exc())
+        return
+
+    handles = connection.recv()
+    shared = {key: _SharedArray.attach(name, spec) for key, (name, spec) in handles.items()}
+    observation_layout = SpaceLayout(env.observation_space)
+    action_layout = SpaceLayout(env.action_space)
+    command = shared["command"].array
+    failed = shared["failed"].array
+    observation_row = shared["observations"].array[index]
+    present = shared["observation_present"].array[index]
+    action_row = shared["actions"].array[index]
+    rewards = shared["rewards"].array[index]
+    dones = shared["dones"].array[index]
+    write_observation = partial(observation_layout.write, observation_row, present)
+
+    try:
+        while True:
+            start.wait()
+            if command[0] == _CLOSE:
+                break
+            try:
+                if command[0] == _RESET:
+                    write_observation(env.reset())
+                else:
+                    action = action_layout.read(action_row, present)
+                    observation, reward, done, _ = env.step(action)
+                    rewards[:] = 0.0
+                    dones[:] = False
+                    for agent, agent_index in observation_layout.index.items():
+                        rewards[agent_index] = reward.get(agent, 0.0)
+                        dones[agent_index] = done.get(agent, False)
+                    dones[-1] = done["__all__"]
+                    write_observation(env.reset() if auto_reset and done["__all__"] else observation)
+            except Exception:  # pylint: disable=broad-except
+                failed[index] = True
+                connection.send(traceback.format_exc())
+            finish.wait()
+    except threading.BrokenBarrierError:
+        # the runner stopped
+        pass
+    finally:
+        if hasattr(env, "close"):
+            # the env writes its buffered episode data
+            try:
+                env.close()
+            except Exception:  # pylint: disable=broad-except
+                traceback.print_exc()
+        connection.close()
@@ -0,0 +1,109 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Loaders creating the action function of an evaluated agent
+"""
+import abc
+import pickle
+import typing
+
+import gym
+from pydantic import BaseModel, PyObject
+
+ActionFunction = typing.Callable[[typing.Any], typing.Any]
+
+
+class AgentLoaderValidator(BaseModel):
+    """Base validator of the agent loaders"""
+
+
+class AgentLoader(abc.ABC):
+    """Creates the action function of an agent inside an evaluation worker"""
+
+    def __init__(self, **kwargs) -> None:
+        self.config: AgentLoaderValidator = self.get_validator(**kwargs)
+
+    @property
+    def get_validator(self) -> typing.Type[AgentLoaderValidator]:
+        """Returns pydantic validator associated with this class"""
+        return AgentLoaderValidator
+
+    @abc.abstractmethod
+    def load(self, observation_space: gym.spaces.Space, action_space: gym.spaces.Space) -> ActionFunction:
+        """Create the function mapping an observation of the agent to its action
+
+        Parameters
+        ----------
+        observation_space : gym.spaces.Space
+            observation space of the agent
+        action_space : gym.spaces.Space
+            action space of the agent
+        """
+        ...
+
+
+class RandomActionValidator(AgentLoaderValidator):
+    """
+    seed: seed of the action space sampling
+    """
+    seed: typing.Optional[int] = None
+
+
+class RandomAction(AgentLoader):
+    """Agent sampling its action space"""
+
+    @property
+    def get_validator(self) -> typing.Type[RandomActionValidator]:
+        return RandomActionValidator
+
+    def load(self, observation_space: gym.spaces.Space, action_space: gym.spaces.Space) -> ActionFunction:
+        action_space.seed(self.config.seed)  # type: ignore[attr-defined]
+        return lambda _observation: action_space.sample()
+
+
+class CheckpointFileValidator(AgentLoaderValidator):
+    """
+    checkpoint_filename: rllib trainer checkpoint file
+    policy_id: policy of the checkpoint acting for the agent
+    policy_class: rllib policy class of the policy
+    policy_config: configuration of the policy, merged over the rllib defaults by the policy class
+    explore: act with the exploration of the policy instead of deterministically
+    """
+    checkpoint_filename: str
+    policy_id: str
+    policy_class: PyObject = "ray.rllib.agents.ppo.ppo_torch_policy.PPOTorchPolicy"  # type: ignore[assignment]
+    policy_config: typing.Dict[str, typing.Any] = {}
+    explore: bool = False
+
+
+class CheckpointFile(AgentLoader):
+    """Agent acting with a policy restored from an rllib trainer checkpoint, the policy must not use an observation filter"""
+
+    @property
+    def get_validator(self) -> typing.Type[CheckpointFileValidator]:
+        return CheckpointFileValidator
+
+    def load(self, observation_space: gym.spaces.Space, action_space: gym.spaces.Space) -> ActionFunction:
+        from ray.rllib.utils.filter import NoFilter  # pylint: disable=import-outside-toplevel
+
+        policy = self.config.policy_class(observation_space, action_space, self.config.policy_config)
+        with open(self.config.checkpoint_filename, "rb") as fp:
+            checkpoint = pickle.load(fp)
+        worker_state = pickle.loads(checkpoint["worker"])
+        observation_filter = worker_state.get("filters", {}).get(self.config.policy_id)
+        if observation_filter is not None and not isinstance(observation_filter, NoFilter):
+            # the policy was trained on filtered observations, acting on the raw ones would silently change its behavior
+            raise ValueError(
+                f"Policy {self.config.policy_id} of {self.config.checkpoint_filename} uses the observation filter "
+                f"{type(observation_filter).__name__}, only NoFilter is supported"
+            )
+        policy.set_state(worker_state["state"][self.config.policy_id])
+        explore = self.config.explore
+        return lambda observation: policy.compute_single_action(observation, explore=explore)[0]
@@ -0,0 +1,264 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Evaluation engine running the test cases of an evaluation across a process pool
+
+Every worker process builds one environment and the action functions of the agents once, then runs
+the test cases it is given. The results are streamed to the recorders and the aggregated metrics as
+they complete. Test cases already recorded are skipped, so an interrupted evaluation resumes where it
+stopped.
+"""
+import enum
+import multiprocessing
+import time
+import typing
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+import gym.utils.seeding
+import numpy as np
+
+from corl.evaluation.agent_loaders import ActionFunction, AgentLoader
+from corl.evaluation.episode_result import EpisodeResult
+from corl.evaluation.metrics import AggregateMetric, EpisodeMetric
+from corl.evaluation.recording import EpisodeRecorder
+from corl.evaluation.test_cases import TestCase, TestCaseParameterProvider, install_test_case_providers
+
+
+def _to_builtin(value: typing.Any) -> typing.Any:
+    """Json friendly copy of the env info"""
+    if isinstance(value, typing.Mapping):
+        return {str(key): _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(item) for item in value]
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+class EvaluationWorker:
+    """Environment and agents of an evaluation process"""
+
+    def __init__(
+        self,
+        env_creator: typing.Callable[[], typing.Any],
+        agent_loaders: typing.Mapping[str, AgentLoader],
+        max_episode_steps: typing.Optional[int] = None,
+        seed: int = 0,
+    ) -> None:
+        self._env = env_creator()
+        self._providers: typing.Dict[str, TestCaseParameterProvider] = install_test_case_providers(self._env)
+        self._max_episode_steps = max_episode_steps
+        self._seed = seed
+        self._policies: typing.Dict[str, ActionFunction] = {}
+        for agent_id, action_space in self._env.action_space.spaces.items():
+            if agent_id not in agent_loaders:
+                raise KeyError(f"No agent loader for agent {agent_id}")
+            self._policies[agent_id] = agent_loaders[agent_id].load(self._env.observation_space[agent_id], action_space)
+
+    def run(self, index: int, test_case: TestCase) -> EpisodeResult:
+        """Run the episode of a test case
+
+        Parameters
+        ----------
+        index : int
+            id of the test case, also seeds the env so the result does not depend on the worker
+        test_case : TestCase
+            values of the episode parameters
+        """
+        for provider_name, values in test_case.items():
+            self._providers[provider_name].set_test_case(values)
+        if hasattr(self._env, "rng"):
+            self._env.rng, _ = gym.utils.seeding.np_random(self._seed + index)
+
+        env = self._env
+        rewards: typing.Dict[str, float] = defaultdict(float)
+        steps = 0
+        start = time.perf_counter()
+        observations = env.reset()
+        while True:
+            actions = {agent_id: self._policies[agent_id](observation) for agent_id, observation in observations.items()}
+            observations, reward, done, _ = env.step(actions)
+            steps += 1
+            for agent_id, value in reward.items():
+                rewards[agent_id] += float(value)
+            if done["__all__"] or (self._max_episode_steps is not None and steps >= self._max_episode_steps):
+                break
+        wall_time = time.perf_counter() - start
+
+        state = getattr(env, "state", None)
+        episode_state = getattr(state, "episode_state", None) or {}
+        return EpisodeResult(
+            test_case=index,
+            parameters={
+                provider_name: {".".join(path): _to_builtin(value) for path, value in values.items()}
+                for provider_name, values in test_case.items()
+            },
+            steps=steps,
+            wall_time=wall_time,
+            rewards=dict(rewards),
+            dones={key: bool(value) for key, value in done.items()},
+            done_info=_to_builtin(getattr(env, "done_info", {})),
+            done_status=_to_builtin(episode_state),
+        )
+
+
+# evaluation worker of a pool process
+_WORKER: typing.Optional[EvaluationWorker] = None
+
+
+def _initialize_worker(worker_class: typing.Type[EvaluationWorker], *args) -> None:
+    global _WORKER  # pylint: disable=global-statement
+    _WORKER = worker_class(*args)
+
+
+def _run_test_case(index: int, test_case: typing.Any) -> EpisodeResult:
+    assert _WORKER is not None
+    return _WORKER.run(index, test_case)
+
+
+class EvaluationEngine:
+    """Runs the test cases of an evaluation and reduces their metrics"""
+
+    # worker running the test cases, created with the worker args of the engine
+    worker_class: typing.Type[EvaluationWorker] = EvaluationWorker
+
+    def __init__(
+        self,
+        env_creator: typing.Callable[[], typing.Any],
+        agent_loaders: typing.Mapping[str, AgentLoader],
+        test_cases: typing.Sequence[TestCase],
+        metrics: typing.Sequence[EpisodeMetric] = (),
+        aggregates: typing.Sequence[AggregateMetric] = (),
+        recorders: typing.Sequence[EpisodeRecorder] = (),
+        num_workers: int = 0,
+        max_episode_steps: typing.Optional[int] = None,
+        seed: int = 0,
+        start_method: str = "spawn",
+    ) -> None:
+        """
+        Parameters
+        ----------
+        env_creator : typing.Callable[[], typing.Any]
+            creates the ACT3MultiAgentEnv of a worker, e.g. functools.partial(ACT3MultiAgentEnv, env_config)
+        agent_loaders : typing.Mapping[str, AgentLoader]
+            loader of the action function of every agent
+        test_cases : typing.Sequence[TestCase]
+            test cases of the evaluation, see load_test_cases. The index of a test case identifies it when resuming
+        metrics : typing.Sequence[EpisodeMetric]
+            metrics generated for every episode
+        aggregates : typing.Sequence[AggregateMetric]
+            metrics reduced over the episodes
+        recorders : typing.Sequence[EpisodeRecorder]
+            recorders of the results, the first one provides the results of the interrupted evaluation to resume
+        num_workers : int
+            number of worker processes, 0 runs the test cases in this process
+        max_episode_steps : typing.Optional[int]
+            optional cap on the steps of an episode
+        seed : int
+            the env of test case i is seeded with seed + i
+        start_method : str
+            multiprocessing start method of the workers
+        """
+        generated = {metric.name for metric in metrics}
+        for aggregate in aggregates:
+            if aggregate.config.metrics_to_use not in generated:
+                raise ValueError(f"{aggregate.name} uses {aggregate.config.metrics_to_use} which is not a generated metric")
+        self._worker_args: typing.Tuple[typing.Any, ...] = (env_creator, dict(agent_loaders), max_episode_steps, seed)
+        self._test_cases: typing.List[typing.Any] = list(test_cases)
+        self._metrics = list(metrics)
+        self._aggregates = list(aggregates)
+        self._recorders = list(recorders)
+        self._num_workers = num_workers
+        self._start_method = start_method
+
+    def run(self) -> typing.Dict[str, typing.Any]:
+        """Evaluate the test cases that are not recorded yet
+
+        Returns
+        -------
+        typing.Dict[str, typing.Any]
+            the aggregated metrics and the number of evaluated and resumed test cases
+        """
+        try:
+            resumed = self._recorders[0].completed() if self._recorders else []
+            completed = set()
+            for result in resumed:
+                if result.test_case < len(self._test_cases) and result.test_case not in completed:
+                    completed.add(result.test_case)
+                    self._aggregate(result)
+
+            pending = [(index, test_case) for index, test_case in enumerate(self._test_cases) if index not in completed]
+            for result in self._evaluate(pending):
+                for metric in self._metrics:
+                    result.metrics[metric.name] = metric.generate(result)
+                for recorder in self._recorders:
+                    recorder.record(result)
+                self._aggregate(result)
+
+            summary: typing.Dict[str, typing.Any] = {
+                "test_cases": len(self._test_cases), "evaluated": len(pending), "resumed": len(completed)
+            }
+            summary.update((aggregate.name, aggregate.result()) for aggregate in self._aggregates)
+            for recorder in self._recorders:
+                recorder.record_metrics(summary)
+            return summary
+        finally:
+            for recorder in self._recorders:
+                recorder.close()
+
+    def _aggregate(self, result: EpisodeResult) -> None:
+        for metric in self._metrics:
+            if metric.name not in result.metrics:
+                result.metrics[metric.name] = metric.generate(result)
+        for aggregate in self._aggregates:
+            aggregate.update(result.metrics[aggregate.config.metrics_to_use])
+
+    def _evaluate(self, pending: typing.List[typing.Tuple[int, typing.Any]]) -> typing.Iterator[EpisodeResult]:
+        """Results of the test cases in completion order"""
+        if not pending:
+            return
+        if self._num_workers == 0:
+            worker = self.worker_class(*self._worker_args)
+            for index, test_case in pending:
+                yield worker.run(index, test_case)
+            return
+
+        context = multiprocessing.get_context(self._start_method)
+        executor = ProcessPoolExecutor(
+            max_workers=self._num_workers,
+            mp_context=context,
+            initializer=_initialize_worker,
+            initargs=(self.worker_class, ) + self._worker_args,
+        )
+        in_flight: typing.Set[Future] = set()
+        try:
+            remaining = iter(pending)
+            # a bounded number of submitted test cases keeps the memory flat for large evaluations
+            for index, test_case in remaining:
+                in_flight.add(executor.submit(_run_test_case, index, test_case))
+                if len(in_flight) >= 2 * self._num_workers:
+                    break
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield future.result()
+                    next_case = next(remaining, None)
+                    if next_case is not None:
+                        in_flight.add(executor.submit(_run_test_case, *next_case))
+        finally:
+            # cancel the queued test cases when the caller stops early (shutdown(cancel_futures=True) needs python 3.9)
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
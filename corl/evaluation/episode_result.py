@@ -0,0 +1,38 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Summary of the episode of a test case
+"""
+import typing
+
+from pydantic import BaseModel
+
+
+class EpisodeResult(BaseModel):
+    """
+    test_case: index of the test case
+    parameters: test case values by episode parameter provider and '.' separated parameter path
+    steps: number of env steps
+    wall_time: seconds spent in reset and steps, action computation included
+    rewards: total reward of each agent
+    dones: final done of each agent and __all__
+    done_info: done conditions of each agent, as reported by the env
+    done_status: status code name of the triggered done conditions, by platform and done name
+    metrics: values of the episode metrics, filled by the engine
+    """
+    test_case: int
+    parameters: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+    steps: int = 0
+    wall_time: float = 0.0
+    rewards: typing.Dict[str, float] = {}
+    dones: typing.Dict[str, bool] = {}
+    done_info: typing.Dict[str, typing.Any] = {}
+    done_status: typing.Dict[str, typing.Dict[str, str]] = {}
+    metrics: typing.Dict[str, typing.Any] = {}
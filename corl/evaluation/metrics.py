@@ -0,0 +1,203 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Evaluation metrics
+
+Generators compute a value for each episode, aggregators reduce the values of a generated metric over
+the episodes one at a time so the evaluation never holds the results of every episode.
+"""
+import abc
+import operator
+import typing
+
+from pydantic import BaseModel, validator
+
+from corl.evaluation.episode_result import EpisodeResult
+
+
+class MetricValidator(BaseModel):
+    """
+    name: name of the metric in the episode results and the evaluation summary
+    description: what the metric measures
+    """
+    name: str
+    description: str = ""
+
+
+class EpisodeMetric(abc.ABC):
+    """Metric generated from the result of each episode"""
+
+    def __init__(self, **kwargs) -> None:
+        self.config: MetricValidator = self.get_validator(**kwargs)
+
+    @property
+    def get_validator(self) -> typing.Type[MetricValidator]:
+        """Returns pydantic validator associated with this class"""
+        return MetricValidator
+
+    @property
+    def name(self) -> str:
+        """Name of the metric"""
+        return self.config.name
+
+    @abc.abstractmethod
+    def generate(self, episode: EpisodeResult) -> typing.Any:
+        """Value of the metric for the episode"""
+        ...
+
+
+class Runtime(EpisodeMetric):
+    """Wall time of the episode in seconds"""
+
+    def generate(self, episode: EpisodeResult) -> float:
+        return episode.wall_time
+
+
+class EpisodeLength(EpisodeMetric):
+    """Number of steps of the episode"""
+
+    def generate(self, episode: EpisodeResult) -> int:
+        return episode.steps
+
+
+class AgentMetricValidator(MetricValidator):
+    """
+    agent: agent the metric is computed for
+    """
+    agent: str
+
+
+class TotalReward(EpisodeMetric):
+    """Total reward of an agent"""
+
+    @property
+    def get_validator(self) -> typing.Type[AgentMetricValidator]:
+        return AgentMetricValidator
+
+    def generate(self, episode: EpisodeResult) -> float:
+        return episode.rewards.get(self.config.agent, 0.0)  # type: ignore[attr-defined]
+
+
+class StatusCodeValidator(MetricValidator):
+    """
+    platform: platform whose done status is reported
+    done_condition: name of the done condition
+    """
+    platform: str
+    done_condition: str
+
+
+class StatusCode(EpisodeMetric):
+    """Status code name of a done condition of a platform, None when the condition was not triggered"""
+
+    @property
+    def get_validator(self) -> typing.Type[StatusCodeValidator]:
+        return StatusCodeValidator
+
+    def generate(self, episode: EpisodeResult) -> typing.Optional[str]:
+        return episode.done_status.get(self.config.platform, {}).get(self.config.done_condition)  # type: ignore[attr-defined]
+
+
+class AggregateMetricValidator(MetricValidator):
+    """
+    metrics_to_use: name of the generated metric reduced over the episodes
+    """
+    metrics_to_use: str
+
+
+class AggregateMetric(abc.ABC):
+    """Metric reducing a generated metric over the episodes"""
+
+    def __init__(self, **kwargs) -> None:
+        self.config: AggregateMetricValidator = self.get_validator(**kwargs)
+
+    @property
+    def get_validator(self) -> typing.Type[AggregateMetricValidator]:
+        """Returns pydantic validator associated with this class"""
+        return AggregateMetricValidator
+
+    @property
+    def name(self) -> str:
+        """Name of the metric"""
+        return self.config.name
+
+    @abc.abstractmethod
+    def update(self, value: typing.Any) -> None:
+        """Add the value of an episode"""
+        ...
+
+    @abc.abstractmethod
+    def result(self) -> typing.Any:
+        """Value of the metric over the episodes added so far"""
+        ...
+
+
+class Average(AggregateMetric):
+    """Mean of a generated metric"""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._total = 0.0
+        self._count = 0
+
+    def update(self, value: typing.Any) -> None:
+        self._total += value
+        self._count += 1
+
+    def result(self) -> typing.Optional[float]:
+        return self._total / self._count if self._count else None
+
+
+_OPERATORS: typing.Dict[str, typing.Callable[[typing.Any, typing.Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
+
+class CriteriaRateValidator(AggregateMetricValidator):
+    """
+    operator: comparison of the episode value with lhs
+    lhs: value compared against, the condition is `value <operator> lhs`
+    """
+    operator: str
+    lhs: typing.Any
+
+    @validator("operator")
+    def check_operator(cls, v):
+        """Check the operator is supported"""
+        if v not in _OPERATORS:
+            raise ValueError(f"Unknown operator {v}, expected one of {list(_OPERATORS)}")
+        return v
+
+
+class CriteriaRate(AggregateMetric):
+    """Fraction of the episodes whose metric meets a condition"""
+
+    def __init__(self, **kwargs) -> None:
+        self.config: CriteriaRateValidator
+        super().__init__(**kwargs)
+        self._compare = _OPERATORS[self.config.operator]
+        self._hits = 0
+        self._count = 0
+
+    @property
+    def get_validator(self) -> typing.Type[CriteriaRateValidator]:
+        return CriteriaRateValidator
+
+    def update(self, value: typing.Any) -> None:
+        self._hits += bool(value is not None and self._compare(value, self.config.lhs))
+        self._count += 1
+
+    def result(self) -> typing.Optional[float]:
+        return self._hits / self._count if self._count else None
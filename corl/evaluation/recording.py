@@ -0,0 +1,121 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Recorders receiving the episode results of an evaluation as they complete
+"""
+import abc
+import datetime
+import json
+import logging
+import os
+import typing
+
+from pydantic import BaseModel
+
+from corl.evaluation.episode_result import EpisodeResult
+
+_logger = logging.getLogger(__name__)
+
+
+class RecorderValidator(BaseModel):
+    """Base validator of the recorders"""
+
+
+class EpisodeRecorder(abc.ABC):
+    """Receives the episode results and the final metrics of an evaluation"""
+
+    def __init__(self, **kwargs) -> None:
+        self.config: RecorderValidator = self.get_validator(**kwargs)
+
+    @property
+    def get_validator(self) -> typing.Type[RecorderValidator]:
+        """Returns pydantic validator associated with this class"""
+        return RecorderValidator
+
+    def completed(self) -> typing.List[EpisodeResult]:
+        """Results recorded by a previous run of the evaluation, used to resume it"""
+        return []
+
+    @abc.abstractmethod
+    def record(self, result: EpisodeResult) -> None:
+        """Record the result of an episode"""
+        ...
+
+    def record_metrics(self, metrics: typing.Mapping[str, typing.Any]) -> None:
+        """Record the aggregated metrics of the evaluation"""
+
+    def close(self) -> None:
+        """Release the resources of the recorder"""
+
+
+class FolderValidator(RecorderValidator):
+    """
+    dir: directory receiving episodes.jsonl and metrics.json
+    append_timestamp: record into a new timestamped sub directory, this disables resuming
+    """
+    dir: str
+    append_timestamp: bool = False
+
+
+class Folder(EpisodeRecorder):
+    """Appends one json line per episode, every line is flushed so an interrupted evaluation can be resumed"""
+
+    EPISODES_FILE = "episodes.jsonl"
+    METRICS_FILE = "metrics.json"
+
+    def __init__(self, **kwargs) -> None:
+        self.config: FolderValidator
+        super().__init__(**kwargs)
+        self._directory = self.config.dir
+        if self.config.append_timestamp:
+            self._directory = os.path.join(self._directory, datetime.datetime.now().strftime("%Y%m%d_%H%M%S"))
+        os.makedirs(self._directory, exist_ok=True)
+        self._episodes_path = os.path.join(self._directory, self.EPISODES_FILE)
+        self._fp: typing.Optional[typing.TextIO] = None
+
+    @property
+    def get_validator(self) -> typing.Type[FolderValidator]:
+        return FolderValidator
+
+    @property
+    def directory(self) -> str:
+        """Directory of the records"""
+        return self._directory
+
+    def completed(self) -> typing.List[EpisodeResult]:
+        if not os.path.exists(self._episodes_path):
+            return []
+        results = []
+        with open(self._episodes_path, "r", encoding="utf-8") as fp:
+            for line in fp:
+                try:
+                    results.append(EpisodeResult.parse_raw(line))
+                except ValueError:
+                    # the line being written when the evaluation was interrupted
+                    _logger.warning(f"Ignoring a partial episode record in {self._episodes_path}")
+        # rewrite the complete records so the partial line is not followed by new records
+        with open(self._episodes_path, "w", encoding="utf-8") as fp:
+            fp.writelines(result.json() + "\n" for result in results)
+        return results
+
+    def record(self, result: EpisodeResult) -> None:
+        if self._fp is None:
+            self._fp = open(self._episodes_path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        self._fp.write(result.json() + "\n")
+        self._fp.flush()
+
+    def record_metrics(self, metrics: typing.Mapping[str, typing.Any]) -> None:
+        with open(os.path.join(self._directory, self.METRICS_FILE), "w", encoding="utf-8") as fp:
+            json.dump(metrics, fp, indent=2, default=str)
+
+    def close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
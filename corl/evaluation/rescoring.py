@@ -0,0 +1,149 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Re-scoring of recorded episodes across a process pool
+
+Every worker process builds one environment whose simulator is a ReplaySimulator and steps it with the
+recorded actions of the episodes it is given, so the glues, rewards and dones of the environment are evaluated
+again without the recorded simulator. The results are the episode results of an evaluation: the metrics,
+aggregates and recorders of an evaluation apply and an interrupted re-scoring resumes where it stopped. The
+parameters of a result hold the episode file and the recorded total reward of every agent.
+"""
+import os
+import time
+import typing
+from collections import defaultdict
+
+import gym.utils.seeding
+
+from corl.environment.utils.episode_data_recorder import list_recorded_episodes
+from corl.evaluation.engine import EvaluationEngine, EvaluationWorker, _to_builtin
+from corl.evaluation.episode_result import EpisodeResult
+from corl.evaluation.metrics import AggregateMetric, EpisodeMetric
+from corl.evaluation.recording import EpisodeRecorder
+from corl.simulators.replay.replay_simulator import ReplaySimulator
+
+
+class RescoringWorker(EvaluationWorker):
+    """Environment of a re-scoring process"""
+
+    def __init__(self, env_creator: typing.Callable[[], typing.Any], seed: int = 0) -> None:  # pylint: disable=super-init-not-called
+        self._env = env_creator()
+        self._seed = seed
+        if not isinstance(self._env.simulator, ReplaySimulator):
+            raise TypeError(f"The simulator of the environment must be a ReplaySimulator, not {type(self._env.simulator).__name__}")
+        if self._env.config.sim_warmup_steps:
+            raise ValueError("The environment must use sim_warmup_steps 0, the recordings start after the warmup steps")
+
+    def run(self, index: int, test_case: str) -> EpisodeResult:
+        """Replay an episode with its recorded actions
+
+        Parameters
+        ----------
+        index : int
+            id of the episode, also seeds the env so the result does not depend on the worker
+        test_case : str
+            the episode file
+        """
+        env = self._env
+        simulator: ReplaySimulator = env.simulator
+        simulator.queue_episode(test_case)
+        if hasattr(env, "rng"):
+            env.rng, _ = gym.utils.seeding.np_random(self._seed + index)
+
+        rewards: typing.Dict[str, float] = defaultdict(float)
+        recorded_rewards: typing.Dict[str, float] = defaultdict(float)
+        steps = 0
+        done: typing.Dict[str, bool] = {}
+        start = time.perf_counter()
+        env.reset()
+        reader = simulator.reader
+        while not simulator.replay_finished:
+            recorded = reader[simulator.replay_step + 1]
+            _, reward, done, _ = env.step(recorded["action"])
+            steps += 1
+            for agent_id, value in reward.items():
+                rewards[agent_id] += float(value)
+            for agent_id, value in recorded["reward"].items():
+                recorded_rewards[agent_id] += float(value)
+            if done["__all__"]:
+                break
+        wall_time = time.perf_counter() - start
+
+        return EpisodeResult(
+            test_case=index,
+            parameters={
+                "recording": {
+                    "episode": test_case,
+                    "steps": len(reader) - 1,
+                    **{f"reward.{agent_id}": value for agent_id, value in recorded_rewards.items()},
+                }
+            },
+            steps=steps,
+            wall_time=wall_time,
+            rewards=dict(rewards),
+            dones={key: bool(value) for key, value in done.items()},
+            done_info=_to_builtin(env.done_info),
+            done_status=_to_builtin(env.state.episode_state),
+        )
+
+
+class RescoringEngine(EvaluationEngine):
+    """Re-scores recorded episodes and reduces their metrics"""
+
+    worker_class = RescoringWorker
+
+    def __init__(
+        self,
+        env_creator: typing.Callable[[], typing.Any],
+        episodes: typing.Sequence[str],
+        metrics: typing.Sequence[EpisodeMetric] = (),
+        aggregates: typing.Sequence[AggregateMetric] = (),
+        recorders: typing.Sequence[EpisodeRecorder] = (),
+        num_workers: int = 0,
+        seed: int = 0,
+        start_method: str = "spawn",
+    ) -> None:
+        """
+        Parameters
+        ----------
+        env_creator : typing.Callable[[], typing.Any]
+            creates the ACT3MultiAgentEnv of a worker, its simulator must be a ReplaySimulator
+        episodes : typing.Sequence[str]
+            episode files recorded with record_platforms, or directories holding them. The index of an episode
+            identifies it when resuming
+        metrics : typing.Sequence[EpisodeMetric]
+            metrics generated for every episode
+        aggregates : typing.Sequence[AggregateMetric]
+            metrics reduced over the episodes
+        recorders : typing.Sequence[EpisodeRecorder]
+            recorders of the results, the first one provides the results of the interrupted re-scoring to resume
+        num_workers : int
+            number of worker processes, 0 replays the episodes in this process
+        seed : int
+            the env of episode i is seeded with seed + i
+        start_method : str
+            multiprocessing start method of the workers
+        """
+        episode_files: typing.List[str] = []
+        for path in episodes:
+            episode_files.extend(list_recorded_episodes(path) if os.path.isdir(path) else [path])
+        super().__init__(
+            env_creator,
+            {},
+            episode_files,
+            metrics=metrics,
+            aggregates=aggregates,
+            recorders=recorders,
+            num_workers=num_workers,
+            seed=seed,
+            start_method=start_method,
+        )
+        self._worker_args = (env_creator, seed)
@@ -0,0 +1,190 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Test cases of an evaluation and the episode parameter provider applying them
+"""
+import itertools
+import math
+import typing
+
+import numpy as np
+import yaml
+
+from corl.episode_parameter_providers import EpisodeParameterProvider, ParameterModel, Randomness
+from corl.libraries.parameters import ConstantParameter
+from corl.libraries.units import GetStrFromUnit
+
+if typing.TYPE_CHECKING:
+    import pandas
+
+# episode parameter provider name -> flat parameter path -> value
+TestCase = typing.Dict[str, typing.Dict[typing.Tuple[str, ...], typing.Any]]
+
+
+def _leaf_values(node: typing.Any, path: typing.Tuple[str, ...], out: typing.Dict[typing.Tuple[str, ...], typing.List[typing.Any]]):
+    if isinstance(node, dict) and "value" in node:
+        value = node["value"]
+        out[path] = list(value) if isinstance(value, (list, tuple)) else [value]
+    elif isinstance(node, dict):
+        for key, child in node.items():
+            _leaf_values(child, path + (str(key), ), out)
+    else:
+        raise ValueError(f"Test case parameter {'.'.join(path)} must be a mapping with a value, got {node}")
+
+
+def _data_frame_test_cases(data_frame: 'pandas.DataFrame') -> typing.List[TestCase]:
+    """One test case per row, an empty cell leaves the parameter to the episode parameter provider"""
+    paths: typing.Dict[typing.Any, typing.Tuple[str, typing.Tuple[str, ...]]] = {}
+    for column in data_frame.columns:
+        provider_name, _, path = str(column).partition(".")
+        if not path:
+            raise ValueError(f"Test case column {column} must be named <episode parameter provider>.<parameter path>")
+        paths[column] = (provider_name, tuple(path.split(".")))
+
+    test_cases: typing.List[TestCase] = []
+    for row in data_frame.to_dict("records"):
+        test_case: TestCase = {provider_name: {} for provider_name, _ in paths.values()}
+        for column, value in row.items():
+            if isinstance(value, float) and math.isnan(value):
+                continue
+            provider_name, path = paths[column]
+            test_case[provider_name][path] = value.item() if isinstance(value, np.generic) else value
+        test_cases.append(test_case)
+    return test_cases
+
+
+def load_test_cases(
+    source: typing.Union[str, typing.Mapping[str, typing.Any], 'pandas.DataFrame'], randomize: bool = False, seed: int = 0
+) -> typing.List[TestCase]:
+    """Expand a test case configuration into the list of test cases
+
+    The configuration maps episode parameter provider names to nested parameters, every leaf holds a value or a
+    list of values. The test cases are the cartesian product of the lists::
+
+        episode_parameter_providers:
+          environment:
+            simulator_reset:
+              platforms:
+                blue0:
+                  x: {value: [10, 25, 50]}
+
+    A pandas DataFrame lists the test cases explicitly instead, one per row. Its columns are named by the episode
+    parameter provider and the '.' separated parameter path, e.g. environment.simulator_reset.platforms.blue0.x
+
+    Parameters
+    ----------
+    source : typing.Union[str, typing.Mapping[str, typing.Any], pandas.DataFrame]
+        yaml file, loaded configuration or DataFrame of test cases
+    randomize : bool
+        shuffle the test cases
+    seed : int
+        seed of the shuffle
+
+    Returns
+    -------
+    typing.List[TestCase]
+        the test cases, their index is the test case id
+    """
+    if hasattr(source, "columns") and hasattr(source, "to_dict"):
+        test_cases = _data_frame_test_cases(source)
+    else:
+        test_cases = _configuration_test_cases(source)
+
+    if randomize:
+        order = np.random.default_rng(seed).permutation(len(test_cases))
+        test_cases = [test_cases[index] for index in order]
+    return test_cases
+
+
+def _configuration_test_cases(source: typing.Union[str, typing.Mapping[str, typing.Any]]) -> typing.List[TestCase]:
+    """Cartesian product of the values of a test case configuration"""
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as fp:
+            source = yaml.safe_load(fp)
+    providers = source.get("episode_parameter_providers", {})  # type: ignore[union-attr]
+
+    leaves: typing.List[typing.Tuple[str, typing.Tuple[str, ...]]] = []
+    choices: typing.List[typing.List[typing.Any]] = []
+    for provider_name, parameters in providers.items():
+        values: typing.Dict[typing.Tuple[str, ...], typing.List[typing.Any]] = {}
+        _leaf_values(parameters, (), values)
+        for path, path_values in values.items():
+            leaves.append((provider_name, path))
+            choices.append(path_values)
+
+    test_cases: typing.List[TestCase] = []
+    for combination in itertools.product(*choices):
+        test_case: TestCase = {provider_name: {} for provider_name in providers}
+        for (provider_name, path), value in zip(leaves, combination):
+            test_case[provider_name][path] = value
+        test_cases.append(test_case)
+    return test_cases
+
+
+class TestCaseParameterProvider(EpisodeParameterProvider):
+    """Episode parameter provider returning the values of the current test case
+
+    The parameters that are not part of the test case are sampled from the wrapped provider.
+    """
+
+    def __init__(self, base: EpisodeParameterProvider, **kwargs) -> None:
+        """
+        Parameters
+        ----------
+        base : EpisodeParameterProvider
+            provider of the env or agent, its parameters are the parameters of this provider
+        """
+        kwargs.setdefault("parameters", base.config.parameters)
+        super().__init__(**kwargs)
+        self._base = base
+        self._test_case: ParameterModel = {}
+
+    def set_test_case(self, values: typing.Mapping[typing.Tuple[str, ...], typing.Any]) -> None:
+        """Use the values for the next episodes
+
+        Parameters
+        ----------
+        values : typing.Mapping[typing.Tuple[str, ...], typing.Any]
+            flat parameter path -> value, the units of the replaced parameter apply
+        """
+        test_case = {}
+        for path, value in values.items():
+            if path not in self.config.parameters:
+                raise KeyError(f"Test case parameter {'.'.join(path)} is not a parameter of the episode parameter provider")
+            parameter_units = self.config.parameters[path].config.units
+            test_case[path] = ConstantParameter(value=value, units=GetStrFromUnit(parameter_units) if parameter_units is not None else None)
+        self._test_case = test_case
+
+    def _do_get_params(self, rng: Randomness) -> typing.Tuple[ParameterModel, typing.Union[int, None]]:
+        parameters, episode_id = self._base.get_params(rng)
+        return {**parameters, **self._test_case}, episode_id
+
+
+def install_test_case_providers(env) -> typing.Dict[str, TestCaseParameterProvider]:
+    """Wrap the episode parameter providers of the env and its agents into test case providers
+
+    Parameters
+    ----------
+    env : ACT3MultiAgentEnv
+        the env whose episode parameter provider registry is replaced
+
+    Returns
+    -------
+    typing.Dict[str, TestCaseParameterProvider]
+        the providers by name, as used in the test cases
+    """
+    providers = {}
+    for name, epp in list(env.config.epp_registry.items()):
+        provider = TestCaseParameterProvider(base=epp)
+        env.config.epp_registry[name] = provider
+        if name in env.agent_dict:
+            env.agent_dict[name].config.epp = provider
+        providers[name] = provider
+    return providers
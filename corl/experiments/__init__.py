@@ -8,4 +8,31 @@ This is a US Government Work not subject to copyright protection in the US.
 The use, dissemination or disclosure of data in this file is subject to
 limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
+Experiments that may be run through corl.train_rl.
+
+The experiment modules import ray tune, so they are only imported when one of the
+classes is first accessed from this package.
 """
+import importlib
+import typing
+
+# keep PluginLibrary.add_paths from importing ray tune when an environment is built
+__plugin_skip__ = True
+
+_LAZY_ATTRIBUTES: typing.Dict[str, str] = {
+    "BaseExperiment": "corl.experiments.base_experiment",
+    "BaseExperimentValidator": "corl.experiments.base_experiment",
+    "ExperimentParse": "corl.experiments.base_experiment",
+    "BenchmarkExperiment": "corl.experiments.benchmark_experiment",
+    "BenchmarkExperimentValidator": "corl.experiments.benchmark_experiment",
+    "DatasetExperiment": "corl.experiments.dataset_experiment",
+    "DatasetExperimentValidator": "corl.experiments.dataset_experiment",
+    "RllibExperiment": "corl.experiments.rllib_experiment",
+    "RllibExperimentValidator": "corl.experiments.rllib_experiment",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,15 +10,19 @@ limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
 """
 import argparse
+import copy
+import itertools
 import os
 import pathlib
 import time
 import typing
 
 import ray
-from pydantic import PyObject, validator
-from pyinstrument import Profiler
+from pydantic import BaseModel, NonNegativeFloat, NonNegativeInt, PositiveInt, PyObject, confloat, validator
+from ray.rllib.agents.trainer import COMMON_CONFIG
 from ray.rllib.env.env_context import EnvContext
+from ray.rllib.evaluation.worker_set import WorkerSet
+from ray.rllib.policy.policy import PolicySpec
 from ray.tune.registry import get_trainable_cls
 
 from corl.environment.default_env_rllib_callbacks import EnvironmentDefaultCallbacks
@@ -26,9 +30,82 @@ from corl.environment.multi_agent_env import ACT3MultiAgentEnv, ACT3MultiAgentEn
 from corl.episode_parameter_providers import EpisodeParameterProvider
 from corl.episode_parameter_providers.remote import RemoteEpisodeParameterProvider
 from corl.experiments.base_experiment import BaseExperiment, BaseExperimentValidator
+from corl.libraries.benchmark_util import (
+    MemoryTracker,
+    PhaseTimer,
+    check_memory_growth,
+    check_regressions,
+    compare_reports,
+    latency_summary,
+    mean_confidence_interval,
+    read_report,
+    write_report,
+)
 from corl.libraries.factory import Factory
 from corl.parsers.yaml_loader import apply_patches
 from corl.policies.base_policy import BasePolicyValidator
+from corl.policies.random_action import RandomActionPolicy
+
+
+class ScalingSweepConfig(BaseModel):
+    """
+    num_workers: rollout worker counts to sweep
+    num_envs_per_worker: envs per rollout worker to sweep
+    rollout_fragment_length: rollout fragment lengths to sweep
+    sample_rounds: number of timed sample calls on every worker for each grid point
+    output_file: json scaling curve, defaults to <output>/scaling_curve.json when --output is given
+    """
+    num_workers: typing.List[PositiveInt] = [1, 2, 4]
+    num_envs_per_worker: typing.List[PositiveInt] = [1]
+    rollout_fragment_length: typing.List[PositiveInt] = [200]
+    sample_rounds: PositiveInt = 3
+    output_file: typing.Optional[str] = None
+
+
+class MemoryProfileConfig(BaseModel):
+    """
+    snapshot_interval: number of measured episodes between tracemalloc snapshots
+    steady_state_snapshots: number of initial snapshots excluded from the growth estimate
+    max_growth_per_episode_kb: the benchmark fails when the steady state growth is larger
+    top: number of growth sites/modules to report
+    traceback_frames: number of frames stored per allocation
+    """
+    snapshot_interval: PositiveInt = 10
+    steady_state_snapshots: NonNegativeInt = 1
+    max_growth_per_episode_kb: NonNegativeFloat = 64.0
+    top: PositiveInt = 10
+    traceback_frames: PositiveInt = 16
+
+
+class BenchmarkConfig(BaseModel):
+    """
+    episodes: number of measured episodes per seed
+    warmup_episodes: number of episodes run per seed before measuring
+    seeds: env seeds to benchmark, an env is built for each seed. Empty uses the env_config seed
+    max_episode_steps: optional cap on the steps of a single episode
+    use_ray: initialize ray (and remote episode parameter providers) as training would, by default the env runs locally
+    phase_breakdown: measure the time spent in each phase of env step/reset
+    confidence: confidence level of the SPS interval
+    output_file: json report file, defaults to <output>/benchmark.json when --output is given
+    baseline_file: json report to compare against, the benchmark fails if any compared metric regresses
+    regression_tolerance: allowed relative slowdown against the baseline before failing
+    memory_profile: when set, record tracemalloc snapshots over the episodes of the first seed and fail the
+                    benchmark on steady state memory growth. Timings are inflated while tracing
+    scaling_sweep: when set, sample the env with rllib rollout workers on a local ray cluster across the
+                   grid of settings and write a scaling curve instead of running the single env benchmark
+    """
+    episodes: PositiveInt = 10
+    warmup_episodes: NonNegativeInt = 1
+    seeds: typing.List[int] = []
+    max_episode_steps: typing.Optional[PositiveInt] = None
+    use_ray: bool = False
+    phase_breakdown: bool = True
+    confidence: confloat(gt=0, lt=1) = 0.95  # type: ignore[valid-type]
+    output_file: typing.Optional[str] = None
+    baseline_file: typing.Optional[str] = None
+    regression_tolerance: NonNegativeFloat = 0.1
+    memory_profile: typing.Optional[MemoryProfileConfig] = None
+    scaling_sweep: typing.Optional[ScalingSweepConfig] = None
 
 
 class BenchmarkExperimentValidator(BaseExperimentValidator):
@@ -36,6 +113,7 @@ class BenchmarkExperimentValidator(BaseExperimentValidator):
     ray_config: dictionary to be fed into ray init, validated by ray init call
     env_config: environment configuration, validated by environment class
     rllib_configs: a dictionary
+    benchmark_config: settings of the benchmark run
     Arguments:
         BaseModel {[type]} -- [description]
 
@@ -50,6 +128,7 @@ class BenchmarkExperimentValidator(BaseExperimentValidator):
     rllib_configs: typing.Dict[str, typing.Dict[str, typing.Any]]
     tune_config: typing.Dict[str, typing.Any]
     trainable_config: typing.Optional[typing.Dict[str, typing.Any]]
+    benchmark_config: BenchmarkConfig = BenchmarkConfig()
 
     @validator('rllib_configs', pre=True)
     def apply_patches_rllib_configs(cls, v):  # pylint: disable=no-self-argument, no-self-use
@@ -141,16 +220,24 @@ class BenchmarkExperiment(BaseExperiment):
     def run_experiment(self, args: argparse.Namespace) -> None:
 
         rllib_config = self._select_rllib_config(args.compute_platform)
-        if args.compute_platform in ['ray']:
-            self._update_ray_config_for_ray_platform()
+        benchmark_config = self.config.benchmark_config
+
+        if benchmark_config.scaling_sweep is not None:
+            # the sweep needs real rollout worker processes
+            benchmark_config.use_ray = True
+            self.config.ray_config['local_mode'] = False
 
-        if args.debug:
-            rllib_config['num_workers'] = 0
-            self.config.ray_config['local_mode'] = True
+        if benchmark_config.use_ray:
+            if args.compute_platform in ['ray']:
+                self._update_ray_config_for_ray_platform()
 
-        self._add_trial_creator()
+            if args.debug and benchmark_config.scaling_sweep is None:
+                rllib_config['num_workers'] = 0
+                self.config.ray_config['local_mode'] = True
 
-        ray.init(**self.config.ray_config)
+            self._add_trial_creator()
+
+            ray.init(**self.config.ray_config)
 
         self.config.env_config["agents"], self.config.env_config["agent_platforms"] = self.create_agents(
             args.platform_config, args.agent_config
@@ -161,7 +248,7 @@ class BenchmarkExperiment(BaseExperiment):
         if args.other_platform:
             self.config.env_config["other_platforms"] = self.create_other_platforms(args.other_platform)
 
-        if not self.config.ray_config['local_mode']:
+        if benchmark_config.use_ray and not self.config.ray_config['local_mode']:
             self.config.env_config['episode_parameter_provider'] = RemoteEpisodeParameterProvider.wrap_epp_factory(
                 Factory(**self.config.env_config['episode_parameter_provider']),
                 actor_name=ACT3MultiAgentEnv.episode_parameter_provider_name
@@ -174,79 +261,280 @@ class BenchmarkExperiment(BaseExperiment):
 
         self.config.env_config['epp_registry'] = ACT3MultiAgentEnvValidator(**self.config.env_config).epp_registry
 
-        tmp = ACT3MultiAgentEnv(self.config.env_config)
-        act_space = tmp.action_space
-
-        env = tmp
-
-        profiler = Profiler()
-        profiler.start()
-        # temp = {}
-
-        # retrieve action
-        # if sanity_check_state_dict:
-        #     multi_actions_list = sanity_check_state_dict["action"]
-        # else:
-        #     multi_actions_list = None
-        total_timesteps = 0
-
-        for ep in range(10):
-            st = time.time()
-            # obs = env.reset()
-            env.reset()
-
-            # if debug_print:
-            #     print(f"First obs: {obs}")
-            done = False
-            step = 0
-            # temp[ep] = {}
-            # temp[ep]["rew"] = []
-            # temp[ep]["obs"] = []
-            # temp[ep]["multi_done"] = []
-            # temp[ep]["info"] = []
-            # temp[ep]["step_data"] = []
-
-            while not done:
-                # Start keep track the states of platforms
-                # temp_step_data = {}
-
-                # if multi_actions_list:
-                #     if (not done) and (step >= len(multi_actions_list)):
-                #         print("Reached the end of recorded actions but still not done")
-                #         break
-                #     multi_actions = multi_actions_list[step]
-                # else:
-                # generate a random action
-                multi_actions = self.generate_action(act_space)
-
-                # try:
-                # if skip_actions:
-                #     obs, rew, multi_done, info = env.step({})
-                # else:
-                # obs, rew, multi_done, info = env.step(multi_actions)
-                _, _, multi_done, _ = env.step(multi_actions)
-                # except Exception as e:  # pylint: disable=broad-except
-                #     print(f'Failed at episode {ep} step {step} with error: {e} \n Simulator outputs are saved at {env.output_path}')
-                #     break
-
-                # Extract platform state data for further analysis
-                # if export_step_data:
-                #     temp_step_data = platforms_data_extractor(env.state.sim_platforms, temp_step_data)
-
-                # temp[ep]["rew"].append(rew)
-                # temp[ep]["obs"].append(obs)
-                # temp[ep]["multi_done"].append(str(multi_done))
-                # temp[ep]["info"].append(info)
-                # temp[ep]["step_data"].append(temp_step_data)
-                # debug_func(debug_print, env, step, obs, rew, multi_done, info)
-                done = multi_done["__all__"]
-                step += 1
-            total_timesteps += step
-            et = time.time()
-            print(f"{ep}:SPS: {step/(et - st)}, {step}")
-
-        profiler.stop()
-        print(profiler.output_text(unicode=True, color=True))
+        if benchmark_config.scaling_sweep is not None:
+            curve = self.run_scaling_sweep(rllib_config)
+            output_file = benchmark_config.scaling_sweep.output_file
+            if output_file is None and args.output:
+                output_file = os.path.join(args.output, "scaling_curve.json")
+            if output_file:
+                os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+                write_report(curve, output_file)
+            self.print_scaling_curve(curve)
+            return
+
+        if args.profile:
+            from pyinstrument import Profiler  # pylint: disable=import-outside-toplevel
+
+            profiler = Profiler()
+            profiler.start()
+            report = self.run_benchmark()
+            profiler.stop()
+            print(profiler.output_text(unicode=True, color=True))
+        else:
+            report = self.run_benchmark()
+
+        baseline_file = getattr(args, "baseline", None) or benchmark_config.baseline_file
+        if baseline_file:
+            report["comparison"] = compare_reports(report, read_report(baseline_file), benchmark_config.regression_tolerance)
+
+        output_file = benchmark_config.output_file
+        if output_file is None and args.output:
+            output_file = os.path.join(args.output, "benchmark.json")
+        if output_file:
+            os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+            write_report(report, output_file)
+
+        self.print_report(report)
+
+        if "comparison" in report:
+            check_regressions(report["comparison"])
+
+        if benchmark_config.memory_profile is not None:
+            check_memory_growth(report["memory"], benchmark_config.memory_profile.max_growth_per_episode_kb)
+
+    def create_env(self, seed: typing.Optional[int] = None) -> ACT3MultiAgentEnv:
+        """Create an environment from the experiment env_config
+
+        Parameters
+        ----------
+        seed : typing.Optional[int]
+            overrides the seed of the env_config when set
+        """
+        env_config = self.config.env_config
+        if seed is not None:
+            env_config = {**env_config, "seed": seed}
+        return ACT3MultiAgentEnv(env_config)
+
+    def run_benchmark(self) -> typing.Dict[str, typing.Any]:
+        """Run the configured episodes with random actions and measure the environment
+
+        Returns
+        -------
+        typing.Dict[str, typing.Any]
+            json serializable benchmark report
+        """
+        benchmark_config = self.config.benchmark_config
+        seeds: typing.List[typing.Optional[int]] = list(benchmark_config.seeds) or [None]
+
+        phase_timer = PhaseTimer() if benchmark_config.phase_breakdown else None
+        reset_latencies: typing.List[float] = []
+        step_latencies: typing.List[float] = []
+        episode_sps: typing.List[float] = []
+        episode_lengths: typing.List[int] = []
+
+        memory_tracker = None
+        if benchmark_config.memory_profile is not None:
+            memory_tracker = MemoryTracker(
+                benchmark_config.memory_profile.snapshot_interval,
+                benchmark_config.memory_profile.steady_state_snapshots,
+                benchmark_config.memory_profile.traceback_frames
+            )
+
+        for seed_index, seed in enumerate(seeds):
+            env = self.create_env(seed)
+            act_space = env.action_space
+            act_space.seed(seed)
+            if phase_timer is not None:
+                phase_timer.attach(env)
+
+            # a new env per seed is not steady state, memory is only tracked over the first seed
+            track_memory = memory_tracker is not None and seed_index == 0
+            if track_memory:
+                memory_tracker.start()  # type: ignore[union-attr]
+
+            for episode in range(benchmark_config.warmup_episodes + benchmark_config.episodes):
+                measured = episode >= benchmark_config.warmup_episodes
+                if phase_timer is not None:
+                    phase_timer.enabled = measured
+
+                reset_time, step_times = self.run_episode(env, act_space, benchmark_config.max_episode_steps)
+
+                if measured:
+                    reset_latencies.append(reset_time)
+                    step_latencies.extend(step_times)
+                    episode_lengths.append(len(step_times))
+                    episode_sps.append(len(step_times) / (reset_time + sum(step_times)))
+                    if track_memory:
+                        memory_tracker.episode_done(episode - benchmark_config.warmup_episodes + 1)  # type: ignore[union-attr]
+
+            if track_memory:
+                memory_tracker.stop()  # type: ignore[union-attr]
+
+        env_time = sum(reset_latencies) + sum(step_latencies)
+
+        report: typing.Dict[str, typing.Any] = {
+            "name": self.config.env_config.get("TrialName"),
+            "settings": {
+                "episodes": benchmark_config.episodes, "warmup_episodes": benchmark_config.warmup_episodes, "seeds": seeds
+            },
+            "total_steps": len(step_latencies),
+            "env_time_s": env_time,
+            "episode_length": mean_confidence_interval(episode_lengths, benchmark_config.confidence),
+            "sps": mean_confidence_interval(episode_sps, benchmark_config.confidence),
+            "step_latency_ms": latency_summary(step_latencies),
+            "reset_latency_ms": latency_summary(reset_latencies),
+            "phases": phase_timer.breakdown(env_time) if phase_timer is not None else {},
+        }
+        if memory_tracker is not None:
+            report["memory"] = memory_tracker.report(benchmark_config.memory_profile.top)  # type: ignore[union-attr]
+        return report
+
+    def run_episode(self, env: ACT3MultiAgentEnv, act_space,
+                    max_steps: typing.Optional[int] = None) -> typing.Tuple[float, typing.List[float]]:
+        """Run one episode with random actions
+
+        Returns
+        -------
+        typing.Tuple[float, typing.List[float]]
+            reset time and the time of each step in seconds, action sampling is not included
+        """
+        start = time.perf_counter()
+        env.reset()
+        reset_time = time.perf_counter() - start
+
+        step_times = []
+        done = False
+        while not done and (max_steps is None or len(step_times) < max_steps):
+            multi_actions = self.generate_action(act_space)
+            start = time.perf_counter()
+            _, _, multi_done, _ = env.step(multi_actions)
+            step_times.append(time.perf_counter() - start)
+            done = multi_done["__all__"]
+
+        return reset_time, step_times
+
+    def run_scaling_sweep(self, rllib_config: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        """Measure the sampling throughput of rollout workers across the sweep grid
+
+        Every agent acts with the RandomActionPolicy so the measurement is dominated by the env.
+
+        Parameters
+        ----------
+        rllib_config : typing.Dict[str, typing.Any]
+            the rllib config of the compute platform, horizon/framework/num_cpus_per_worker are used
+
+        Returns
+        -------
+        typing.Dict[str, typing.Any]
+            json serializable scaling curve, one point per grid entry
+        """
+        sweep = self.config.benchmark_config.scaling_sweep
+        assert sweep is not None
+
+        env = self.create_env()
+        policies = {
+            agent_id: PolicySpec(RandomActionPolicy, env.observation_space[agent_id], env.action_space[agent_id], {})
+            for agent_id in env.observation_space.spaces
+        }
+
+        points = []
+        for num_workers, num_envs_per_worker, rollout_fragment_length in itertools.product(
+            sweep.num_workers, sweep.num_envs_per_worker, sweep.rollout_fragment_length
+        ):
+            trainer_config = copy.deepcopy(COMMON_CONFIG)
+            trainer_config.update(
+                {key: rllib_config[key]
+                 for key in ("horizon", "framework", "num_cpus_per_worker")
+                 if key in rllib_config}
+            )
+            trainer_config.update(
+                {
+                    "env": ACT3MultiAgentEnv,
+                    "env_config": self.config.env_config,
+                    "num_workers": num_workers,
+                    "num_envs_per_worker": num_envs_per_worker,
+                    "rollout_fragment_length": rollout_fragment_length,
+                    "batch_mode": "truncate_episodes",
+                    "multiagent": {
+                        "policies": policies, "policy_mapping_fn": lambda agent_id: agent_id, "policies_to_train": []
+                    },
+                }
+            )
+
+            workers = WorkerSet(
+                env_creator=ACT3MultiAgentEnv, trainer_config=trainer_config, num_workers=num_workers, local_worker=False
+            )
+            remote_workers = workers.remote_workers()
+            try:
+                # the first round builds the envs and fills the episode parameter providers
+                ray.get([worker.sample.remote() for worker in remote_workers])
+
+                env_steps = 0
+                start = time.perf_counter()
+                for _ in range(sweep.sample_rounds):
+                    batches = ray.get([worker.sample.remote() for worker in remote_workers])
+                    env_steps += sum(batch.env_steps() for batch in batches)
+                elapsed = time.perf_counter() - start
+            finally:
+                workers.stop()
+                for worker in remote_workers:
+                    worker.__ray_terminate__.remote()
+
+            points.append(
+                {
+                    "num_workers": num_workers,
+                    "num_envs_per_worker": num_envs_per_worker,
+                    "rollout_fragment_length": rollout_fragment_length,
+                    "env_steps": env_steps,
+                    "time_s": elapsed,
+                    "throughput": env_steps / elapsed,
+                    "per_worker_throughput": env_steps / elapsed / num_workers,
+                }
+            )
+
+        # efficiency is relative to the smallest worker count measured with the same envs and fragment length
+        for point in points:
+            reference = min(
+                (
+                    other for other in points if other["num_envs_per_worker"] == point["num_envs_per_worker"]
+                    and other["rollout_fragment_length"] == point["rollout_fragment_length"]
+                ),
+                key=lambda other: other["num_workers"]
+            )
+            point["efficiency"] = point["per_worker_throughput"] / reference["per_worker_throughput"]
+
+        return {"name": self.config.env_config.get("TrialName"), "cpus": ray.cluster_resources().get("CPU"), "points": points}
+
+    @staticmethod
+    def print_scaling_curve(curve: typing.Dict[str, typing.Any]) -> None:
+        """Print a human readable scaling curve"""
+        print(f"{curve['name']}: scaling curve on {curve['cpus']} cpus")
+        print(f"{'workers':>8} {'envs':>5} {'fragment':>9} {'steps/s':>10} {'per worker':>11} {'efficiency':>11}")
+        for point in curve["points"]:
+            print(
+                f"{point['num_workers']:8d} {point['num_envs_per_worker']:5d} {point['rollout_fragment_length']:9d} "
+                f"{point['throughput']:10.1f} {point['per_worker_throughput']:11.1f} {point['efficiency']:11.1%}"
+            )
+
+    @staticmethod
+    def print_report(report: typing.Dict[str, typing.Any]) -> None:
+        """Print a human readable summary of a benchmark report"""
+        sps = report["sps"]
+        print(f"{report['name']}: {report['total_steps']} steps over {sps['count']} episodes")
+        print(f"  SPS: {sps['mean']:.1f} ({sps['confidence']:.0%} CI {sps['ci_low']:.1f} - {sps['ci_high']:.1f})")
+        for key in ("step_latency_ms", "reset_latency_ms"):
+            latency = report[key]
+            print(f"  {key}: p50 {latency['p50']:.3f} p95 {latency['p95']:.3f} p99 {latency['p99']:.3f}")
+        for phase, value in report["phases"].items():
+            print(f"  {phase:>24}: {value['fraction']:6.1%} {value['total_s']:.3f} s")
+        if "memory" in report:
+            growth = report["memory"]["growth_per_episode_kb"]
+            print(f"  memory growth per episode: {'n/a' if growth is None else f'{growth:.2f} KiB'}")
+            for site in report["memory"]["sites"]:
+                print(f"  {site['growth_kb']:10.1f} KiB  {site['site']}")
+        for metric, value in report.get("comparison", {}).items():
+            flag = "REGRESSED" if value["regressed"] else "ok"
+            print(f"  {metric}: {value['current']:.4g} vs {value['baseline']:.4g} ({value['change']:+.1%}) {flag}")
 
     def generate_action(self, act_space):
         """
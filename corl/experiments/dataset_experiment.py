@@ -0,0 +1,427 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Offline dataset generation
+
+Rollout workers step the environments with the configured policies and every worker writes its own
+size bounded shards from its process, the driver only receives the number of sampled steps. The observations are the
+ones fed to the policies (normalized by the glues and flattened by the rllib preprocessor) and the
+actions are the outputs of the policies, so the shards can warm start a policy by behaviour cloning.
+"""
+import argparse
+import copy
+import glob
+import os
+import pickle
+import time
+import typing
+
+import numpy as np
+import ray
+import tree
+from pydantic import BaseModel, PositiveFloat, PositiveInt
+from ray.rllib.agents.trainer import COMMON_CONFIG
+from ray.rllib.evaluation.worker_set import WorkerSet
+from ray.rllib.offline import IOContext, JsonWriter, OutputWriter
+from ray.rllib.policy.policy import PolicySpec
+from ray.rllib.policy.sample_batch import MultiAgentBatch, SampleBatch
+from ray.tune.registry import get_trainable_cls
+from typing_extensions import Literal
+
+from corl.environment.multi_agent_env import ACT3MultiAgentEnv, ACT3MultiAgentEnvValidator
+from corl.episode_parameter_providers.remote import RemoteEpisodeParameterProvider
+from corl.experiments.benchmark_experiment import BenchmarkExperiment, BenchmarkExperimentValidator
+from corl.libraries.benchmark_util import write_report
+from corl.libraries.factory import Factory
+
+# columns of the npz shards, actions are added flattened
+SHARD_COLUMNS = (
+    SampleBatch.OBS,
+    SampleBatch.NEXT_OBS,
+    SampleBatch.REWARDS,
+    SampleBatch.DONES,
+    SampleBatch.EPS_ID,
+    SampleBatch.AGENT_INDEX,
+    SampleBatch.T,
+)
+
+
+class DatasetConfig(BaseModel):
+    """
+    transitions: number of agent steps of the written policies to generate
+    num_workers: rollout workers, defaults to the num_workers of the rllib config. 0 samples in the driver
+    num_envs_per_worker: envs stepped by each rollout worker, defaults to the rllib config
+    rollout_fragment_length: steps of every env between two writes of a worker
+    file_format: 'npz' columnar shards or 'json' rllib SampleBatch files readable by the rllib json reader
+    max_file_size_mb: a shard is closed once it holds this much data (before compression)
+    compress: compress the shards, the observation columns of json files are compressed
+    policies: policies whose samples are written, empty writes every policy
+    restore_checkpoint: rllib trainer checkpoint file restoring the weights of restore_policies
+    restore_policies: policies restored from the checkpoint, empty restores every policy of the checkpoint
+    explore: act with the exploration of the policies instead of deterministically
+    output_dir: directory of the dataset, defaults to <output>/dataset
+    report_interval_s: seconds between two throughput reports
+    """
+    transitions: PositiveInt = 1000000
+    num_workers: typing.Optional[int] = None
+    num_envs_per_worker: typing.Optional[PositiveInt] = None
+    rollout_fragment_length: PositiveInt = 1000
+    file_format: Literal["npz", "json"] = "npz"
+    max_file_size_mb: PositiveFloat = 64.0
+    compress: bool = True
+    policies: typing.List[str] = []
+    restore_checkpoint: typing.Optional[str] = None
+    restore_policies: typing.List[str] = []
+    explore: bool = False
+    output_dir: typing.Optional[str] = None
+    report_interval_s: PositiveFloat = 30.0
+
+
+class DatasetExperimentValidator(BenchmarkExperimentValidator):
+    """
+    dataset_config: settings of the dataset generation
+    """
+    dataset_config: DatasetConfig = DatasetConfig()
+
+
+def flatten_actions(actions: typing.Any, size: int) -> np.ndarray:
+    """Concatenate the leaves of a batch of (possibly nested) actions into one (size, n) float32 array"""
+    leaves = tree.flatten(actions)
+    if not leaves:
+        return np.zeros((size, 0), dtype=np.float32)
+    return np.concatenate([np.reshape(np.asarray(leaf, dtype=np.float32), (size, -1)) for leaf in leaves], axis=1)
+
+
+class DatasetWriter(OutputWriter):
+    """Writer of a rollout worker, writes the samples of the selected policies as npz shards or rllib json files
+    """
+
+    def __init__(self, ioctx: IOContext, output_dir: str, config: DatasetConfig) -> None:
+        """
+        Parameters
+        ----------
+        ioctx : IOContext
+            io context of the rollout worker, identifies the worker in the shard names
+        output_dir : str
+            directory of the dataset
+        config : DatasetConfig
+            format and size of the files
+        """
+        self._output_dir = output_dir
+        self._config = config
+        self._worker_index = ioctx.worker_index
+        self._policies = set(config.policies)
+        self._max_bytes = int(config.max_file_size_mb * 1024 * 1024)
+        self._json: typing.Optional[JsonWriter] = None
+        if config.file_format == "json":
+            compress_columns = [SampleBatch.OBS, SampleBatch.NEXT_OBS] if config.compress else []
+            self._json = JsonWriter(output_dir, ioctx, max_file_size=self._max_bytes, compress_columns=compress_columns)
+        self._buffers: typing.Dict[str, typing.List[typing.Dict[str, np.ndarray]]] = {}
+        self._buffered_bytes: typing.Dict[str, int] = {}
+        self._shards: typing.Dict[str, int] = {}
+
+    def write(self, sample_batch: SampleBatch) -> None:
+        batch = sample_batch.as_multi_agent()
+        policy_batches = {
+            policy_id: policy_batch
+            for policy_id, policy_batch in batch.policy_batches.items()
+            if not self._policies or policy_id in self._policies
+        }
+        if self._json is not None:
+            if policy_batches:
+                self._json.write(MultiAgentBatch(policy_batches, batch.env_steps()))
+            return
+
+        for policy_id, policy_batch in policy_batches.items():
+            columns = {key: np.asarray(policy_batch[key]) for key in SHARD_COLUMNS if key in policy_batch}
+            columns[SampleBatch.ACTIONS] = flatten_actions(policy_batch[SampleBatch.ACTIONS], len(policy_batch))
+            self._buffers.setdefault(policy_id, []).append(columns)
+            self._buffered_bytes[policy_id] = self._buffered_bytes.get(policy_id, 0) + sum(value.nbytes for value in columns.values())
+            if self._buffered_bytes[policy_id] >= self._max_bytes:
+                self._write_shard(policy_id)
+
+    def flush(self) -> None:
+        """Write the buffered samples as the last shard of each policy"""
+        for policy_id in list(self._buffers):
+            self._write_shard(policy_id)
+
+    def _write_shard(self, policy_id: str) -> None:
+        chunks = self._buffers.pop(policy_id, [])
+        self._buffered_bytes.pop(policy_id, None)
+        if not chunks:
+            return
+        shard = self._shards.get(policy_id, 0)
+        self._shards[policy_id] = shard + 1
+        directory = os.path.join(self._output_dir, policy_id)
+        os.makedirs(directory, exist_ok=True)
+        filename = os.path.join(directory, f"part-{self._worker_index:04d}-{shard:05d}.npz")
+        columns = {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+        # write then rename so readers never load a partial shard
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, "wb") as fp:
+            if self._config.compress:
+                np.savez_compressed(fp, **columns)
+            else:
+                np.savez(fp, **columns)
+        os.replace(tmp_filename, filename)
+
+
+def iter_dataset_shards(output_dir: str, policy_id: str) -> typing.Iterator[typing.Dict[str, np.ndarray]]:
+    """Load the npz shards of a policy one at a time
+
+    Parameters
+    ----------
+    output_dir : str
+        directory of the dataset
+    policy_id : str
+        policy whose shards are loaded
+    """
+    for filename in sorted(glob.glob(os.path.join(output_dir, policy_id, "part-*.npz"))):
+        with np.load(filename) as data:
+            yield {key: data[key] for key in data.files}
+
+
+def _dataset_writer(worker, output_dir: str, config: DatasetConfig) -> DatasetWriter:
+    """Dataset writer of a rollout worker, created with the first sample"""
+    writer = getattr(worker, "_corl_dataset_writer", None)
+    if writer is None:
+        writer = DatasetWriter(worker.io_context, output_dir, config)
+        worker._corl_dataset_writer = writer  # pylint: disable=protected-access
+    return writer
+
+
+def _sample(worker, output_dir: str, config: DatasetConfig) -> typing.Tuple[int, int]:
+    """Sample on a rollout worker and write the batch from the worker, only the step counts are returned"""
+    batch = worker.sample().as_multi_agent()
+    _dataset_writer(worker, output_dir, config).write(batch)
+    transitions = sum(
+        policy_batch.agent_steps()
+        for policy_id, policy_batch in batch.policy_batches.items()
+        if not config.policies or policy_id in config.policies
+    )
+    return batch.env_steps(), transitions
+
+
+def _flush(worker, output_dir: str, config: DatasetConfig) -> None:
+    _dataset_writer(worker, output_dir, config).flush()
+
+
+def _set_policy_states(worker, states: typing.Mapping[str, typing.Any]) -> None:
+    for policy_id, state in states.items():
+        worker.policy_map[policy_id].set_state(state)
+
+
+class DatasetExperiment(BenchmarkExperiment):
+    """
+    Generates offline datasets by rolling out the environment with scripted, random or restored policies
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.config: DatasetExperimentValidator
+        super().__init__(**kwargs)
+
+    @property
+    def get_validator(self) -> typing.Type[DatasetExperimentValidator]:
+        return DatasetExperimentValidator
+
+    def run_experiment(self, args: argparse.Namespace) -> None:
+
+        rllib_config = self._select_rllib_config(args.compute_platform)
+        dataset_config = self.config.dataset_config
+
+        if args.compute_platform in ['ray']:
+            self._update_ray_config_for_ray_platform()
+
+        if args.debug:
+            dataset_config.num_workers = 0
+            self.config.ray_config['local_mode'] = True
+
+        ray.init(**self.config.ray_config)
+
+        self.config.env_config["agents"], self.config.env_config["agent_platforms"] = self.create_agents(
+            args.platform_config, args.agent_config
+        )
+
+        self.config.env_config["horizon"] = rllib_config["horizon"]
+
+        if args.output:
+            self.config.env_config["output_path"] = args.output
+
+        if args.name:
+            self.config.env_config["TrialName"] = args.name
+
+        if args.other_platform:
+            self.config.env_config["other_platforms"] = self.create_other_platforms(args.other_platform)
+
+        if not self.config.ray_config['local_mode']:
+            self.config.env_config['episode_parameter_provider'] = RemoteEpisodeParameterProvider.wrap_epp_factory(
+                Factory(**self.config.env_config['episode_parameter_provider']),
+                actor_name=ACT3MultiAgentEnv.episode_parameter_provider_name
+            )
+
+            for agent_name, agent_configs in self.config.env_config['agents'].items():
+                agent_configs.class_config.config['episode_parameter_provider'] = RemoteEpisodeParameterProvider.wrap_epp_factory(
+                    Factory(**agent_configs.class_config.config['episode_parameter_provider']), agent_name
+                )
+
+        self.config.env_config['epp_registry'] = ACT3MultiAgentEnvValidator(**self.config.env_config).epp_registry
+
+        output_dir = dataset_config.output_dir or os.path.join(args.output or "data/corl", "dataset")
+        os.makedirs(output_dir, exist_ok=True)
+
+        report = self.generate_dataset(rllib_config, output_dir)
+        write_report(report, os.path.join(output_dir, "dataset.json"))
+        print(
+            f"{report['name']}: {report['transitions']} transitions ({report['env_steps']} env steps) in {report['time_s']:.1f} s, "
+            f"{report['transitions_per_s']:.1f} transitions/s written to {output_dir}"
+        )
+
+    def generate_dataset(self, rllib_config: typing.Dict[str, typing.Any], output_dir: str) -> typing.Dict[str, typing.Any]:
+        """Roll out the rollout workers until the configured number of transitions is written
+
+        Parameters
+        ----------
+        rllib_config : typing.Dict[str, typing.Any]
+            the rllib config of the compute platform, merged over the rllib defaults for the rollout workers
+        output_dir : str
+            directory of the dataset
+
+        Returns
+        -------
+        typing.Dict[str, typing.Any]
+            json serializable throughput report
+        """
+        dataset_config = self.config.dataset_config
+        num_workers = rllib_config.get("num_workers", 0) if dataset_config.num_workers is None else dataset_config.num_workers
+
+        trainer_config = copy.deepcopy(COMMON_CONFIG)
+        trainer_config.update(rllib_config)
+        trainer_config.update(
+            {
+                "env": ACT3MultiAgentEnv,
+                "env_config": self.config.env_config,
+                "num_workers": num_workers,
+                "num_envs_per_worker": dataset_config.num_envs_per_worker or rllib_config.get("num_envs_per_worker", 1),
+                "rollout_fragment_length": dataset_config.rollout_fragment_length,
+                "batch_mode": "truncate_episodes",
+                "explore": dataset_config.explore,
+                "multiagent": {
+                    "policies": self.create_policies(trainer_config),
+                    "policy_mapping_fn": lambda agent_id: agent_id,
+                    "policies_to_train": [],
+                },
+            }
+        )
+
+        workers = WorkerSet(
+            env_creator=ACT3MultiAgentEnv, trainer_config=trainer_config, num_workers=num_workers, local_worker=num_workers == 0
+        )
+        remote_workers = workers.remote_workers()
+        sample_args = (output_dir, dataset_config)
+        try:
+            if dataset_config.restore_checkpoint is not None:
+                states = self.restore_policy_states(dataset_config.restore_checkpoint, dataset_config.restore_policies)
+                if remote_workers:
+                    ray.get([worker.apply.remote(_set_policy_states, states) for worker in remote_workers])
+                else:
+                    _set_policy_states(workers.local_worker(), states)
+
+            env_steps = 0
+            transitions = 0
+            samples = 0
+            start = last_report = time.perf_counter()
+            if remote_workers:
+                # every worker always has a sample in flight, the slowest env does not hold back the others
+                in_flight = {worker.apply.remote(_sample, *sample_args): worker for worker in remote_workers}
+                while in_flight:
+                    [ready], _ = ray.wait(list(in_flight), num_returns=1)
+                    worker = in_flight.pop(ready)
+                    sampled_env_steps, sampled_transitions = ray.get(ready)
+                    env_steps += sampled_env_steps
+                    transitions += sampled_transitions
+                    samples += 1
+                    # stop submitting once the samples in flight are expected to reach the target
+                    if transitions + len(in_flight) * transitions / samples < dataset_config.transitions:
+                        in_flight[worker.apply.remote(_sample, *sample_args)] = worker
+                    last_report = self._report_progress(transitions, env_steps, start, last_report)
+                ray.get([worker.apply.remote(_flush, *sample_args) for worker in remote_workers])
+            else:
+                local_worker = workers.local_worker()
+                while transitions < dataset_config.transitions:
+                    sampled_env_steps, sampled_transitions = _sample(local_worker, *sample_args)
+                    env_steps += sampled_env_steps
+                    transitions += sampled_transitions
+                    last_report = self._report_progress(transitions, env_steps, start, last_report)
+                _flush(local_worker, *sample_args)
+            elapsed = time.perf_counter() - start
+        finally:
+            workers.stop()
+            for worker in remote_workers:
+                worker.__ray_terminate__.remote()
+
+        return {
+            "name": self.config.env_config.get("TrialName"),
+            "output_dir": output_dir,
+            "file_format": dataset_config.file_format,
+            "num_workers": num_workers,
+            "transitions": transitions,
+            "env_steps": env_steps,
+            "time_s": elapsed,
+            "transitions_per_s": transitions / elapsed,
+            "env_steps_per_s": env_steps / elapsed,
+        }
+
+    def create_policies(self, trainer_config: typing.Dict[str, typing.Any]) -> typing.Dict[str, PolicySpec]:
+        """Policy of every agent, agents without a policy_class use the default policy of the trainer of the tune config"""
+        env = self.create_env()
+        agents = self.config.env_config['agents']
+        policies = {}
+        for agent_id, observation_space in env.observation_space.spaces.items():
+            policy_config = agents[agent_id].policy_config
+            policy_class = policy_config["policy_class"]
+            if policy_class is None:
+                trainer_class = get_trainable_cls(self.config.tune_config["run_or_experiment"])
+                # the default policy class only depends on the config, not on a trainer instance
+                policy_class = trainer_class.get_default_policy_class(trainer_class, trainer_config)
+            policies[agent_id] = PolicySpec(policy_class, observation_space, env.action_space[agent_id], policy_config["config"])
+        unknown = set(self.config.dataset_config.policies) - set(policies)
+        if unknown:
+            raise ValueError(f"Dataset policies {sorted(unknown)} are not policies of the environment agents {sorted(policies)}")
+        return policies
+
+    @staticmethod
+    def restore_policy_states(checkpoint_filename: str, policy_ids: typing.Sequence[str]) -> typing.Dict[str, typing.Any]:
+        """Policy states of an rllib trainer checkpoint
+
+        Parameters
+        ----------
+        checkpoint_filename : str
+            the checkpoint file, e.g. checkpoint_000010/checkpoint-10
+        policy_ids : typing.Sequence[str]
+            policies to restore, empty restores every policy of the checkpoint
+        """
+        with open(checkpoint_filename, "rb") as fp:
+            checkpoint = pickle.load(fp)
+        states = pickle.loads(checkpoint["worker"])["state"]
+        missing = set(policy_ids) - set(states)
+        if missing:
+            raise ValueError(f"Policies {sorted(missing)} are not in checkpoint {checkpoint_filename}")
+        return {policy_id: state for policy_id, state in states.items() if not policy_ids or policy_id in policy_ids}
+
+    def _report_progress(self, transitions: int, env_steps: int, start: float, last_report: float) -> float:
+        now = time.perf_counter()
+        if now - last_report < self.config.dataset_config.report_interval_s:
+            return last_report
+        elapsed = now - start
+        print(
+            f"{transitions}/{self.config.dataset_config.transitions} transitions, "
+            f"{transitions / elapsed:.1f} transitions/s, {env_steps / elapsed:.1f} env steps/s"
+        )
+        return now
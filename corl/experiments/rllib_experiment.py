@@ -36,6 +36,7 @@ from corl.episode_parameter_providers.remote import RemoteEpisodeParameterProvid
 from corl.experiments.base_experiment import BaseExperiment, BaseExperimentValidator
 from corl.libraries.factory import Factory
 from corl.libraries.rllib_setup_util import AutoRllibConfigSetup, auto_configure_rllib_config
+from corl.models import register_custom_models
 from corl.parsers.yaml_loader import apply_patches
 from corl.policies.base_policy import BasePolicyValidator
 
@@ -234,6 +235,9 @@ class RllibExperiment(BaseExperiment):
                 search_class = self.config.hparam_search_class()
             search_class.add_algorithm_hparams(rllib_config, self.config.tune_config)
 
+        # corl models are not imported until a config asks for them
+        register_custom_models(rllib_config)
+
         tune.run(
             config=rllib_config,
             **self.config.tune_config,
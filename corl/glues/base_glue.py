@@ -94,6 +94,9 @@ class BaseAgentGlue(abc.ABC):
 
     """
 
+    # get_observation may be called from a worker thread, concurrently with the glues of the other agents
+    thread_safe: bool = False
+
     def __init__(self, **kwargs) -> None:
         """
         The init function for an Agent Glue class
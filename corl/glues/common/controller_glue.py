@@ -76,10 +76,10 @@ class ControllerGlue(BaseAgentControllerGlue):
         """
         action_space_dict = {}
         if isinstance(self._control_properties, list):
-            action_spaces = [control_prop.create_space() for control_prop in self._control_properties]
+            action_spaces = [control_prop.get_space() for control_prop in self._control_properties]
             action_space_dict[self._key] = gym.spaces.tuple.Tuple(tuple(action_spaces))
         else:
-            action_space_dict[self._key] = self._control_properties.create_space()
+            action_space_dict[self._key] = self._control_properties.get_space()
 
         return gym.spaces.Dict(action_space_dict)
 
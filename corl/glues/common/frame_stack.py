@@ -0,0 +1,141 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Frame stacking of the observations of a glue
+"""
+import typing
+from collections import OrderedDict
+from functools import lru_cache
+
+import gym
+import numpy as np
+from pydantic import PositiveInt
+
+from corl.glues.base_wrapper import BaseWrapperGlue, BaseWrapperGlueValidator
+from corl.libraries.env_space_util import EnvSpaceUtil
+
+
+class FrameStackGlueValidator(BaseWrapperGlueValidator):
+    """
+    num_frames: number of consecutive observations of the wrapped glue in the stack, oldest first
+    zero_copy: emit a read-only view of the ring buffer instead of a copy. The view is overwritten by the
+               next step, so this is only safe when the consumer copies the observation before stepping again.
+    """
+    num_frames: PositiveInt = 4
+    zero_copy: bool = False
+
+
+class FrameStackGlue(BaseWrapperGlue):
+    """
+    FrameStackGlue wraps an observation glue and outputs its last num_frames normalized observations.
+
+    Every Box of the wrapped normalized observation space becomes a Box of shape (num_frames, *shape).
+    The frames are kept in a ring buffer of 2 * num_frames rows where every frame is written twice, so
+    the stack is always the contiguous slice ring[head:head + num_frames]. At the start of an episode
+    the stack is filled with the first observation, like the rllib view requirement shift it replaces.
+
+    The models consume the stack with `env_frame_stack: True` in their custom_model_config, rllib then
+    stores a single observation per timestep instead of a window of num_frames observations.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.config: FrameStackGlueValidator
+        super().__init__(**kwargs)
+
+        inner_space = self.glue().normalized_observation_space()
+        if isinstance(inner_space, gym.spaces.Dict):
+            self._leaf_spaces: typing.Dict[typing.Optional[str], gym.spaces.Space] = OrderedDict(inner_space.spaces)
+        else:
+            self._leaf_spaces = OrderedDict([(None, inner_space)])
+        for key, space in self._leaf_spaces.items():
+            if not isinstance(space, gym.spaces.Box):
+                raise TypeError(f"FrameStackGlue only stacks Box observations, {key} of {self.glue().get_unique_name()} is {space}")
+
+        num_frames = self.config.num_frames
+        self._rings = {key: np.zeros((2 * num_frames, ) + space.shape, dtype=space.dtype) for key, space in self._leaf_spaces.items()}
+        # slot of the oldest frame in the stack, -1 until the first observation
+        self._head = -1
+
+    @property
+    def get_validator(self) -> typing.Type[FrameStackGlueValidator]:
+        """Return validator"""
+        return FrameStackGlueValidator
+
+    @lru_cache(maxsize=1)
+    def get_unique_name(self) -> str:
+        """Class method that retreives the unique name for the glue instance
+        """
+        wrapped_glue_name = self.glue().get_unique_name()
+        if wrapped_glue_name is None:
+            return None
+        return wrapped_glue_name + "FrameStack"
+
+    @lru_cache(maxsize=1)
+    def observation_space(self) -> gym.spaces.Space:
+        """The normalized observation space of the wrapped glue with a leading frame dimension"""
+        num_frames = self.config.num_frames
+        spaces = OrderedDict()
+        for key, space in self._leaf_spaces.items():
+            spaces[key] = gym.spaces.Box(
+                low=np.broadcast_to(space.low, (num_frames, ) + space.shape),
+                high=np.broadcast_to(space.high, (num_frames, ) + space.shape),
+                dtype=space.dtype
+            )
+        if None in spaces:
+            return spaces[None]
+        return gym.spaces.Dict(spaces)
+
+    @lru_cache(maxsize=1)
+    def normalized_observation_space(self) -> typing.Optional[gym.spaces.Space]:
+        """The frames are normalized by the wrapped glue"""
+        return self.observation_space()
+
+    def normalize_observation(self, observation: EnvSpaceUtil.sample_type) -> EnvSpaceUtil.sample_type:
+        """The frames are normalized by the wrapped glue"""
+        return observation
+
+    def get_observation(self) -> EnvSpaceUtil.sample_type:
+        """Push the current normalized observation of the wrapped glue and return the stack"""
+        inner_glue = self.glue()
+        observation = inner_glue.normalize_observation(inner_glue.get_observation())
+        self._push(observation)
+        return self._stack()
+
+    def get_info_dict(self) -> EnvSpaceUtil.sample_type:
+        """Info of the wrapped glue"""
+        return self.glue().get_info_dict()
+
+    def _push(self, observation: EnvSpaceUtil.sample_type) -> None:
+        num_frames = self.config.num_frames
+        for key, ring in self._rings.items():
+            frame = observation if key is None else observation[key]
+            if self._head < 0:
+                ring[:] = frame
+            else:
+                # the new frame is the last one of the stack starting after the current head
+                slot = self._head
+                ring[slot] = frame
+                ring[slot + num_frames] = frame
+        self._head = 0 if self._head < 0 else (self._head + 1) % num_frames
+
+    def _stack(self) -> EnvSpaceUtil.sample_type:
+        window = slice(self._head, self._head + self.config.num_frames)
+        stacks = OrderedDict()
+        for key, ring in self._rings.items():
+            stack = ring[window]
+            if self.config.zero_copy:
+                stack = stack.view()
+                stack.flags.writeable = False
+            else:
+                stack = stack.copy()
+            stacks[key] = stack
+        if None in stacks:
+            return stacks[None]
+        return stacks
@@ -170,11 +170,11 @@ class ObserveSensor(BaseAgentPlatformGlue):
         """
         d = gym.spaces.dict.Dict()
         if isinstance(self._sensor.measurement_properties, BoxProp):
-            d.spaces[self.Fields.DIRECT_OBSERVATION] = self._sensor.measurement_properties.create_converted_space(self.out_units)
+            d.spaces[self.Fields.DIRECT_OBSERVATION] = self._sensor.measurement_properties.get_converted_space(self.out_units)
         elif isinstance(self._sensor.measurement_properties, (DiscreteProp)):
-            d.spaces[self.Fields.DIRECT_OBSERVATION] = self._sensor.measurement_properties.create_space()
+            d.spaces[self.Fields.DIRECT_OBSERVATION] = self._sensor.measurement_properties.get_space()
         elif isinstance(self._sensor.measurement_properties, (MultiBinary)):
-            d.spaces[self.Fields.DIRECT_OBSERVATION] = self._sensor.measurement_properties.create_space()
+            d.spaces[self.Fields.DIRECT_OBSERVATION] = self._sensor.measurement_properties.get_space()
         else:
             raise TypeError("Only supports {BoxProp.__name__}, {MultiBinary.__name__} and {DiscreteProp.__name__}")
         return d
@@ -185,6 +185,12 @@ class ObserveSensor(BaseAgentPlatformGlue):
         d = OrderedDict()
         if isinstance(self._sensor.measurement_properties, BoxProp):
             sensed_value = self._sensor.get_measurement()
+            to_factors, from_factors = self._sensor.measurement_properties.conversion_factors(self.out_units)
+            if np.shape(sensed_value) == to_factors.shape:
+                # same element wise arithmetic as Convert, with the unit factors cached on the property
+                converted = np.asarray(sensed_value, dtype=np.float64) * to_factors / from_factors
+                d[self.Fields.DIRECT_OBSERVATION] = converted.astype(np.float32)
+                return d
             if isinstance(sensed_value, np.ndarray):
                 sensed_value = sensed_value.tolist()
             else:
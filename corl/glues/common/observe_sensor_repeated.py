@@ -163,15 +163,15 @@ class ObserveSensorRepeated(BaseAgentPlatformGlue):
             if not isinstance(field_meas, (DiscreteProp, MultiBinary)):
                 assert isinstance(field_meas, BoxProp), "Unexpected field_meas type"
                 if field_name not in self.out_units:
-                    child_space.spaces[field_name] = field_meas.create_space()
+                    child_space.spaces[field_name] = field_meas.get_space()
                 elif isinstance(self.out_units[field_name], list):
                     units = self.out_units[field_name]
                     assert isinstance(units, list), "Unexpected units type"
-                    child_space.spaces[field_name] = field_meas.create_converted_space(units)
+                    child_space.spaces[field_name] = field_meas.get_converted_space(units)
                 else:
-                    child_space.spaces[field_name] = field_meas.create_converted_space([self.out_units[field_name]] * len(field_meas.low))
+                    child_space.spaces[field_name] = field_meas.get_converted_space([self.out_units[field_name]] * len(field_meas.low))
             else:
-                child_space.spaces[field_name] = field_meas.create_space()
+                child_space.spaces[field_name] = field_meas.get_space()
 
         d.spaces[self.Fields.DIRECT_OBSERVATION] = Repeated(
             child_space=child_space,
@@ -201,11 +201,9 @@ class ObserveSensorRepeated(BaseAgentPlatformGlue):
                 if field_name in out_units:
                     prop = m_props[field_name]
                     if isinstance(prop, BoxProp):
-                        old_unit = prop.unit[0]
-                        assert isinstance(old_unit, str)
-                        unit_class = GetUnitFromStr(old_unit)
+                        unit_class = prop.unit_enums.flat[0]
                         if unit_class != NoneUnitType.NoneUnit:
-                            tmp_row[field_name] = Convert(obs, old_unit, out_units[field_name])
+                            tmp_row[field_name] = Convert(obs, unit_class, out_units[field_name])
                 if self.config.enable_clip:
                     field_space = obs_child_space.spaces[field_name]
                     if isinstance(field_space, gym.spaces.Box):
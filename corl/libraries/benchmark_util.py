@@ -0,0 +1,336 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Timing and statistics helpers for environment benchmarks
+"""
+import functools
+import json
+import math
+import os
+import statistics
+import time
+import tracemalloc
+import typing
+from collections import defaultdict
+
+import numpy as np
+
+# env attribute -> phase name, the private methods are looked up through the instance so they can be wrapped per instance
+ENV_PHASES: typing.Dict[str, str] = {
+    "_ACT3MultiAgentEnv__apply_action": "apply_action",
+    "_ACT3MultiAgentEnv__get_observations_from_glues": "observations",
+    "_ACT3MultiAgentEnv__get_info_from_glue": "info",
+    "_ACT3MultiAgentEnv__get_done_from_agents": "dones",
+    "_ACT3MultiAgentEnv__get_reward_from_agents": "rewards",
+    "create_training_observations": "training_observations",
+    "_make_glues": "make_glues",
+    "_make_rewards": "make_rewards",
+    "_make_dones": "make_dones",
+}
+
+SIMULATOR_PHASES: typing.Dict[str, str] = {
+    "step": "simulator_step",
+    "reset": "simulator_reset",
+}
+
+# metric path -> True if larger values are better
+COMPARED_METRICS: typing.Dict[str, bool] = {
+    "sps.mean": True,
+    "step_latency_ms.p50": False,
+    "step_latency_ms.p95": False,
+    "step_latency_ms.p99": False,
+    "reset_latency_ms.p50": False,
+}
+
+
+_CORL_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# allocations made directly by the benchmark bookkeeping (latency lists...) are not env growth
+_BENCHMARK_FILES = ("*/corl/libraries/benchmark_util.py", "*/corl/experiments/benchmark_experiment.py")
+
+
+class BenchmarkRegressionError(RuntimeError):
+    """Raised when a benchmark is slower than its baseline by more than the allowed tolerance"""
+
+
+class MemoryGrowthError(RuntimeError):
+    """Raised when the steady state memory growth of a benchmark exceeds the allowed threshold"""
+
+
+class PhaseTimer:
+    """Accumulates the wall time spent in named phases of the environment
+
+    The phases are measured by wrapping the methods of a single env instance, the env class is
+    not modified so there is no cost when no timer is attached.
+    """
+
+    def __init__(self) -> None:
+        self.totals: typing.Dict[str, float] = defaultdict(float)
+        self.counts: typing.Dict[str, int] = defaultdict(int)
+        self.enabled = True
+
+    def attach(self, env) -> None:
+        """Wrap the phase methods of the env and of its simulator"""
+        for attribute, phase in ENV_PHASES.items():
+            self._wrap(env, attribute, phase)
+        for attribute, phase in SIMULATOR_PHASES.items():
+            self._wrap(env.simulator, attribute, phase)
+
+    def reset(self) -> None:
+        """Clear the accumulated times"""
+        self.totals.clear()
+        self.counts.clear()
+
+    def _wrap(self, obj, attribute: str, phase: str) -> None:
+        method = getattr(obj, attribute, None)
+        if method is None:
+            return
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if not self.enabled:
+                return method(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter() - start
+                self.counts[phase] += 1
+
+        setattr(obj, attribute, timed)
+
+    def breakdown(self, total_time: float) -> typing.Dict[str, typing.Dict[str, typing.Optional[float]]]:
+        """Time per phase as totals, fraction of the total env time and mean time per call
+
+        Parameters
+        ----------
+        total_time : float
+            total time spent in env.step and env.reset, the time not attributed to a phase is reported as 'other'
+        """
+        result = {
+            phase: {
+                "total_s": total, "fraction": total / total_time if total_time > 0 else 0.0, "mean_ms": 1000 * total / self.counts[phase]
+            }
+            for phase,
+            total in sorted(self.totals.items(), key=lambda item: item[1], reverse=True)
+        }
+        # reset calls the observation/glue phases as well, so 'other' covers everything in step/reset not listed above
+        other = max(total_time - sum(self.totals.values()), 0.0)
+        result["other"] = {"total_s": other, "fraction": other / total_time if total_time > 0 else 0.0, "mean_ms": None}
+        return result
+
+
+def corl_module(filename: str) -> typing.Optional[str]:
+    """Dotted corl module name of a source file, None for files outside of corl"""
+    filename = os.path.abspath(filename)
+    if not filename.startswith(_CORL_ROOT + os.sep):
+        return None
+    relative = os.path.splitext(os.path.relpath(filename, os.path.dirname(_CORL_ROOT)))[0]
+    return relative.replace(os.sep, ".")
+
+
+class MemoryTracker:
+    """Records tracemalloc snapshots every N episodes and reports the growth between them
+
+    Growth is attributed to the most recent corl frame of each allocation traceback, so memory
+    allocated by numpy/gym/deque on behalf of a corl line is charged to that line.
+
+    Parameters
+    ----------
+    snapshot_interval : int
+        number of episodes between snapshots
+    steady_state_snapshots : int
+        number of initial snapshots (caches filling, first episodes) excluded from the growth estimate
+    traceback_frames : int
+        number of frames stored per allocation
+    """
+
+    def __init__(self, snapshot_interval: int, steady_state_snapshots: int = 1, traceback_frames: int = 16) -> None:
+        self.snapshot_interval = snapshot_interval
+        self.steady_state_snapshots = steady_state_snapshots
+        self.traceback_frames = traceback_frames
+        self.snapshots: typing.List[typing.Tuple[int, tracemalloc.Snapshot]] = []
+        self._was_tracing = False
+
+    def start(self) -> None:
+        """Start tracing allocations"""
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(self.traceback_frames)
+        self.snapshots.clear()
+
+    def stop(self) -> None:
+        """Stop tracing allocations if this tracker started it"""
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+    def episode_done(self, episode: int) -> None:
+        """Take a snapshot if the episode (counted from 1) is on the snapshot interval"""
+        if episode % self.snapshot_interval == 0:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)] +
+                [tracemalloc.Filter(False, pattern, all_frames=False) for pattern in _BENCHMARK_FILES]
+            )
+            self.snapshots.append((episode, snapshot))
+
+    def report(self, top: int = 10) -> typing.Dict[str, typing.Any]:
+        """Growth per episode over the steady state snapshots and the top growth sites by corl module
+
+        Returns
+        -------
+        typing.Dict[str, typing.Any]
+            json serializable memory report, growth_per_episode_kb is None when there are fewer than two steady state snapshots
+        """
+        totals = [(episode, sum(stat.size for stat in snapshot.statistics("filename"))) for episode, snapshot in self.snapshots]
+        steady = self.snapshots[self.steady_state_snapshots:]
+        report: typing.Dict[str, typing.Any] = {
+            "snapshots": [{"episode": episode, "traced_kb": size / 1024} for episode, size in totals],
+            "growth_per_episode_kb": None,
+            "modules": {},
+            "sites": [],
+        }
+        if len(steady) < 2:
+            return report
+
+        steady_totals = totals[self.steady_state_snapshots:]
+        episodes = [episode for episode, _ in steady_totals]
+        sizes = [size for _, size in steady_totals]
+        slope = float(np.polyfit(episodes, sizes, 1)[0]) if len(set(episodes)) > 1 else 0.0
+        report["growth_per_episode_kb"] = slope / 1024
+
+        module_growth: typing.Dict[str, int] = defaultdict(int)
+        site_growth: typing.Dict[str, int] = defaultdict(int)
+        for diff in steady[-1][1].compare_to(steady[0][1], "traceback"):
+            if diff.size_diff == 0:
+                continue
+            site = "<external>"
+            module = "<external>"
+            for frame in reversed(diff.traceback):
+                frame_module = corl_module(frame.filename)
+                if frame_module is not None:
+                    module = frame_module
+                    site = f"{frame_module}:{frame.lineno}"
+                    break
+            module_growth[module] += diff.size_diff
+            site_growth[site] += diff.size_diff
+
+        report["modules"] = {
+            module: size / 1024 for module, size in sorted(module_growth.items(), key=lambda item: item[1], reverse=True)[:top]
+        }
+        report["sites"] = [
+            {
+                "site": site, "growth_kb": size / 1024
+            } for site,
+            size in sorted(site_growth.items(), key=lambda item: item[1], reverse=True)[:top]
+        ]
+        return report
+
+
+def check_memory_growth(memory_report: typing.Dict[str, typing.Any], max_growth_per_episode_kb: float) -> None:
+    """Raise MemoryGrowthError when the steady state growth per episode exceeds the threshold"""
+    growth = memory_report.get("growth_per_episode_kb")
+    if growth is not None and growth > max_growth_per_episode_kb:
+        sites = ", ".join(f"{site['site']} (+{site['growth_kb']:.1f} KiB)" for site in memory_report["sites"][:3])
+        raise MemoryGrowthError(
+            f"Memory grows by {growth:.1f} KiB per episode in steady state, limit is {max_growth_per_episode_kb:.1f} KiB. "
+            f"Top growth sites: {sites}"
+        )
+
+
+def latency_summary(samples: typing.Sequence[float]) -> typing.Dict[str, float]:
+    """p50/p95/p99/mean/max of latency samples given in seconds, reported in milliseconds"""
+    if len(samples) == 0:
+        return {"count": 0}
+    values = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": len(values),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+
+def mean_confidence_interval(samples: typing.Sequence[float], confidence: float = 0.95) -> typing.Dict[str, float]:
+    """Mean of the samples with a normal approximation confidence interval"""
+    if len(samples) == 0:
+        return {"count": 0}
+    mean = statistics.fmean(samples)
+    std = statistics.stdev(samples) if len(samples) > 1 else 0.0
+    half_width = statistics.NormalDist().inv_cdf(0.5 + confidence / 2) * std / math.sqrt(len(samples))
+    return {
+        "count": len(samples), "mean": mean, "std": std, "ci_low": mean - half_width, "ci_high": mean + half_width, "confidence": confidence
+    }
+
+
+def get_metric(report: typing.Dict[str, typing.Any], path: str) -> typing.Optional[float]:
+    """Look up a dotted metric path in a report"""
+    value: typing.Any = report
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_reports(report: typing.Dict[str, typing.Any], baseline: typing.Dict[str, typing.Any],
+                    tolerance: float) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """Compare the report metrics against a baseline report
+
+    Parameters
+    ----------
+    report : typing.Dict[str, typing.Any]
+        benchmark report of the current run
+    baseline : typing.Dict[str, typing.Any]
+        benchmark report to compare against
+    tolerance : float
+        allowed relative slowdown, e.g. 0.1 allows 10% fewer steps per second or 10% higher latency
+
+    Returns
+    -------
+    typing.Dict[str, typing.Dict[str, typing.Any]]
+        per metric: current and baseline value, relative change and whether it regressed
+    """
+    comparison = {}
+    for path, higher_is_better in COMPARED_METRICS.items():
+        current = get_metric(report, path)
+        previous = get_metric(baseline, path)
+        if current is None or previous is None or previous == 0:
+            continue
+        change = (current - previous) / previous
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        comparison[path] = {"current": current, "baseline": previous, "change": change, "regressed": regressed}
+    return comparison
+
+
+def check_regressions(comparison: typing.Dict[str, typing.Dict[str, typing.Any]]) -> None:
+    """Raise BenchmarkRegressionError listing every regressed metric"""
+    regressed = {path: value for path, value in comparison.items() if value["regressed"]}
+    if regressed:
+        details = ", ".join(
+            f"{path}: {value['current']:.4g} vs baseline {value['baseline']:.4g} ({value['change']:+.1%})"
+            for path,
+            value in regressed.items()
+        )
+        raise BenchmarkRegressionError(f"Benchmark regressed against the baseline: {details}")
+
+
+def write_report(report: typing.Dict[str, typing.Any], filename: str) -> None:
+    """Write a report as json"""
+    with open(filename, "w") as fp:
+        json.dump(report, fp, indent=2, sort_keys=True)
+
+
+def read_report(filename: str) -> typing.Dict[str, typing.Any]:
+    """Read a json report"""
+    with open(filename, "r") as fp:
+        return json.load(fp)
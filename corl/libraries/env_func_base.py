@@ -23,12 +23,17 @@ just a simple change in the backend code without disturbing any of the user
 code. Thus functors help in creating maintainable, decoupled and extendable
  codes.
 """
+import abc
+import typing
 
 
 class EnvFuncBase:
     """ base definition for env functions
     """
 
+    # the functor may be called from a worker thread, concurrently with the other functors and agents
+    thread_safe: bool = False
+
     def reset(self):  # pylint: disable=no-self-use
         """ Base reset function for items such as rewards and dones
         """
@@ -44,3 +49,73 @@ class EnvFuncBase:
             The name of the functor
         """
         return type(self).__name__
+
+
+class BatchedEnvFunc(abc.ABC):
+    """Mixin of the env functors that can be evaluated for several agents in a single call
+
+    The environment groups the functors of the agents by batch_key and calls batch_call once per group,
+    each functor then returns its precomputed result when the agent dict calls it. A functor called outside
+    of a group (single agent, direct call) is evaluated as a group of one, so batch_call is the only
+    implementation of the functor.
+    """
+
+    _batched_result: typing.Any = None
+
+    @property
+    def batch_key(self) -> typing.Hashable:
+        """Functors with equal keys are evaluated together
+
+        By default the functors of the same class with the same configuration apart from the agent and platform names.
+        """
+        config = getattr(self, "config", None)
+        if config is None:
+            return type(self)
+        return type(self), repr(config.dict(exclude={"agent_name", "platform_name"}))
+
+    @classmethod
+    @abc.abstractmethod
+    def batch_call(cls, functors: typing.Sequence['BatchedEnvFunc'], **kwargs) -> typing.List[typing.Any]:
+        """Evaluate the functors of a group
+
+        Parameters
+        ----------
+        functors : typing.Sequence[BatchedEnvFunc]
+            functors with the same batch_key, one per agent
+        kwargs
+            the arguments of the per agent call, shared by every agent
+
+        Returns
+        -------
+        typing.List[typing.Any]
+            the result of each functor in order, every result must be a distinct object
+        """
+
+    def _pop_batched_result(self, **kwargs) -> typing.Any:
+        result = self._batched_result
+        if result is None:
+            return type(self).batch_call([self], **kwargs)[0]
+        self._batched_result = None
+        return result
+
+
+def evaluate_batched(functors: typing.Iterable[typing.Any], **kwargs) -> None:
+    """Evaluate the batched functors in groups, the result is returned by the next call of each functor
+
+    Parameters
+    ----------
+    functors : typing.Iterable[typing.Any]
+        the functors about to be called with kwargs, those that are not BatchedEnvFunc are ignored
+    kwargs
+        the arguments of the per agent call
+    """
+    groups: typing.Dict[typing.Hashable, typing.List[BatchedEnvFunc]] = {}
+    for functor in functors:
+        if isinstance(functor, BatchedEnvFunc):
+            # a result left over by a failed step must not be returned
+            functor._batched_result = None  # pylint: disable=protected-access
+            groups.setdefault(functor.batch_key, []).append(functor)
+    for group in groups.values():
+        if len(group) > 1:
+            for functor, result in zip(group, type(group[0]).batch_call(group, **kwargs)):
+                functor._batched_result = result  # pylint: disable=protected-access
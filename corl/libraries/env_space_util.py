@@ -358,6 +358,60 @@ class EnvSpaceUtil:  # pylint: disable=R0904
             val = (space.high + space.low) / 2.0
         return val
 
+    @staticmethod
+    def sample_batch_from_space(space: gym.spaces.Space, batch_size: int, rng: np.random.Generator) -> typing.List[sample_type]:
+        """
+        Draws a batch of samples from a gym space. Bounded Box, Discrete, MultiDiscrete and MultiBinary
+        spaces are drawn with a single call to the generator for the whole batch, any other space falls
+        back to space.sample() for each row.
+
+        Parameters
+        ----------
+        space: gym.spaces.Space
+            the space to sample from
+        batch_size: int
+            number of samples
+        rng: np.random.Generator
+            random generator used for the bulk draws
+
+        Returns
+        -------
+        typing.List[sample_type]
+            one sample of the space per row
+        """
+        batch = EnvSpaceUtil._draw_batch(space, batch_size, rng)
+        return [EnvSpaceUtil._batch_row(space, batch, row) for row in range(batch_size)]
+
+    @staticmethod
+    def _draw_batch(space: gym.spaces.Space, batch_size: int, rng: np.random.Generator):
+        if isinstance(space, gym.spaces.Dict):
+            return OrderedDict((key, EnvSpaceUtil._draw_batch(value, batch_size, rng)) for key, value in space.spaces.items())
+        if isinstance(space, gym.spaces.Tuple):
+            return tuple(EnvSpaceUtil._draw_batch(value, batch_size, rng) for value in space.spaces)
+        if isinstance(space, gym.spaces.Box) and space.is_bounded("both"):
+            shape = (batch_size, ) + space.shape
+            if space.dtype.kind == "f":
+                return rng.uniform(space.low, space.high, size=shape).astype(space.dtype)
+            # same as gym: the integer high bound is inclusive
+            return np.floor(rng.uniform(space.low, space.high.astype(np.int64) + 1, size=shape)).astype(space.dtype)
+        if isinstance(space, gym.spaces.Discrete):
+            return rng.integers(space.n, size=batch_size)
+        if isinstance(space, gym.spaces.MultiDiscrete):
+            return (rng.random((batch_size, ) + space.nvec.shape) * space.nvec).astype(space.dtype)
+        if isinstance(space, gym.spaces.MultiBinary):
+            return rng.integers(0, 2, size=(batch_size, ) + space.shape).astype(space.dtype)
+        return [space.sample() for _ in range(batch_size)]
+
+    @staticmethod
+    def _batch_row(space: gym.spaces.Space, batch, row: int):
+        if isinstance(space, gym.spaces.Dict):
+            return OrderedDict((key, EnvSpaceUtil._batch_row(value, batch[key], row)) for key, value in space.spaces.items())
+        if isinstance(space, gym.spaces.Tuple):
+            return tuple(EnvSpaceUtil._batch_row(value, values, row) for value, values in zip(space.spaces, batch))
+        if isinstance(space, gym.spaces.Discrete) and isinstance(batch, np.ndarray):
+            return int(batch[row])
+        return batch[row]
+
     @staticmethod
     def add_space_samples(
         space_template: gym.spaces.Space,
@@ -18,6 +18,7 @@ import logging
 import typing
 import warnings
 from collections import OrderedDict
+from concurrent.futures import Executor, Future
 
 import numpy as np
 
@@ -166,6 +167,9 @@ class EnvDict(StateDict, Callback):
             [description], by default None
         """
         self._default_kwargs = None
+        self._plan: typing.Optional[typing.List[typing.Tuple[typing.Callable, typing.Optional[str]]]] = None
+        self._stacked: typing.Dict[typing.Any, typing.List[typing.Any]] = {}
+        self._futures: typing.Dict[int, Future] = {}
         self._reduce_fn = reduce_fn
         self._reduce_fn_kwargs = reduce_fn_kwargs or {}
         self._set_default_kwargs(kwargs)
@@ -176,69 +180,141 @@ class EnvDict(StateDict, Callback):
         """
         __call__ Callable function for the environment dictionary type
 
+        The values of each callback result are appended to per key slots that are reused from call to call,
+        the slots are then reduced. The callback names are resolved when the evaluation plan is compiled.
+        Callbacks dispatched by submit return the result of their future.
+
         Returns
         -------
         typing.Tuple[OrderedDict, OrderedDict]
             The reduced rewards and theret information
         """
-        r = [
-            self._default_kwargs,
-        ]
+        stacked = self._stacked
+        for values in stacked.values():
+            values.clear()
+        self._stack(self._default_kwargs)
         ret_info: OrderedDict = OrderedDict()
-
-        def merge(source, destination):
-            """
-            run me with nosetests --with-doctest file.py
-
-            >>> a = { 'first' : { 'all_rows' : { 'pass' : 'dog', 'number' : '1' } } }
-            >>> b = { 'first' : { 'all_rows' : { 'fail' : 'cat', 'number' : '5' } } }
-            >>> merge(b, a) == { 'first' : { 'all_rows' : { 'pass' : 'dog', 'fail' : 'cat', 'number' : '5' } } }
-            True
-            """
-            for key, value in source.items():
-                if isinstance(value, dict):
-                    # get node or create one
-                    node = destination.setdefault(key, {})
-                    merge(value, node)
-                else:
-                    destination[key] = value
-
-            return destination
-
-        for func in self._filtered_process_callbacks:
-            if isinstance(func, OrderedDict):
-                ret = func(*args, **kwargs)
+        futures = self._futures
+        self._futures = {}
+
+        for func, name in self._evaluation_plan:
+            # results of submitted callbacks are merged in plan order, like the sequential evaluation
+            future = futures.pop(id(func), None)
+            ret = func(*args, **kwargs) if future is None else future.result()
+            if name is None:
                 rew, info = ret
-                r.append(rew)
-                ret_info = merge(ret_info, info)
+                self._stack(rew)
+                ret_info = EnvDict._merge(ret_info, info)
+                continue
+
+            # the values are stacked before __all__ is removed from the returned information
+            self._stack(ret)
+
+            # This only affects the info dictionary that is returned.  As the code below merges the output for all agents together,
+            # the __all__ entry would be overwritten to only provide the information of the last agent, which could be confusing or
+            # inaccurate.  Therefore, remove __all__ from the returned information.
+            if '__all__' in ret:
+                del ret['__all__']
+
+            if name in ret_info:
+                common_keys = set(ret.keys()) & set(ret_info[name].keys())
+                if common_keys:
+                    raise self.DuplicateName(f'{name} has common keys: {common_keys}')
+                ret_info[name].update(**ret)
+            else:
+                ret_info[name] = ret
 
-        for func in self._filtered_process_callbacks:
-            if not isinstance(func, OrderedDict):
-                ret = func(*args, **kwargs)
-                # single value
-                r.append(copy.deepcopy(ret))
+        # TODO link with reduce and ret info
+        return self._reduce_stacked({k: v for k, v in stacked.items() if v}, **self._reduce_fn_kwargs), ret_info  # type: ignore
+
+    def submit(self, executor: Executor, *args, **kwargs) -> None:
+        """
+        submit dispatches the thread safe callbacks to the executor, the next call with the same arguments uses their results
+
+        Parameters
+        ----------
+        executor : Executor
+            Executor running the callbacks
+        """
+        self._futures = {
+            id(func): executor.submit(func, *args, **kwargs)
+            for func, name in self._evaluation_plan
+            if name is not None and getattr(func, "thread_safe", False)
+        }
+
+    @staticmethod
+    def _merge(source, destination):
+        """
+        run me with nosetests --with-doctest file.py
+
+        >>> a = { 'first' : { 'all_rows' : { 'pass' : 'dog', 'number' : '1' } } }
+        >>> b = { 'first' : { 'all_rows' : { 'fail' : 'cat', 'number' : '5' } } }
+        >>> EnvDict._merge(b, a) == { 'first' : { 'all_rows' : { 'pass' : 'dog', 'fail' : 'cat', 'number' : '5' } } }
+        True
+        """
+        for key, value in source.items():
+            if isinstance(value, dict):
+                # get node or create one
+                node = destination.setdefault(key, {})
+                EnvDict._merge(value, node)
+            else:
+                destination[key] = value
+
+        return destination
+
+    def _stack(self, values) -> None:
+        """Append the values of a result to the slot of their key"""
+        stacked = self._stacked
+        # EnvDict items are filtered and sorted copies, the raw dict has the same items
+        for key, value in (dict.items(values) if isinstance(values, dict) else values.items()):
+            slot = stacked.get(key)
+            if slot is None:
+                slot = stacked[key] = []
+            slot.append(value)
 
+    @property
+    def _evaluation_plan(self) -> typing.List[typing.Tuple[typing.Callable, typing.Optional[str]]]:
+        """The callbacks to apply with their resolved name, None for the nested EnvDict
+
+        The plan of the unfiltered callbacks is compiled once per registration change.
+        """
+        callbacks = self._filtered_process_callbacks
+        if callbacks is not self._process_callbacks:
+            return self._compile_plan(callbacks)
+        if self._plan is None:
+            self._plan = self._compile_plan(callbacks)
+        return self._plan
+
+    @staticmethod
+    def _compile_plan(callbacks: typing.Sequence[typing.Callable]) -> typing.List[typing.Tuple[typing.Callable, typing.Optional[str]]]:
+        plan: typing.List[typing.Tuple[typing.Callable, typing.Optional[str]]] = [
+            (func, None) for func in callbacks if isinstance(func, OrderedDict)
+        ]
+        for func in callbacks:
+            if not isinstance(func, OrderedDict):
                 try:
                     name = func.__name__
                 except:  # noqa: E722 # pylint: disable=bare-except
                     name = func.name  # type: ignore
+                plan.append((func, name))
+        return plan
 
-                # This only affects the info dictionary that is returned.  As the code below merges the output for all agents together,
-                # the __all__ entry would be overwritten to only provide the information of the last agent, which could be confusing or
-                # inaccurate.  Therefore, remove __all__ from the returned information.
-                if '__all__' in ret:
-                    del ret['__all__']
+    def register_func(self, func: typing.Callable) -> None:
+        self._plan = None
+        super().register_func(func)
 
-                if name in ret_info.keys():
-                    common_keys = set(ret.keys()) & set(ret_info[name].keys())
-                    if common_keys:
-                        raise self.DuplicateName(f'{name} has common keys: {common_keys}')
-                    ret_info[name].update(**ret)
-                else:
-                    ret_info[name] = ret
+    def unregister_func(self, func: typing.Callable) -> None:
+        self._plan = None
+        super().unregister_func(func)
 
-        # TODO link with reduce and ret info
-        return self._reduce(r, **self._reduce_fn_kwargs), ret_info  # type: ignore
+    def unregister_funcs(self) -> None:
+        self._plan = None
+        super().unregister_funcs()
+
+    @property
+    def filtered_process_callbacks(self) -> typing.List[typing.Callable]:
+        """The callbacks applied by the next call"""
+        return self._filtered_process_callbacks
 
     @property
     def _filtered_process_callbacks(self) -> typing.List[typing.Callable]:
@@ -253,15 +329,26 @@ class EnvDict(StateDict, Callback):
         """
         return self._process_callbacks
 
+    def _reduce(self, r: typing.Sequence[typing.Mapping], **kwargs):
+        """
+        _reduce reduces a list of results
+
+        Parameters
+        ----------
+        r : typing.Sequence[typing.Mapping]
+            The results to reduce
+        """
+        return self._reduce_stacked(StateDict.stack_values(r), **kwargs)
+
     @abc.abstractmethod
-    def _reduce(self, r: typing.Callable, **kwargs):
+    def _reduce_stacked(self, stacked: typing.Dict[typing.Any, typing.List[typing.Any]], **kwargs):
         """
-        _reduce user defined reduce function for processing
+        _reduce_stacked user defined reduce function for processing
 
         Parameters
         ----------
-        r : typing.Callable
-            The reduce function to use
+        stacked : typing.Dict[typing.Any, typing.List[typing.Any]]
+            The values of every result by key
         """
         ...
 
@@ -386,15 +473,13 @@ class RewardDict(EnvDict):
         """
         self._agent_filter = alive_agents
 
-    def _reduce(self, r, **kwargs):
+    def _reduce_stacked(self, stacked, **kwargs):
         scale = 1.0
         if RewardDict.SCALE_KEY in kwargs:
             scale = kwargs[RewardDict.SCALE_KEY]
             del kwargs[RewardDict.SCALE_KEY]
         self._reduce_fn = self._reduce_fn or np.sum
-        tmp = StateDict.stack_values(r)
-        tmp = {k: self._reduce_fn(v, **kwargs) / scale for k, v in tmp.items()}
-        return OrderedDict(sorted(tmp.items()))
+        return OrderedDict(sorted((k, self._reduce_fn(v, **kwargs) / scale) for k, v in stacked.items()))
 
     def set_scale_down(self, scale: int):
         """
@@ -477,11 +562,9 @@ class DoneDict(EnvDict):
         """
         self._agent_filter = alive_agents
 
-    def _reduce(self, r, **kwargs):
+    def _reduce_stacked(self, stacked, **kwargs):
         self._reduce_fn = self._reduce_fn or np.any
-        tmp = StateDict.stack_values(r)
-        tmp = {k: self._reduce_fn(v, **kwargs) for k, v in tmp.items()}
-        return StateDict(sorted(tmp.items()))
+        return StateDict(sorted((k, self._reduce_fn(v, **kwargs)) for k, v in stacked.items()))
 
 
 class InfoDict(EnvDict):
@@ -493,8 +576,6 @@ class InfoDict(EnvDict):
         [description]
     """
 
-    def _reduce(self, r, **kwargs):
+    def _reduce_stacked(self, stacked, **kwargs):
         self._reduce_fn = self._reduce_fn or (lambda x: {})
-        tmp = StateDict.stack_values(r)
-        tmp = {k: self._reduce_fn(v, **kwargs) for k, v in tmp.items()}
-        return StateDict(sorted(tmp.items()), recurse=False)
+        return StateDict(sorted((k, self._reduce_fn(v, **kwargs)) for k, v in stacked.items()), recurse=False)
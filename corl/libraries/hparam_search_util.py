@@ -17,6 +17,8 @@ from functools import partial
 from pydantic import BaseModel
 from ray import tune
 
+from corl.models import register_custom_model
+
 
 class ParametersPPO:
     """Utility functions for processing hparam searches in the framework for PPO algorithm
@@ -354,6 +356,7 @@ class ParametersModel:
             dict -- [description]
         """
         model_config = ParametersModel.select_fully_connected_model()
+        register_custom_model("TorchFrameStack")
         model_config["custom_model"] = "TorchFrameStack"
         model_config["custom_model_config"] = {}  # type: ignore
         model_config["custom_model_config"]["num_frames"] = random.choice(list(range(1, 11)))
@@ -12,6 +12,7 @@ limitation or restriction. See accompanying README and LICENSE for details.
 NaN check module
 """
 import traceback
+import typing
 
 import numpy as np
 
@@ -26,37 +27,130 @@ def print_trace():
         print(line.strip())
 
 
+def _gather_leaves(data, arrays: typing.List[np.ndarray], scalars: typing.List[float]) -> bool:
+    """
+    Collects the float leaves of a nested sample, returns False if a leaf is None
+
+    Integer and boolean leaves cannot hold a nan and are skipped
+    """
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, np.ndarray):
+            if item.dtype.kind in "fc":
+                arrays.append(item.reshape(-1))
+            elif item.dtype.kind == "O":
+                stack.extend(item.flat)
+        elif isinstance(item, (float, np.floating)):
+            scalars.append(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif item is None:
+            return False
+    return True
+
+
+def has_nan(data) -> bool:
+    """
+    Checks a nested sample (dicts, lists, tuples, arrays and scalars) for nan or None
+
+    The float leaves are concatenated into a single buffer checked with one np.isnan(...).any()
+
+    Parameters
+    ----------
+    data:
+        the sample to check
+
+    Returns
+    -------
+    bool:
+        True if any leaf is nan or None
+    """
+    arrays: typing.List[np.ndarray] = []
+    scalars: typing.List[float] = []
+    if not _gather_leaves(data, arrays, scalars):
+        return True
+    if scalars:
+        arrays.append(np.asarray(scalars, dtype=np.float64))
+    if not arrays:
+        return False
+    buffer = arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+    return bool(np.isnan(buffer).any())
+
+
+def find_nan(data, path: typing.Tuple = ()) -> typing.Optional[typing.Tuple]:
+    """
+    Walks a nested sample to locate its first nan or None leaf
+
+    Parameters
+    ----------
+    data:
+        the sample to search
+    path:
+        the path of data inside the sample it belongs to
+
+    Returns
+    -------
+    typing.Optional[typing.Tuple]:
+        the keys and indices leading to the leaf, None if the sample has no nan
+    """
+    if data is None:
+        return path
+    if isinstance(data, dict):
+        items: typing.Iterable = data.items()
+    elif isinstance(data, (list, tuple)):
+        items = enumerate(data)
+    elif isinstance(data, np.ndarray) and data.dtype.kind == "O":
+        items = enumerate(data.tolist())
+    else:
+        if isinstance(data, (np.ndarray, float, np.floating)) and np.isnan(data).any():
+            return path
+        return None
+    for key, value in items:
+        found = find_nan(value, path + (key, ))
+        if found is not None:
+            return found
+    return None
+
+
+def _format_path(path: typing.Tuple) -> str:
+    return "".join(f"[{key!r}]" for key in path)
+
+
 def nan_check_result(data, skip_trace=False):
     """
     Checks for nan in np array
     """
-    if np.isscalar(data):
-        if np.isnan(data):
-            if not skip_trace:
-                print_trace()
-            raise ValueError("Data contains nan")
-    # special case for repeated space
-    elif isinstance(data, dict):
-        list(map(nan_check_result, data.values()))
-    elif isinstance(data, list):
-        list(map(nan_check_result, data))
-    elif data is None:
+    if has_nan(data):
         if not skip_trace:
             print_trace()
-        raise ValueError("Data contains nan/None")
-    elif data.shape == ():
-        if np.isnan(data):
-            if not skip_trace:
-                print_trace()
-            raise ValueError("Data contains nan")
-    elif len(data.shape) == 1:
-        if any(np.isnan(data)):
-            if not skip_trace:
-                print_trace()
-            raise ValueError("Data contains nan")
-    else:
-        if np.isnan(data).any():
-            if not skip_trace:
-                print_trace()
-            raise ValueError("Data contains nan")
+        location = _format_path(find_nan(data) or ())
+        raise ValueError(f"Data contains nan/None{' at ' + location if location else ''}")
     return data
+
+
+def nan_check_observations(observations: typing.Mapping[str, typing.Mapping[str, typing.Any]]) -> None:
+    """
+    Checks the observations of every agent for nan with one vectorized check per agent
+
+    The structure is only walked when the check fails, to report the offending glue and path
+
+    Parameters
+    ----------
+    observations:
+        An nested dictionary: observations[AGENT_ID][OBSERVATION_NAME] -> OBSERVATION
+
+    Raises
+    ------
+    ValueError:
+        if an observation contains nan or None
+    """
+    for agent_id, agent_observations in observations.items():
+        if not has_nan(agent_observations):
+            continue
+        for obs_name, obs in agent_observations.items():
+            path = find_nan(obs)
+            if path is not None:
+                raise ValueError(f"Observation {obs_name}{_format_path(path)} of agent {agent_id} contains nan/None")
@@ -11,8 +11,12 @@ limitation or restriction. See accompanying README and LICENSE for details.
 
 Observation Extractor
 """
+import operator
 import typing
 
+import gym
+import numpy as np
+
 
 class ExtractorSet(typing.NamedTuple):
     """Class defining the set of extractors to pull information about a specific observation
@@ -75,3 +79,126 @@ def ObservationSpaceExtractor(
             )
         space = space[field]
     return space
+
+
+def _compile_accessor(path: typing.Sequence) -> typing.Callable:
+    """Direct accessor of a fixed path of keys and indices, without membership checks"""
+    getters = [operator.itemgetter(key) for key in path]
+    if not getters:
+        return lambda value: value
+    if len(getters) == 1:
+        return getters[0]
+    if len(getters) == 2:
+        first, second = getters
+        return lambda value: second(first(value))
+
+    def accessor(value):
+        for getter in getters:
+            value = getter(value)
+        return value
+
+    return accessor
+
+
+def _flat_positions(observation_space, fields: typing.Sequence[str], indices: typing.Sequence[int]) -> typing.Optional[np.ndarray]:
+    """
+    Positions of the extracted value in the flattened observation (gym.spaces.flatten order, as rllib's obs_flat)
+
+    None when the path does not end on a Box or the space cannot be flattened
+    """
+    offset = 0
+    space = observation_space
+    try:
+        for field in fields:
+            for key, sub_space in space.spaces.items():
+                if key == field:
+                    space = sub_space
+                    break
+                offset += gym.spaces.flatdim(sub_space)
+    except NotImplementedError:
+        return None
+    if not isinstance(space, gym.spaces.Box):
+        return None
+    positions = np.arange(offset, offset + int(np.prod(space.shape))).reshape(space.shape)
+    for index in indices:
+        positions = positions[index]
+    return np.asarray(positions)
+
+
+class CompiledObservationExtractor:
+    """
+    ObservationExtractor with the fields and indices compiled into a direct accessor
+
+    When constructed with the observation space, the path is validated once against it and the positions of
+    the value in the flattened observation are computed, so the value can also be sliced out of a batch of
+    flattened observations.
+    """
+
+    def __init__(
+        self,
+        fields: typing.List[str],
+        indices: typing.Union[int, typing.List[int]] = None,
+        observation_space: typing.Optional[gym.spaces.Space] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        fields:
+            Fields the extractor walks through
+        indices:
+            Accessed after the fields, allowing users to reduce arrays to single values
+        observation_space:
+            The space of the observations, validates the fields and enables extract_flat
+        """
+        if indices is None:
+            indices = []
+        if not isinstance(indices, typing.List):
+            indices = [indices]
+        self._fields = list(fields)
+        self._indices = list(indices)
+        self._accessor = _compile_accessor(self._fields + self._indices)
+        self._space: typing.Optional[gym.spaces.Space] = None
+        self._flat_positions: typing.Optional[np.ndarray] = None
+        if observation_space is not None:
+            self._space = ObservationSpaceExtractor(observation_space, self._fields)
+            self._flat_positions = _flat_positions(observation_space, self._fields, self._indices)
+
+    @property
+    def space(self) -> typing.Optional[gym.spaces.Space]:
+        """The space at the end of the fields, None when constructed without an observation space"""
+        return self._space
+
+    @property
+    def flat_positions(self) -> typing.Optional[np.ndarray]:
+        """Positions of the extracted value in the flattened observation, None when not available"""
+        return self._flat_positions
+
+    def __call__(self, observation):
+        """Extract the value from a single observation"""
+        try:
+            return self._accessor(observation)
+        except KeyError:
+            # report the missing field like ObservationExtractor
+            return ObservationExtractor(observation, self._fields, self._indices)
+
+    def extract_batch(self, observations: typing.Iterable) -> np.ndarray:
+        """Extract the value from the observations of many agents, stacked along the first dimension"""
+        return np.asarray([self(observation) for observation in observations])
+
+    def extract_flat(self, flat_observations: np.ndarray) -> np.ndarray:
+        """
+        Slice the value out of flattened observations
+
+        Parameters
+        ----------
+        flat_observations:
+            observations flattened in gym.spaces.flatten order, the last dimension is the flattened observation
+
+        Returns
+        -------
+        np.ndarray:
+            the value of every observation, shape (*batch shape, *value shape)
+        """
+        if self._flat_positions is None:
+            raise RuntimeError(f"The fields {self._fields} do not have a position in the flattened observation space")
+        return flat_observations[..., self._flat_positions]
@@ -9,12 +9,15 @@ The use, dissemination or disclosure of data in this file is subject to
 limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
 """
-from typing import Callable, Dict, OrderedDict, Tuple, Union
+from typing import Callable, Dict, Mapping, Optional, OrderedDict, Tuple, Union
 
 import numpy as np
 
 ObsType = Union[np.ndarray, Tuple, Dict]
 
+# ExportPlan[AGENT_ID][OBSERVATION_NAME] -> normalize function of the observations exported for training
+ExportPlan = Mapping[str, Mapping[str, Callable[[ObsType], Optional[ObsType]]]]
+
 
 def mutate_observations(observations: OrderedDict, mutate_fn: Callable[[str, str, ObsType], ObsType]) -> OrderedDict:
     """
@@ -74,3 +77,79 @@ def filter_observations(observations: OrderedDict, filter_fn: Callable[[str, str
         observations,
         lambda agent_id, obs_name, obs: obs if filter_fn(agent_id, obs_name, obs) else None  # type: ignore
     )  # type: ignore
+
+
+def export_observations(observations: OrderedDict,
+                        export_plan: ExportPlan,
+                        out: Optional[Tuple[OrderedDict, OrderedDict]] = None) -> Tuple[OrderedDict, OrderedDict]:
+    """
+    Filters and normalizes observations in a single pass over a precomputed export plan
+
+    Equivalent to filtering the observations that are in the plan with filter_observations and normalizing
+    the result with mutate_observations, without looking up the glue of every observation.
+
+    Parameters
+    ----------
+    observations:
+        An nested dictionary: observations[AGENT_ID][OBSERVATION_NAME] -> OBSERVATION
+    export_plan:
+        The normalize function of every exported observation: export_plan[AGENT_ID][OBSERVATION_NAME] -> NORMALIZE_FN
+        the observations that are not in the plan are not exported
+    out:
+        The (normalized, filtered) dictionaries returned by a previous call, refilled in place instead of
+        allocating new containers. Only pass them when nothing holds on to the previous step's output.
+
+    Returns
+    -------
+    Tuple[OrderedDict, OrderedDict]:
+        the normalized and the filtered observation samples
+    """
+    if out is None:
+        normalized_observations: OrderedDict = OrderedDict()
+        filtered_observations: OrderedDict = OrderedDict()
+    else:
+        normalized_observations, filtered_observations = out
+    num_stale_normalized = len(normalized_observations)
+    num_stale_filtered = len(filtered_observations)
+
+    for agent_id, obs_dict in observations.items():
+        agent_plan = export_plan.get(agent_id)
+        if not agent_plan:
+            continue
+        normalized_agent_obs = None
+        filtered_agent_obs = None
+        for obs_name, obs in obs_dict.items():
+            normalize_fn = agent_plan.get(obs_name)
+            if normalize_fn is None:
+                continue
+            if filtered_agent_obs is None:
+                num_stale_filtered -= agent_id in filtered_observations
+                filtered_agent_obs = _reuse_agent_dict(filtered_observations, agent_id)
+                filtered_observations[agent_id] = filtered_agent_obs
+            filtered_agent_obs[obs_name] = obs
+
+            normalized_obs = normalize_fn(obs)
+            if normalized_obs is None:
+                continue
+            if normalized_agent_obs is None:
+                num_stale_normalized -= agent_id in normalized_observations
+                normalized_agent_obs = _reuse_agent_dict(normalized_observations, agent_id)
+                normalized_observations[agent_id] = normalized_agent_obs
+            normalized_agent_obs[obs_name] = normalized_obs
+
+    # the agents refilled this step were moved to the end, the remaining leading entries are from a previous step
+    for _ in range(num_stale_normalized):
+        normalized_observations.popitem(last=False)
+    for _ in range(num_stale_filtered):
+        filtered_observations.popitem(last=False)
+
+    return normalized_observations, filtered_observations
+
+
+def _reuse_agent_dict(observations: OrderedDict, agent_id: str) -> OrderedDict:
+    """Remove the agent's dictionary from a previous step and return it empty, or a new dictionary"""
+    agent_obs = observations.pop(agent_id, None)
+    if agent_obs is None:
+        return OrderedDict()
+    agent_obs.clear()
+    return agent_obs
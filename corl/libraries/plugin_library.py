@@ -36,6 +36,9 @@ class _PluginLibrary:
         then recursivly walks through subdirectories of those paths
         and imports them, which will cause any side effect of importing them
         such as adding a class to the plugin library
+
+        packages that set `__plugin_skip__ = True` in their __init__ (e.g. corl.models) do not
+        register plugins and are skipped, so the walk does not pay for their heavy imports
         """
 
         def pkg_error(module_name):
@@ -46,8 +49,13 @@ class _PluginLibrary:
 
         for root_pkg in plugin_packages:
             root_import = importlib.import_module(root_pkg)
+            skipped_prefixes: typing.List[str] = []
             for module in pkgutil.walk_packages(root_import.__path__, root_import.__name__ + '.', onerror=pkg_error):  # type: ignore
-                importlib.import_module(module.name)
+                if any(module.name.startswith(prefix) for prefix in skipped_prefixes):
+                    continue
+                imported_module = importlib.import_module(module.name)
+                if module.ispkg and getattr(imported_module, '__plugin_skip__', False):
+                    skipped_prefixes.append(module.name + '.')
 
     def AddClassToGroup(
         self, regclass: typing.Callable, group_name: str, conditions: typing.Dict[str, typing.Union[typing.List[typing.Any], typing.Any]]
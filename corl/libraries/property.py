@@ -16,24 +16,77 @@ Property Module
 import abc
 import collections
 import enum
+import functools
 import typing
 
 import gym.spaces
 import numpy as np
-from pydantic import BaseModel, root_validator, validator
+from pydantic import BaseModel, PrivateAttr, root_validator, validator
 from ray.rllib.utils.spaces.repeated import Repeated
 
 from corl.libraries.units import Convert, GetUnitFromStr
 
 
+class _FrozenDict(tuple):
+    """Hashable stand in for a dict of property arguments"""
+
+    def __eq__(self, other):
+        return isinstance(other, _FrozenDict) and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+
+def _freeze(value: typing.Any) -> typing.Any:
+    """Hashable copy of property arguments, raises TypeError when an argument cannot be hashed"""
+    if isinstance(value, collections.abc.Mapping):
+        return _FrozenDict(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def _thaw(value: typing.Any) -> typing.Any:
+    if isinstance(value, _FrozenDict):
+        return {key: _thaw(item) for key, item in value}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@functools.lru_cache(maxsize=4096)
+def _shared_prop(prop_class: typing.Type['Prop'], frozen_kwargs: _FrozenDict) -> 'Prop':
+    return prop_class(**_thaw(frozen_kwargs))
+
+
 class Prop(BaseModel, abc.ABC):
     """Represents the space prop outside of RLLIB
+
+    Props are immutable, the values derived from them (spaces, bounds arrays...) are computed once and cached
+    on the instance. Parts get their props through `shared` so every part using the same property class and
+    arguments shares a single instance and its caches.
     """
     name: str
     description: str
+    _cache: typing.Dict[typing.Any, typing.Any] = PrivateAttr(default_factory=dict)
 
     class Config:  # pylint: disable=C0115, R0903
         validate_all = True
+        allow_mutation = False
+
+    @classmethod
+    def shared(cls, **kwargs) -> 'Prop':
+        """
+        Instance of the property class for the arguments, shared with every other caller using the same arguments
+        """
+        try:
+            frozen_kwargs = _freeze(kwargs)
+        except TypeError:
+            return cls(**kwargs)
+        return _shared_prop(cls, frozen_kwargs)
 
     @abc.abstractclassmethod
     def create_space(cls) -> gym.spaces.Space:
@@ -42,6 +95,15 @@ class Prop(BaseModel, abc.ABC):
         """
         ...
 
+    def get_space(self) -> gym.spaces.Space:
+        """
+        The RLLIB space created once for this property, it is shared and must not be modified
+        """
+        space = self._cache.get("space")
+        if space is None:
+            space = self._cache["space"] = self.create_space()
+        return space
+
 
 class BoxProp(Prop):
     """Represents the multi box outside of RLLIB
@@ -73,14 +135,11 @@ class BoxProp(Prop):
             return values
 
         # Broadcast space as needed
-        space = gym.spaces.Box(
-            low=np.array(values['low']).astype(values['dtype']),
-            high=np.array(values['high']).astype(values['dtype']),
-            dtype=values['dtype'],
-            shape=values['shape']
-        )
-        values['low'] = space.low.tolist()
-        values['high'] = space.high.tolist()
+        low = np.asarray(values['low'], dtype=values['dtype'])
+        high = np.asarray(values['high'], dtype=values['dtype'])
+        shape = values['shape'] if values['shape'] is not None else low.shape
+        values['low'] = np.broadcast_to(low, shape).tolist()
+        values['high'] = np.broadcast_to(high, shape).tolist()
 
         # Validate dimensions
         # 1D case
@@ -103,9 +162,66 @@ class BoxProp(Prop):
         """
         Creates RLLIB Box space
         """
-        return gym.spaces.Box(
-            low=np.array(self.low).astype(self.dtype), high=np.array(self.high).astype(self.dtype), dtype=self.dtype, shape=self.shape
-        )
+        return gym.spaces.Box(low=self.low_array, high=self.high_array, dtype=self.dtype, shape=self.shape)
+
+    @property
+    def low_array(self) -> np.ndarray:
+        """Read only array of the low bounds"""
+        return self._cached_array("low_array", self.low)
+
+    @property
+    def high_array(self) -> np.ndarray:
+        """Read only array of the high bounds"""
+        return self._cached_array("high_array", self.high)
+
+    @property
+    def unit_enums(self) -> np.ndarray:
+        """Read only object array of the units as enums, same shape as low and high"""
+        units = self._cache.get("unit_enums")
+        if units is None:
+            units = np.empty(np.shape(self.low), dtype=object)
+            for index in np.ndindex(units.shape):
+                unit = self.unit
+                for i in index:
+                    unit = unit[i]
+                units[index] = GetUnitFromStr(unit)
+            units.flags.writeable = False
+            self._cache["unit_enums"] = units
+        return units
+
+    def conversion_factors(self, convert) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Read only arrays (to_factors, from_factors) such that `value * to_factors / from_factors` is `Convert(value, unit, convert)`
+        for every element, cached per output units
+        """
+        key = ("conversion_factors", _freeze(convert))
+        factors = self._cache.get(key)
+        if factors is None:
+            to_factors = np.empty(self.unit_enums.shape)
+            from_factors = np.empty(self.unit_enums.shape)
+            for index in np.ndindex(to_factors.shape):
+                out_unit = convert
+                for i in index:
+                    out_unit = out_unit[i]
+                if isinstance(out_unit, str):
+                    out_unit = GetUnitFromStr(out_unit)
+                in_unit = self.unit_enums[index]
+                if not isinstance(in_unit, type(out_unit)):
+                    raise RuntimeError(f"Dimensions do not match! {in_unit} -> {out_unit}")
+                to_factors[index] = out_unit.value[0]
+                from_factors[index] = in_unit.value[0]
+            to_factors.flags.writeable = False
+            from_factors.flags.writeable = False
+            factors = self._cache[key] = (to_factors, from_factors)
+        return factors
+
+    def _cached_array(self, key: str, values) -> np.ndarray:
+        array = self._cache.get(key)
+        if array is None:
+            array = np.array(values, dtype=self.dtype)
+            array.flags.writeable = False
+            self._cache[key] = array
+        return array
 
     def min(
         self,
@@ -192,6 +308,22 @@ class BoxProp(Prop):
             shape=self.shape
         )
 
+    def get_converted_space(
+        self,
+        convert: typing.Union[typing.Sequence[str],
+                              typing.Sequence[typing.Sequence[str]],
+                              typing.Sequence[enum.Enum],
+                              typing.Sequence[typing.Sequence[enum.Enum]]]
+    ) -> gym.spaces.Space:
+        """
+        The RLLIB Box space converted to the units, created once per units. It is shared and must not be modified
+        """
+        key = ("converted_space", _freeze(convert))
+        space = self._cache.get(key)
+        if space is None:
+            space = self._cache[key] = self.create_converted_space(convert)
+        return space
+
 
 class DiscreteProp(Prop):
     """Represents the Discrete outside of RLLIB
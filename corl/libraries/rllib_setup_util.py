@@ -5,6 +5,8 @@ import typing
 from pydantic import BaseModel
 from ray.rllib.agents.trainer import COMMON_CONFIG
 
+from corl.libraries.benchmark_util import read_report
+
 
 class AutoRllibConfigSetup(BaseModel):
     """Meta parameters for automatically defining rllib_config settings, these are used
@@ -20,11 +22,18 @@ class AutoRllibConfigSetup(BaseModel):
         rollout_fragment_length
         train_batch_size
         sgd_minibatch_size
+
+    scaling_curve_file: scaling curve written by the BenchmarkExperiment scaling sweep, when given the
+                        num_workers/num_envs_per_worker/rollout_fragment_length are taken from its fastest
+                        point that fits on the available cpus
+    min_worker_efficiency: points of the scaling curve with a lower per worker efficiency are not used
     """
     num_trials: int = 1
     gpus_per_worker: bool = False
     sgd_minibatch_size_percentage: float = 0.1
     ignore_hyper_threads: bool = True
+    scaling_curve_file: typing.Optional[str] = None
+    min_worker_efficiency: float = 0.7
 
 
 def auto_configure_rllib_config(
@@ -62,7 +71,20 @@ def auto_configure_rllib_config(
     else:
         workers_per_arena = max(1, int(cpus_per_trial_available / COMMON_CONFIG["num_cpus_per_worker"]))
 
-    if 'num_workers' not in rllib_config:
+    scaling_point = None
+    if 'num_workers' not in rllib_config and auto_rllib_config_setup.scaling_curve_file is not None:
+        scaling_point = select_scaling_point(
+            read_report(auto_rllib_config_setup.scaling_curve_file), workers_per_arena, auto_rllib_config_setup.min_worker_efficiency
+        )
+
+    if scaling_point is not None:
+        rllib_config['num_workers'] = {"grid_search": [scaling_point['num_workers']]}
+        print(f"rllib_config['num_workers'] = {rllib_config['num_workers']} -- from scaling curve")
+        for key in ('num_envs_per_worker', 'rollout_fragment_length'):
+            if key not in rllib_config:
+                rllib_config[key] = scaling_point[key]
+                print(f"rllib_config['{key}'] = {rllib_config[key]} -- from scaling curve")
+    elif 'num_workers' not in rllib_config:
         rllib_config['num_workers'] = {"grid_search": [workers_per_arena]}
         print(f"rllib_config['num_workers'] = {rllib_config['num_workers']}")
     else:
@@ -92,6 +114,32 @@ def auto_configure_rllib_config(
     print("*" * 50)
 
 
+def select_scaling_point(scaling_curve: dict, max_workers: int, min_worker_efficiency: float) -> typing.Optional[dict]:
+    """Select the point of a scaling curve with the highest sampling throughput
+
+    Parameters
+    ----------
+    scaling_curve : dict
+        scaling curve written by the BenchmarkExperiment scaling sweep
+    max_workers : int
+        largest number of workers that fits on the cpus available to a trial
+    min_worker_efficiency : float
+        points with a lower per worker efficiency are over-subscribed and skipped
+
+    Returns
+    -------
+    typing.Optional[dict]
+        the selected point or None if no point qualifies
+    """
+    candidates = [
+        point for point in scaling_curve.get("points", [])
+        if point["num_workers"] <= max_workers and point.get("efficiency", 1.0) >= min_worker_efficiency
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda point: point["throughput"])
+
+
 def update_rollout_fragment_length(rllib_config: dict) -> None:
     """Attempts to auto fill the rollout fragment length
 
@@ -123,8 +171,17 @@ def update_train_batch_size(rllib_config: dict) -> None:
         the current config
     """
     if "train_batch_size" not in rllib_config.keys():
+        # every worker samples rollout_fragment_length steps from each of its envs
+        num_envs_per_worker = rllib_config.get('num_envs_per_worker', 1)
+        if isinstance(num_envs_per_worker, dict):
+            num_envs_per_worker = num_envs_per_worker['grid_search'][0]
         rllib_config['train_batch_size'] = {
-            "grid_search": [int(rllib_config['num_workers']['grid_search'][0] * rllib_config['rollout_fragment_length']['grid_search'][0])]
+            "grid_search": [
+                int(
+                    rllib_config['num_workers']['grid_search'][0] * num_envs_per_worker *
+                    rllib_config['rollout_fragment_length']['grid_search'][0]
+                )
+            ]
         }
         print(f"rllib_config['train_batch_size'] = {rllib_config['train_batch_size']}")
     else:
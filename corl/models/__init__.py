@@ -1,6 +1,5 @@
 """
 ---------------------------------------------------------------------------
-
 Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
 Reinforcement Learning (RL) Core.
 
@@ -9,4 +8,64 @@ This is a US Government Work not subject to copyright protection in the US.
 The use, dissemination or disclosure of data in this file is subject to
 limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
+Custom rllib models.
+
+The models import TensorFlow or Torch, so nothing in this package is imported until it is
+requested. Attribute access (`corl.models.TorchFrameStack`) or `register_custom_model` imports
+the defining module, which registers the model with the rllib ModelCatalog.
 """
+import importlib
+import typing
+
+# keep PluginLibrary.add_paths from importing the framework heavy modules in this package
+__plugin_skip__ = True
+
+CUSTOM_MODELS: typing.Dict[str, str] = {
+    "FrameStackingModel": "corl.models.frame_stacking",
+    "TorchFrameStack": "corl.models.torch_frame_stack",
+}
+
+
+def register_custom_model(name: str) -> bool:
+    """Import the corl module that registers the custom model name with the rllib ModelCatalog
+
+    Parameters
+    ----------
+    name : str
+        The custom_model name used in an rllib model config
+
+    Returns
+    -------
+    bool
+        True if the name is a corl model (and is now registered), False otherwise
+    """
+    module = CUSTOM_MODELS.get(name)
+    if module is None:
+        return False
+    importlib.import_module(module)
+    return True
+
+
+def register_custom_models(config: typing.Any) -> None:
+    """Register every corl custom model referenced by a `custom_model` key anywhere in the config
+
+    Parameters
+    ----------
+    config : typing.Any
+        rllib config (or any nesting of dicts and lists containing model configs)
+    """
+    if isinstance(config, dict):
+        for key, value in config.items():
+            if key == "custom_model" and isinstance(value, str):
+                register_custom_model(value)
+            else:
+                register_custom_models(value)
+    elif isinstance(config, (list, tuple)):
+        for value in config:
+            register_custom_models(value)
+
+
+def __getattr__(name: str):
+    if name in CUSTOM_MODELS:
+        return getattr(importlib.import_module(CUSTOM_MODELS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
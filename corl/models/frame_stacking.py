@@ -113,6 +113,7 @@ class FrameStackingModel(TFModelV2):  # pylint: disable=abstract-method
         num_frames: int = 4,
         include_actions: bool = True,
         include_rewards: bool = True,
+        env_frame_stack: bool = False,
     ):
         """Class constructor
 
@@ -133,6 +134,8 @@ class FrameStackingModel(TFModelV2):  # pylint: disable=abstract-method
             num_frames {int} -- The number of frames to stack (default: {4})
             include_actions {int} -- Whether or not to include actions as part of frame stacking (default: True)
             include_actions {int} -- Whether or not to include actions as part of frame stacking (default: True)
+            env_frame_stack {bool} -- The observations are stacked in the environment by FrameStackGlue, every flattened
+                                      observation leaf is (num_frames, ...) and no observation view requirement is needed
 
         Returns:
             [type] -- [description]
@@ -144,6 +147,8 @@ class FrameStackingModel(TFModelV2):  # pylint: disable=abstract-method
 
         # This model specific items
         self.num_frames = num_frames
+        self.env_frame_stack = env_frame_stack
+        self._frame_leaf_sizes = self.frame_leaf_sizes(obs_space, num_frames) if env_frame_stack else None
 
         # Base model items
         self.num_outputs = num_outputs
@@ -244,7 +249,8 @@ class FrameStackingModel(TFModelV2):  # pylint: disable=abstract-method
         # (?, Number of Frames, 1)
         rewards = tf.keras.layers.Input(shape=(self.num_frames, 1), name="rewards")
         # (?, Number of Frames, len obs flatten)
-        observations = tf.keras.layers.Input(shape=(self.num_frames, obs_space.shape[0]), name="observations")
+        frame_size = sum(self._frame_leaf_sizes) if self.env_frame_stack else obs_space.shape[0]
+        observations = tf.keras.layers.Input(shape=(self.num_frames, frame_size), name="observations")
         # (?, Number of Frames, len actions flatten)
         actions = tf.keras.layers.Input(shape=(self.num_frames, len(action_space)), name="actions")
         return observations, actions, rewards
@@ -318,8 +324,9 @@ class FrameStackingModel(TFModelV2):  # pylint: disable=abstract-method
             obs_space {[type]} -- The observation space definition
             flattened_action_space {[type]} -- flattened action space
         """
-        self.view_requirements[FrameStackingModel.PREV_N_OBS
-                               ] = ViewRequirement(data_col="obs", shift="-{}:0".format(num_frames - 1), space=obs_space)
+        if not self.env_frame_stack:
+            self.view_requirements[FrameStackingModel.PREV_N_OBS
+                                   ] = ViewRequirement(data_col="obs", shift="-{}:0".format(num_frames - 1), space=obs_space)
         if self.include_rewards:
             self.view_requirements[FrameStackingModel.PREV_N_REWARDS
                                    ] = ViewRequirement(data_col="rewards", shift="-{}:-1".format(self.num_frames))
@@ -353,20 +360,69 @@ class FrameStackingModel(TFModelV2):  # pylint: disable=abstract-method
             The model output tensor of size [BATCH, num_outputs], and the new RNN state.
         """
 
+        observations = self.stacked_observations(input_dict)
         if self.include_actions and not self.include_rewards:
-            model_out, self._value_out = self.base_model([input_dict[FrameStackingModel.PREV_N_OBS],
-                                                          input_dict[FrameStackingModel.PREV_N_ACTIONS]])
+            model_out, self._value_out = self.base_model([observations, input_dict[FrameStackingModel.PREV_N_ACTIONS]])
         elif not self.include_actions and self.include_rewards:
-            model_out, self._value_out = self.base_model([input_dict[FrameStackingModel.PREV_N_OBS],
-                                                          input_dict[FrameStackingModel.PREV_N_REWARDS]])
+            model_out, self._value_out = self.base_model([observations, input_dict[FrameStackingModel.PREV_N_REWARDS]])
         elif self.include_actions and self.include_rewards:
-            model_out, self._value_out = self.base_model([input_dict[FrameStackingModel.PREV_N_OBS],
+            model_out, self._value_out = self.base_model([observations,
                                                           input_dict[FrameStackingModel.PREV_N_ACTIONS],
                                                           input_dict[FrameStackingModel.PREV_N_REWARDS]])
         else:
-            model_out, self._value_out = self.base_model([input_dict[FrameStackingModel.PREV_N_OBS]])
+            model_out, self._value_out = self.base_model([observations])
         return model_out, state
 
+    def stacked_observations(self, input_dict: Dict[str, TensorType]) -> TensorType:
+        """The observation frames as a (BATCH, num_frames, frame size) tensor
+
+        Arguments:
+            input_dict {dict} -- the input tensors of the forward pass
+
+        Returns:
+            Tensor -- the frames from the view requirement or, with env_frame_stack, from the stacked observation leaves
+        """
+        if not self.env_frame_stack:
+            return input_dict[FrameStackingModel.PREV_N_OBS]
+        leaves = tf.split(input_dict["obs_flat"], [size * self.num_frames for size in self._frame_leaf_sizes], axis=1)
+        frames = [tf.reshape(leaf, [-1, self.num_frames, size]) for leaf, size in zip(leaves, self._frame_leaf_sizes)]
+        return tf.concat(frames, axis=-1)
+
+    @staticmethod
+    def frame_leaf_sizes(obs_space, num_frames: int) -> List[int]:
+        """Per frame size of every flattened observation leaf stacked by FrameStackGlue
+
+        Arguments:
+            obs_space {gym.Space} -- The observation space, its original_space is used when present
+            num_frames {int} -- The number of frames to stack
+
+        Returns:
+            List[int] -- the size of one frame of each leaf, in the rllib flattening order
+        """
+        sizes = []
+        for space in flatten_space(getattr(obs_space, "original_space", obs_space)):
+            if len(space.shape) < 2 or space.shape[0] != num_frames:
+                raise ValueError(f"env_frame_stack requires every observation to be stacked over {num_frames} frames, got {space}")
+            sizes.append(int(np.product(space.shape[1:])))
+        return sizes
+
+    def export_inference_model(self, quantize: bool = False) -> bytes:
+        """Convert the base model to a TensorFlow Lite flatbuffer for CPU inference on rollout workers
+
+        The inputs are the ones of the base model (observation frames, then actions and rewards when included),
+        the outputs are the logits and the value. The learner keeps training this float model.
+
+        Arguments:
+            quantize {bool} -- Apply dynamic range int8 quantization to the weights (default: False)
+
+        Returns:
+            bytes -- the serialized TensorFlow Lite model, run it with tf.lite.Interpreter(model_content=...)
+        """
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.base_model)
+        if quantize:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        return converter.convert()
+
     def value_function(self) -> TensorType:
         """Returns the value function output for the most recent forward pass.
 
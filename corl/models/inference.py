@@ -0,0 +1,191 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+TorchScript inference export of TorchFrameStack
+
+The hidden layers, logits and value branch of a model are copied into a plain module, optionally
+dynamically quantized to int8 (Linear layers) and traced. Rollout workers run the traced module
+under torch.inference_mode() while the learner keeps training the float model.
+
+The module also benchmarks the export on CPU:
+
+    python -m corl.models.inference --num-frames 16 --obs-size 32 --hiddens [256,256] --quantize true
+"""
+import copy
+import time
+import typing
+
+import gym
+import jsonargparse
+import numpy as np
+from ray.rllib.utils.framework import try_import_torch
+
+torch, nn = try_import_torch()
+
+
+class FrameStackInference(nn.Module):  # type: ignore
+    """The inference path of a TorchFrameStack: (BATCH, num_frames, frame size) -> logits, value"""
+
+    def __init__(self, model) -> None:
+        # pylint: disable=protected-access
+        super().__init__()
+        self.hidden_layers = copy.deepcopy(model._hidden_layers)
+        self.logits = copy.deepcopy(model._logits)
+        self.append_free_log_std = copy.deepcopy(model._append_free_log_std) if model.free_log_std and model._logits else None
+        self.value_branch_separate = copy.deepcopy(model._value_branch_separate)
+        self.value_branch = copy.deepcopy(model._value_branch)
+
+    def forward(self, frames):  # pylint: disable=arguments-differ
+        """logits and value of a batch of stacked frames"""
+        features = self.hidden_layers(frames)
+        logits = self.logits(features) if self.logits is not None else features
+        if self.append_free_log_std is not None:
+            logits = self.append_free_log_std(logits)
+        if self.value_branch_separate is not None:
+            value = self.value_branch(self.value_branch_separate(frames))
+        else:
+            value = self.value_branch(features)
+        return logits, value.squeeze(1)
+
+
+def parameters_version(model) -> int:
+    """Sum of the in place modification counters of the model parameters, changes whenever the weights are updated"""
+    return sum(parameter._version for parameter in model.parameters())  # pylint: disable=protected-access
+
+
+def export_torch_frame_stack(model, quantize: bool = False):
+    """Trace the inference path of a TorchFrameStack
+
+    Parameters
+    ----------
+    model : TorchFrameStack
+        the float model, it is not modified
+    quantize : bool
+        apply dynamic int8 quantization to the Linear layers
+
+    Returns
+    -------
+    torch.jit.ScriptModule
+        module mapping a (BATCH, num_frames, frame size) float tensor to (logits, value)
+    """
+    module = FrameStackInference(model).cpu().eval()
+    if quantize:
+        module = torch.quantization.quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8)
+    example = torch.zeros(1, model.num_frames, model.frame_size)
+    with torch.no_grad():
+        return torch.jit.trace(module, example, check_trace=False)
+
+
+class InferenceBenchmarkResult(typing.NamedTuple):
+    """Throughput of a model variant and its drift from the float model"""
+    name: str
+    actions_per_second: float
+    max_logit_drift: float
+    max_value_drift: float
+
+
+def benchmark_inference(
+    num_frames: int = 16,
+    obs_size: int = 32,
+    num_actions: int = 4,
+    hiddens: typing.Sequence[int] = (256, 256),
+    batch_size: int = 1,
+    iterations: int = 1000,
+    quantize: bool = True,
+    seed: int = 0,
+) -> typing.List[InferenceBenchmarkResult]:
+    """Compare the rllib forward path of a TorchFrameStack with its traced (and quantized) export on CPU
+
+    Returns
+    -------
+    typing.List[InferenceBenchmarkResult]
+        one result per variant: the float model, the traced export and, if requested, the int8 export
+    """
+    from corl.models.torch_frame_stack import TorchFrameStack  # pylint: disable=import-outside-toplevel
+
+    torch.manual_seed(seed)
+    obs_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(num_frames, obs_size), dtype=np.float32)
+    action_space = gym.spaces.Discrete(num_actions)
+    model_config = {
+        "fcnet_hiddens": list(hiddens),
+        "fcnet_activation": "tanh",
+        "vf_share_layers": False,
+        "custom_model_config": {
+            "num_frames": num_frames, "env_frame_stack": True
+        },
+    }
+    model = TorchFrameStack(obs_space, action_space, num_actions, model_config, "benchmark").eval()
+
+    rng = np.random.default_rng(seed)
+    observations = torch.from_numpy(rng.uniform(-1.0, 1.0, size=(batch_size, num_frames * obs_size)).astype(np.float32))
+    frames = observations.reshape(batch_size, num_frames, obs_size)
+    with torch.no_grad():
+        reference_logits, _ = model.forward({"obs_flat": observations}, [], None)
+        reference_value = model.value_function()
+
+    def float_model(_frames):
+        logits, _ = model.forward({"obs_flat": observations}, [], None)
+        return logits, model.value_function()
+
+    variants: typing.List[typing.Tuple[str, typing.Callable]] = [("float", float_model)]
+    variants.append(("torchscript", export_torch_frame_stack(model)))
+    if quantize:
+        variants.append(("torchscript_int8", export_torch_frame_stack(model, quantize=True)))
+
+    results = []
+    for name, function in variants:
+        context = torch.no_grad if name == "float" else torch.inference_mode
+        with context():
+            logits, value = function(frames)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                function(frames)
+            elapsed = time.perf_counter() - start
+        results.append(
+            InferenceBenchmarkResult(
+                name=name,
+                actions_per_second=batch_size * iterations / elapsed,
+                max_logit_drift=float((logits - reference_logits).abs().max()),
+                max_value_drift=float((value - reference_value).abs().max()),
+            )
+        )
+    return results
+
+
+def main(alternate_argv: typing.Optional[typing.Sequence[str]] = None):
+    """
+    Main method of the module, benchmarks the TorchFrameStack inference export on CPU
+    """
+    parser = jsonargparse.ArgumentParser()
+    parser.add_argument("--num-frames", type=int, default=16, help="number of stacked frames")
+    parser.add_argument("--obs-size", type=int, default=32, help="size of one observation frame")
+    parser.add_argument("--num-actions", type=int, default=4, help="number of model outputs")
+    parser.add_argument("--hiddens", type=typing.List[int], default=[256, 256], help="fcnet_hiddens of the model")
+    parser.add_argument("--batch-size", type=int, default=1, help="rows per forward pass")
+    parser.add_argument("--iterations", type=int, default=1000, help="timed forward passes per variant")
+    parser.add_argument("--quantize", type=bool, default=True, help="also benchmark the int8 export")
+    args = parser.parse_args(args=alternate_argv)
+
+    results = benchmark_inference(
+        num_frames=args.num_frames,
+        obs_size=args.obs_size,
+        num_actions=args.num_actions,
+        hiddens=args.hiddens,
+        batch_size=args.batch_size,
+        iterations=args.iterations,
+        quantize=args.quantize,
+    )
+    print(f"{'variant':<20} {'actions/s':>12} {'logit drift':>12} {'value drift':>12}")
+    for result in results:
+        print(f"{result.name:<20} {result.actions_per_second:12.1f} {result.max_logit_drift:12.2e} {result.max_value_drift:12.2e}")
+
+
+if __name__ == "__main__":
+    main()
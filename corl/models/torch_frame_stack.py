@@ -22,6 +22,7 @@ from ray.rllib.models.torch.torch_modelv2 import TorchModelV2
 from ray.rllib.policy.view_requirement import ViewRequirement
 from ray.rllib.utils.annotations import override
 from ray.rllib.utils.framework import try_import_torch
+from ray.rllib.utils.spaces.space_utils import flatten_space
 from ray.rllib.utils.typing import Dict, List, ModelConfigDict, TensorType
 
 torch, nn = try_import_torch()
@@ -56,9 +57,30 @@ class TorchFrameStack(TorchModelV2, nn.Module):  # type: ignore
         self.free_log_std = model_config.get("free_log_std")
 
         num_frames = model_config["custom_model_config"].get("num_frames", 1)
-
-        self.view_requirements[TorchFrameStack.PREV_N_OBS
-                               ] = ViewRequirement(data_col="obs", shift="-{}:0".format(num_frames - 1), space=obs_space)
+        self.num_frames = num_frames
+        # the observations are already stacked by FrameStackGlue, every flattened leaf is (num_frames, ...)
+        self.env_frame_stack = model_config["custom_model_config"].get("env_frame_stack", False)
+
+        if self.env_frame_stack:
+            self._frame_leaf_sizes = []
+            for space in flatten_space(getattr(obs_space, "original_space", obs_space)):
+                if len(space.shape) < 2 or space.shape[0] != num_frames:
+                    raise ValueError(f"env_frame_stack requires every observation to be stacked over {num_frames} frames, got {space}")
+                self._frame_leaf_sizes.append(int(np.product(space.shape[1:])))
+            frame_size = sum(self._frame_leaf_sizes)
+        else:
+            self.view_requirements[TorchFrameStack.PREV_N_OBS
+                                   ] = ViewRequirement(data_col="obs", shift="-{}:0".format(num_frames - 1), space=obs_space)
+            frame_size = int(obs_space.shape[-1])
+        self.frame_size = frame_size
+
+        # rollouts (forward without autograd on CPU) run a traced copy of the model, see corl.models.inference
+        self.inference_export = model_config["custom_model_config"].get("inference_export", False)
+        self.inference_quantize = model_config["custom_model_config"].get("inference_quantize", False)
+        # not registered as a submodule, the export must stay out of the state dict
+        object.__setattr__(self, "_inference_module", None)
+        self._inference_version = None
+        self._inference_value = None
         # Generate free-floating bias variables for the second half of
         # the outputs.
         if self.free_log_std:
@@ -66,7 +88,7 @@ class TorchFrameStack(TorchModelV2, nn.Module):  # type: ignore
             num_outputs = num_outputs // 2
 
         layers = []
-        prev_layer_size = int(obs_space.shape[-1])
+        prev_layer_size = frame_size
         self._logits = None
 
         # Create layers 0 to second-last.
@@ -112,7 +134,7 @@ class TorchFrameStack(TorchModelV2, nn.Module):  # type: ignore
         self._value_branch_separate = None
         if not self.vf_share_layers:
             # Build a parallel set of hidden layers for the value net.
-            prev_vf_layer_size = int(obs_space.shape[-1])
+            prev_vf_layer_size = frame_size
             vf_layers = []
             for size in hiddens[:-1]:
                 vf_layers.append(
@@ -160,7 +182,15 @@ class TorchFrameStack(TorchModelV2, nn.Module):  # type: ignore
     @override(TorchModelV2)
     def forward(self, input_dict: Dict[str, TensorType], state: List[TensorType],
                 seq_lens: TensorType) -> (TensorType, List[TensorType]):  # type: ignore
-        self._last_flat_in = input_dict[TorchFrameStack.PREV_N_OBS].float()
+        if self.env_frame_stack:
+            flat_obs = input_dict["obs_flat"].float()
+            leaves = torch.split(flat_obs, [size * self.num_frames for size in self._frame_leaf_sizes], dim=1)
+            self._last_flat_in = torch.cat([leaf.reshape(leaf.shape[0], self.num_frames, -1) for leaf in leaves], dim=-1)
+        else:
+            self._last_flat_in = input_dict[TorchFrameStack.PREV_N_OBS].float()
+        if self.inference_export and not torch.is_grad_enabled() and not self._last_flat_in.is_cuda:
+            return self._inference_forward(), state
+        self._inference_value = None
         self._features = self._hidden_layers(self._last_flat_in)
         logits = self._logits(self._features) if self._logits else \
             self._features
@@ -168,8 +198,24 @@ class TorchFrameStack(TorchModelV2, nn.Module):  # type: ignore
             logits = self._append_free_log_std(logits)
         return logits, state
 
+    def _inference_forward(self) -> TensorType:
+        from corl.models.inference import export_torch_frame_stack, parameters_version  # pylint: disable=import-outside-toplevel
+
+        # the weights change through set_weights on rollout workers and through the optimizer on a local worker
+        version = parameters_version(self)
+        if self._inference_module is None or version != self._inference_version:
+            object.__setattr__(self, "_inference_module", export_torch_frame_stack(self, quantize=self.inference_quantize))
+            self._inference_version = version
+        with torch.inference_mode():
+            logits, value = self._inference_module(self._last_flat_in)
+        self._features = None
+        self._inference_value = value
+        return logits
+
     @override(TorchModelV2)
     def value_function(self) -> TensorType:
+        if self._inference_value is not None:
+            return self._inference_value
         assert self._features is not None, "must call forward() first"
         if self._value_branch_separate:
             return self._value_branch(self._value_branch_separate(self._last_flat_in)).squeeze(1)
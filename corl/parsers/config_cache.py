@@ -0,0 +1,141 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Cache of fully resolved configuration trees
+
+A config is stored as a pickle keyed by the content hashes of the root file and of every
+file it transitively includes. A small manifest per root file records which files the last
+resolution depended on, so a lookup only has to hash those files to find the cached tree.
+
+The cache lives in $CORL_CONFIG_CACHE_DIR (default ~/.cache/corl/configs) and may be disabled
+by setting CORL_CONFIG_CACHE=0.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import typing
+
+CACHE_DIR_ENV = "CORL_CONFIG_CACHE_DIR"
+CACHE_ENABLE_ENV = "CORL_CONFIG_CACHE"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "corl", "configs")
+
+# bump when the loader changes in a way that alters the resolved trees
+CACHE_VERSION = 1
+
+_logger = logging.getLogger(__name__)
+
+
+def cache_enabled() -> bool:
+    """Whether the config cache is enabled through the environment"""
+    return os.environ.get(CACHE_ENABLE_ENV, "1").lower() not in ("0", "false", "no", "off")
+
+
+def file_digest(filename: str) -> str:
+    """sha256 of the file content"""
+    with open(filename, "rb") as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+class ConfigCache:
+    """Stores resolved configuration trees keyed by the content of all the files they were built from
+    """
+
+    def __init__(self, cache_dir: typing.Optional[str] = None) -> None:
+        self._cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+
+    @property
+    def cache_dir(self) -> str:
+        """Directory holding the manifests and resolved trees"""
+        return self._cache_dir
+
+    def get(self, filename: str) -> typing.Optional[typing.Any]:
+        """Return the cached tree for the file if neither it nor any of its includes changed
+
+        Parameters
+        ----------
+        filename : str
+            the root configuration file
+
+        Returns
+        -------
+        typing.Optional[typing.Any]
+            the resolved configuration or None on a cache miss
+        """
+        manifest = self._read(self._manifest_path(filename))
+        if not isinstance(manifest, dict) or manifest.get("version") != CACHE_VERSION:
+            return None
+
+        try:
+            digests = {dependency: file_digest(dependency) for dependency in manifest["files"]}
+        except OSError:
+            return None
+
+        entry = self._read(self._entry_path(digests))
+        if not isinstance(entry, dict) or entry.get("files") != digests:
+            return None
+        return entry["config"]
+
+    def put(self, filename: str, dependencies: typing.Iterable[str], config: typing.Any) -> None:
+        """Store the resolved tree for the file
+
+        Parameters
+        ----------
+        filename : str
+            the root configuration file
+        dependencies : typing.Iterable[str]
+            every file included while resolving the root file
+        config : typing.Any
+            the resolved configuration
+        """
+        files = sorted({os.path.realpath(filename), *(os.path.realpath(dependency) for dependency in dependencies)})
+        try:
+            digests = {dependency: file_digest(dependency) for dependency in files}
+            self._write(self._entry_path(digests), {"files": digests, "config": config})
+            self._write(self._manifest_path(filename), {"version": CACHE_VERSION, "files": files})
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as err:
+            # objects created by !function are not guaranteed to pickle, those configs are simply not cached
+            _logger.debug(f"Not caching {filename}: {err}")
+
+    def _manifest_path(self, filename: str) -> str:
+        key = hashlib.sha256(os.path.realpath(filename).encode()).hexdigest()
+        return os.path.join(self._cache_dir, f"{key}.manifest")
+
+    def _entry_path(self, digests: typing.Dict[str, str]) -> str:
+        key = hashlib.sha256(f"{CACHE_VERSION}".encode())
+        for dependency, digest in sorted(digests.items()):
+            key.update(f"{dependency}\0{digest}\0".encode())
+        return os.path.join(self._cache_dir, f"{key.hexdigest()}.pkl")
+
+    @staticmethod
+    def _read(path: str) -> typing.Any:
+        try:
+            with open(path, "rb") as fp:
+                return pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except Exception as err:  # pylint: disable=broad-except
+            # a corrupt or incompatible entry is a miss, it is overwritten on the next put
+            _logger.debug(f"Ignoring unreadable config cache entry {path}: {err}")
+            return None
+
+    def _write(self, path: str, data: typing.Any) -> None:
+        os.makedirs(self._cache_dir, exist_ok=True)
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        # write then rename so concurrent launches never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -23,8 +23,13 @@ from ray import tune  # pylint: disable=unused-import # noqa: F401
 from yaml.constructor import ConstructorError
 from yaml.nodes import SequenceNode
 
+from corl.parsers.config_cache import ConfigCache, cache_enabled
 
-class Loader(yaml.SafeLoader):  # pylint: disable=too-few-public-methods,W0223
+# the libyaml parser is several times faster than the pure python one, the constructors are shared
+_BaseLoader: typing.Type = getattr(yaml, "CSafeLoader", yaml.SafeLoader) if yaml.__with_libyaml__ else yaml.SafeLoader
+
+
+class Loader(_BaseLoader):  # type: ignore # pylint: disable=too-few-public-methods,W0223
     """YAML Loader with `!include` constructor."""
 
     def __init__(self, stream: IO) -> None:
@@ -38,6 +43,23 @@ class Loader(yaml.SafeLoader):  # pylint: disable=too-few-public-methods,W0223
         super().__init__(stream)
 
         self._include_mapping: dict = {}
+        # every file included while constructing this document, including nested includes
+        self._dependencies: typing.Set[str] = set()
+
+    @property
+    def dependencies(self) -> typing.Set[str]:
+        """The files included while constructing the document"""
+        return self._dependencies
+
+    def load_include(self, stream: IO) -> Any:
+        """Load an included yaml stream, recording its own includes as dependencies of this document"""
+        loader = type(self)(stream)
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+        self._dependencies.update(loader.dependencies)
+        return data
 
     def construct_python_tuple(self, node):
         """Adds in the capability to process tuples in yaml files
@@ -176,10 +198,11 @@ def construct_include(loader: Loader, node: yaml.Node) -> Any:
     """Include file referenced at node."""
     filename = os.path.realpath(os.path.join(loader._root, loader.construct_scalar(node)))  # type: ignore # pylint: disable=protected-access # noqa: E501
     extension = os.path.splitext(filename)[1].lstrip(".")
+    loader.dependencies.add(filename)
 
     with open(filename, "r") as fp:
         if extension in ("yaml", "yml"):  # pylint: disable=no-else-return
-            return yaml.load(fp, Loader)
+            return loader.load_include(fp)
         elif extension in ("json", ):
             return json.load(fp)
         else:
@@ -190,10 +213,11 @@ def construct_include_direct(loader: Loader, node: yaml.Node) -> Any:
     """Include file referenced at node."""
     filename = os.path.realpath(os.path.join(loader._root, loader.construct_scalar(node)))  # type: ignore # pylint: disable=protected-access # noqa: E501
     extension = os.path.splitext(filename)[1].lstrip(".")
+    loader.dependencies.add(filename)
 
     with open(filename, "r") as fp:
         if extension in ("yaml", "yml"):  # pylint: disable=no-else-return
-            temp = yaml.load(fp, Loader)
+            temp = loader.load_include(fp)
             loader._include_mapping[filename] = temp  # pylint: disable=protected-access
             return temp
         elif extension in ("json", ):
@@ -217,10 +241,11 @@ def construct_include_arr(loader: Loader, node: yaml.Node) -> Any:
     for item in sequence:
         filename = os.path.abspath(os.path.join(loader._root, item))  # pylint: disable=protected-access
         extension = os.path.splitext(filename)[1].lstrip(".")
+        loader.dependencies.add(filename)
 
         with open(filename, "r") as f:
             if extension in ("yaml", "yml"):  # pylint: disable=no-else-return
-                data = data + (yaml.load(f, Loader))
+                data = data + (loader.load_include(f))
             elif extension in ("json", ):
                 data = data + (json.load(f))
             else:
@@ -237,12 +262,31 @@ Loader.add_constructor(u'tag:yaml.org,2002:python/tuple', Loader.construct_pytho
 Loader.add_constructor("!include_arr", construct_include_arr)
 
 
-def load_file(config_filename: str):
+def load_file(config_filename: str, use_cache: typing.Optional[bool] = None):
     """
     Utility function to load in a specified yaml file
+
+    The resolved tree is cached keyed by the content of the file and of everything it includes,
+    see corl.parsers.config_cache. use_cache defaults to the CORL_CONFIG_CACHE environment setting.
     """
+    if use_cache is None:
+        use_cache = cache_enabled()
+
+    cache = ConfigCache() if use_cache else None
+    if cache is not None:
+        config = cache.get(config_filename)
+        if config is not None:
+            return config
+
     with open(config_filename, "r") as fp:
-        config = yaml.load(fp, Loader)
+        loader = Loader(fp)
+        try:
+            config = loader.get_single_data()
+        finally:
+            loader.dispose()
+
+    if cache is not None:
+        cache.put(config_filename, loader.dependencies, config)
     return config
 
 
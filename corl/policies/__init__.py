@@ -8,4 +8,28 @@ This is a US Government Work not subject to copyright protection in the US.
 The use, dissemination or disclosure of data in this file is subject to
 limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
+Custom rllib policies.
+
+The policies subclass the rllib Policy, so they are only imported when one of the
+classes is first accessed from this package.
 """
+import importlib
+import typing
+
+# policies are referenced by import path in the agent configs, they never need to be walked as plugins
+__plugin_skip__ = True
+
+_LAZY_ATTRIBUTES: typing.Dict[str, str] = {
+    "BasePolicyValidator": "corl.policies.base_policy",
+    "CustomPolicy": "corl.policies.custom_policy",
+    "CustomPolicyValidator": "corl.policies.custom_policy",
+    "RandomActionPolicy": "corl.policies.random_action",
+    "ScriptedActionPolicy": "corl.policies.scripted_action",
+    "ScriptedActionPolicyValidator": "corl.policies.scripted_action",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
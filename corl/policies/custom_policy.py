@@ -94,6 +94,7 @@ class CustomPolicy(Policy):  # pylint: disable=abstract-method
         Policy.__init__(self, observation_space, action_space, config)
 
         self.time_extractor = self.validated_config.time_extractor.construct_extractors()
+        self._time_value = self.validated_config.time_extractor.compile_extractor(observation_space=observation_space.original_space)
         self._reset()
 
     @property
@@ -111,6 +112,12 @@ class CustomPolicy(Policy):  # pylint: disable=abstract-method
         """
         ...
 
+    def _reset_episode(self, episode_id, agent_id: str):  # pylint: disable=unused-argument
+        """Called for the rows of an episode that just started, policies keeping state per episode override this
+        to reset only that episode, by default the whole policy state is reset
+        """
+        self._reset()
+
     def learn_on_batch(self, samples):
         return {}
 
@@ -160,24 +167,18 @@ class CustomPolicy(Policy):  # pylint: disable=abstract-method
                 {"f1": [BATCH_SIZE, ...], "f2": [BATCH_SIZE, ...]}.
         """
         # Default implementation just passes obs, prev-a/r, and states on to
-        # `self.compute_actions()`.
-        agent_index = input_dict[SampleBatch.AGENT_INDEX][0]
-        episode_id = input_dict[SampleBatch.EPS_ID][0]
-        episode = [eps for eps in episodes if eps.episode_id == episode_id][0]  # type: ignore
-        agent_id: str = [
-            aid for aid in episode._agent_to_index if episode._agent_to_index[aid] == agent_index  # pylint: disable=protected-access
-        ][0]
+        # `self.compute_actions()`, with the episode, agent, info and sim time resolved for every row.
+        agent_indices = input_dict[SampleBatch.AGENT_INDEX]
+        episode_ids = input_dict[SampleBatch.EPS_ID]
+        row_index = self._index_rows(episodes or [], episode_ids, agent_indices)
+        row_episodes, agent_ids = map(list, zip(*(row_index[key] for key in zip(episode_ids, agent_indices))))
 
         obs_batch = input_dict[SampleBatch.OBS]
-        info = episode.last_info_for(agent_id)
-        if info is None:
-            info = {}
-
-        if 'platform_obs' in info:
-            sim_time = self.time_extractor.value(info['platform_obs'][agent_id], full_extraction=True)
-        else:
-            self._reset()
-            sim_time = -1
+        row_infos = [episode.last_info_for(agent_id) or {} for episode, agent_id in zip(row_episodes, agent_ids)]
+        for episode, agent_id, info in zip(row_episodes, agent_ids, row_infos):
+            if 'platform_obs' not in info:
+                self._reset_episode(episode.episode_id, agent_id)
+        sim_times = self._extract_times(row_infos, agent_ids)
 
         state_batches = [s for k, s in input_dict.items() if k[:9] == "state_in_"]
         return self.compute_actions(
@@ -189,13 +190,40 @@ class CustomPolicy(Policy):  # pylint: disable=abstract-method
             explore=explore,
             timestep=timestep,
             episodes=episodes,
-            sim_time=sim_time,
-            agent_id=agent_id,
-            info=info,
-            episode=episode,
+            sim_time=sim_times[0],
+            agent_id=agent_ids[0],
+            info=row_infos[0],
+            episode=row_episodes[0],
+            sim_times=sim_times,
+            agent_ids=agent_ids,
+            episode_ids=[episode.episode_id for episode in row_episodes],
+            row_infos=row_infos,
+            row_episodes=row_episodes,
             **kwargs,
         )
 
+    @staticmethod
+    def _index_rows(episodes: typing.List[Episode], episode_ids, agent_indices) -> typing.Dict[typing.Tuple, typing.Tuple[Episode, str]]:
+        """Index (episode_id, agent_index) -> (episode, agent_id) for the rows of a batch"""
+        episodes_by_id = {episode.episode_id: episode for episode in episodes}
+        row_index: typing.Dict[typing.Tuple, typing.Tuple[Episode, str]] = {}
+        for episode_id in set(episode_ids):
+            episode = episodes_by_id[episode_id]
+            for agent_id, agent_index in episode._agent_to_index.items():  # pylint: disable=protected-access
+                row_index[(episode_id, agent_index)] = (episode, agent_id)
+        missing = set(zip(episode_ids, agent_indices)) - row_index.keys()
+        if missing:
+            raise RuntimeError(f"Could not resolve the (episode_id, agent_index) of batch rows {sorted(missing)}")
+        return row_index
+
+    def _extract_times(self, row_infos: typing.List[dict], agent_ids: typing.List[str]) -> np.ndarray:
+        """Sim time of every row, -1 for rows whose episode just started"""
+        sim_times = np.full(len(row_infos), -1.0)
+        rows = [index for index, info in enumerate(row_infos) if 'platform_obs' in info]
+        if rows:
+            sim_times[rows] = self._time_value.extract_batch(row_infos[index]['platform_obs'][agent_ids[index]] for index in rows)
+        return sim_times
+
     def compute_actions(
         self,
         obs_batch: typing.Union[typing.List[TensorStructType], TensorStructType],
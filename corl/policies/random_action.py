@@ -12,9 +12,12 @@ limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
 Module with base implimentations for Observations
 """
+import numpy as np
 from ray.rllib.policy import Policy
 from ray.rllib.policy.sample_batch import SampleBatch
 
+from corl.libraries.env_space_util import EnvSpaceUtil
+
 
 class RandomActionPolicy(Policy):  # pylint: disable=abstract-method
     """Random action policy.
@@ -23,6 +26,8 @@ class RandomActionPolicy(Policy):  # pylint: disable=abstract-method
     def __init__(self, observation_space, action_space, config):
         Policy.__init__(self, observation_space, action_space, config)
         self.view_requirements = {key: value for key, value in self.view_requirements.items() if key != SampleBatch.PREV_ACTIONS}
+        seed = config.get("seed")
+        self._rng = np.random.default_rng(None if seed is None else [seed, config.get("worker_index", 0)])
 
     def compute_actions(
         self,
@@ -36,7 +41,7 @@ class RandomActionPolicy(Policy):  # pylint: disable=abstract-method
         timestep=None,
         **kwargs
     ):
-        return [self.action_space.sample() for _ in obs_batch], [], {}
+        return EnvSpaceUtil.sample_batch_from_space(self.action_space, len(obs_batch), self._rng), [], {}
 
     def learn_on_batch(self, samples):
         return {}
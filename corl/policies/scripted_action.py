@@ -117,13 +117,18 @@ class ScriptedActionPolicyValidator(CustomPolicyValidator):
 
 class ScriptedActionPolicy(CustomPolicy):  # pylint: disable=abstract-method
     """Scripted action policy.
+
+    The control schedule is compiled into a time array and every row of a batch is resolved with a
+    single searchsorted, each (episode, agent) keeps its own cursor into the schedule.
     """
 
     def __init__(self, observation_space, action_space, config):
         super().__init__(observation_space, action_space, config)
 
-        self._input_index: int
-        self._last_action: dict
+        self._control_times: np.ndarray = np.asarray(self.validated_config.control_times, dtype=np.float64)
+        self._cursors: typing.Dict[typing.Tuple, int]
+        self._last_actions: typing.Dict[typing.Tuple, dict]
+        self._zero_action: dict
 
     @property
     def get_validator(self) -> typing.Type[BasePolicyValidator]:
@@ -137,8 +142,14 @@ class ScriptedActionPolicy(CustomPolicy):  # pylint: disable=abstract-method
 
     def _reset(self):
         super()._reset()
-        self._input_index = 0
-        self._last_action = EnvSpaceUtil.get_zero_sample_from_space(self.validated_config.act_space)
+        self._cursors = {}
+        self._last_actions = {}
+        self._zero_action = EnvSpaceUtil.get_zero_sample_from_space(self.validated_config.act_space)
+
+    def _reset_episode(self, episode_id, agent_id):
+        """Restart the schedule of the agent in a new episode"""
+        self._cursors.pop((episode_id, agent_id), None)
+        self._last_actions.pop((episode_id, agent_id), None)
 
     def custom_compute_actions(
         self,
@@ -156,20 +167,42 @@ class ScriptedActionPolicy(CustomPolicy):  # pylint: disable=abstract-method
         episode=None,
         **kwargs
     ):
-        for control_index in range(self._input_index, len(self.validated_config.control_times)):
-            control_time = self.validated_config.control_times[control_index]
-            if sim_time >= control_time:
-                # apply control_list to controls
-                control_values = self.validated_config.control_values[control_index]
-
-                self._input_index = control_index + 1
-                self._last_action = control_values
-                return [control_values], [], {}
+        """Computes one action per row of the batch
 
-            break
-
-        if self.validated_config.missing_action_policy == 'repeat_last_action':
-            return [self._last_action], [], {}
-
-        self._last_action = self.validated_config.default_action
-        return [self.validated_config.default_action], [], {}
+        The rows are resolved through the `sim_times`, `episode_ids` and `agent_ids` keyword arguments
+        (one per row) when given, otherwise the sim_time, episode and agent_id of the call apply to every row.
+        """
+        batch_size = len(obs_batch)
+        sim_times = np.broadcast_to(np.asarray(kwargs.get("sim_times", sim_time), dtype=np.float64), (batch_size, ))
+        episode_ids = kwargs.get("episode_ids")
+        if episode_ids is None:
+            episode_ids = [None if episode is None else episode.episode_id] * batch_size
+        agent_ids = kwargs.get("agent_ids")
+        if agent_ids is None:
+            agent_ids = [agent_id] * batch_size
+        keys = list(zip(episode_ids, agent_ids))
+
+        cursors = np.fromiter((self._cursors.get(key, 0) for key in keys), dtype=np.int64, count=batch_size)
+        # a control is applied once sim_time reaches its time, at most one new control per step
+        triggered = np.searchsorted(self._control_times, sim_times, side='right') > cursors
+
+        if episodes is not None and len(self._last_actions) > 2 * len(episodes) * max(1, len(set(agent_ids))):
+            # drop the cursors of finished episodes
+            active = {active_episode.episode_id for active_episode in episodes}
+            self._cursors = {key: value for key, value in self._cursors.items() if key[0] in active}
+            self._last_actions = {key: value for key, value in self._last_actions.items() if key[0] in active}
+
+        repeat_last_action = self.validated_config.missing_action_policy == 'repeat_last_action'
+        actions = []
+        for row, key in enumerate(keys):
+            if triggered[row]:
+                action = self.validated_config.control_values[cursors[row]]
+                self._cursors[key] = cursors[row] + 1
+            elif repeat_last_action:
+                action = self._last_actions.get(key, self._zero_action)
+            else:
+                action = self.validated_config.default_action
+            self._last_actions[key] = action
+            actions.append(action)
+
+        return actions, [], {}
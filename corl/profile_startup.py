@@ -0,0 +1,142 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Reports the import cost of a corl module
+
+    python -m corl.profile_startup --module corl.environment.multi_agent_env --top 25 --group-by package
+
+The module is imported in a fresh interpreter with `-X importtime`, so the numbers
+include everything (ray, gym, pydantic validators...) pulled in by that import.
+"""
+import subprocess
+import sys
+import typing
+from collections import defaultdict
+
+import jsonargparse
+
+DEFAULT_MODULE = "corl.environment.multi_agent_env"
+
+_IMPORT_TIME_PREFIX = "import time:"
+
+# run in the child interpreter, reports the wall time and module count of the import on stdout
+_PROBE = "import sys, time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start, len(sys.modules))"
+
+
+class ImportRecord(typing.NamedTuple):
+    """A single line of the -X importtime report"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class ImportProfile(typing.NamedTuple):
+    """Import cost of a module measured in a fresh interpreter"""
+    module: str
+    wall_time: float
+    module_count: int
+    records: typing.List[ImportRecord]
+
+    def top(self, count: int, sort_by: str = "cumulative") -> typing.List[ImportRecord]:
+        """The most expensive imports sorted by 'self' or 'cumulative' time"""
+        key = (lambda record: record.self_us) if sort_by == "self" else (lambda record: record.cumulative_us)
+        return sorted(self.records, key=key, reverse=True)[:count]
+
+    def by_package(self) -> typing.List[typing.Tuple[str, int, int]]:
+        """Self time and module count summed per top level package, most expensive first"""
+        self_time: typing.Dict[str, int] = defaultdict(int)
+        counts: typing.Dict[str, int] = defaultdict(int)
+        for record in self.records:
+            package = record.module.split(".", 1)[0]
+            self_time[package] += record.self_us
+            counts[package] += 1
+        return sorted(((package, self_time[package], counts[package]) for package in self_time), key=lambda item: item[1], reverse=True)
+
+
+def parse_import_time(report: str) -> typing.List[ImportRecord]:
+    """Parse the stderr of `python -X importtime`
+
+    Parameters
+    ----------
+    report : str
+        stderr of the interpreter
+
+    Returns
+    -------
+    typing.List[ImportRecord]
+        one record per imported module, in import completion order
+    """
+    records = []
+    for line in report.splitlines():
+        if not line.startswith(_IMPORT_TIME_PREFIX):
+            continue
+        fields = line[len(_IMPORT_TIME_PREFIX):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # header line
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(module=stripped, self_us=int(fields[0]), cumulative_us=int(fields[1]), depth=depth))
+    return records
+
+
+def profile_imports(module: str = DEFAULT_MODULE, python: str = sys.executable) -> ImportProfile:
+    """Import a module in a fresh interpreter and measure its cost
+
+    Parameters
+    ----------
+    module : str
+        dotted name of the module to import
+    python : str
+        interpreter to run, defaults to the current one
+
+    Returns
+    -------
+    ImportProfile
+        wall time, total number of modules in sys.modules and the per module import times
+    """
+    result = subprocess.run([python, "-X", "importtime", "-c", _PROBE.format(module=module)], capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr}")
+    wall_time, module_count = result.stdout.strip().splitlines()[-1].split()
+    return ImportProfile(module=module, wall_time=float(wall_time), module_count=int(module_count), records=parse_import_time(result.stderr))
+
+
+def print_profile(profile: ImportProfile, top: int = 25, sort_by: str = "cumulative", group_by: str = "module") -> None:
+    """Print a human readable import cost report"""
+    print(f"import {profile.module}: {profile.wall_time:.3f} s, {profile.module_count} modules in sys.modules")
+    if group_by == "package":
+        print(f"{'self [ms]':>12} {'modules':>8}  package")
+        for package, self_us, count in profile.by_package()[:top]:
+            print(f"{self_us / 1000:12.1f} {count:8d}  {package}")
+    else:
+        print(f"{'self [ms]':>12} {'cumul [ms]':>12}  module")
+        for record in profile.top(top, sort_by):
+            print(f"{record.self_us / 1000:12.1f} {record.cumulative_us / 1000:12.1f}  {record.module}")
+
+
+def main(alternate_argv: typing.Optional[typing.Sequence[str]] = None):
+    """
+    Main method of the module, profiles the startup import cost of a module
+    """
+    parser = jsonargparse.ArgumentParser()
+    parser.add_argument("--module", type=str, default=DEFAULT_MODULE, help="dotted name of the module to profile")
+    parser.add_argument("--top", type=int, default=25, help="number of entries to report")
+    parser.add_argument("--sort-by", type=str, default="cumulative", choices=["self", "cumulative"], help="sort key for module entries")
+    parser.add_argument("--group-by", type=str, default="module", choices=["module", "package"], help="report per module or per package")
+    args = parser.parse_args(args=alternate_argv)
+
+    print_profile(profile_imports(args.module), top=args.top, sort_by=args.sort_by, group_by=args.group_by)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,10 +17,11 @@ from __future__ import annotations
 import logging
 import typing
 
+import gym
 import numpy as np
 from pydantic import BaseModel
 
-from corl.libraries.observation_extractor import ExtractorSet, ObservationExtractor, ObservationSpaceExtractor
+from corl.libraries.observation_extractor import CompiledObservationExtractor, ExtractorSet, ObservationSpaceExtractor
 from corl.rewards.reward_func_base import RewardFuncBase, RewardFuncBaseValidator
 
 
@@ -48,11 +49,13 @@ class ObservationExtractorValidator(BaseModel):
             Named Tuple of value, space, and unit extractors
         """
 
+        field_extractor = self.compile_extractor(full_extraction=False)
+        full_extractor = self.compile_extractor()
+
         def obs_extractor(obs, *_, full_extraction=False):
-            indices = []
             if full_extraction:
-                indices = self.indices
-            return ObservationExtractor(observation=obs, fields=self.fields, indices=indices)
+                return full_extractor(obs)
+            return field_extractor(obs)
 
         def obs_space_extractor(obs, *_):
             return ObservationSpaceExtractor(observation_space=obs, fields=self.fields)
@@ -62,6 +65,29 @@ class ObservationExtractorValidator(BaseModel):
 
         return ExtractorSet(obs_extractor, obs_space_extractor, unit_extractor)
 
+    def compile_extractor(
+        self,
+        observation_space: typing.Optional[gym.spaces.Space] = None,
+        full_extraction: bool = True,
+    ) -> CompiledObservationExtractor:
+        """
+        Builds a compiled value extractor, validated against the observation space when it is given
+
+        Parameters
+        ----------
+        observation_space : gym.spaces.Space
+            The space of the observations the extractor is applied to
+        full_extraction : bool
+            Whether the indices are applied after the fields
+
+        Returns
+        -------
+        CompiledObservationExtractor
+            The value extractor
+        """
+        indices = self.indices if full_extraction else []
+        return CompiledObservationExtractor(fields=self.fields, indices=indices, observation_space=observation_space)
+
     @staticmethod
     def get_curr_and_next_observation(extractor, observation, next_observation, allow_array: bool = False):
         """Helper function to extract the current and next observation
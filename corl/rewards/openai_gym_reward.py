@@ -13,17 +13,19 @@ limitation or restriction. See accompanying README and LICENSE for details.
 Reward for OpenAIGymSimulator
 """
 from corl.libraries.environment_dict import RewardDict
-from corl.rewards.reward_func_base import RewardFuncBase
+from corl.rewards.reward_func_base import BatchedRewardFuncBase
 
 
-class OpenAIGymReward(RewardFuncBase):
+class OpenAIGymReward(BatchedRewardFuncBase):
     """
     Reward for OpenAiGymSimulator that rewards the reward
     coming from the simulator provided state and reports it
     """
 
-    def __call__(
-        self,
+    @classmethod
+    def batch_call(
+        cls,
+        functors,
         observation,
         action,
         next_observation,
@@ -32,6 +34,9 @@ class OpenAIGymReward(RewardFuncBase):
         observation_space,
         observation_units,
     ):
-        reward_dict = RewardDict()
-        reward_dict[self.config.agent_name] = next_state.rewards[self.config.agent_name]
-        return reward_dict
+        rewards = []
+        for functor in functors:
+            reward_dict = RewardDict()
+            reward_dict[functor.config.agent_name] = next_state.rewards[functor.config.agent_name]
+            rewards.append(reward_dict)
+        return rewards
@@ -18,7 +18,7 @@ from collections import OrderedDict
 
 from pydantic import BaseModel
 
-from corl.libraries.env_func_base import EnvFuncBase
+from corl.libraries.env_func_base import BatchedEnvFunc, EnvFuncBase
 from corl.libraries.environment_dict import RewardDict
 from corl.libraries.state_dict import StateDict
 
@@ -76,3 +76,46 @@ class RewardFuncBase(EnvFuncBase):
             The name of the functor
         """
         return type(self).__name__ if self.config.name is None else self.config.name
+
+
+class BatchedRewardFuncBase(BatchedEnvFunc, RewardFuncBase):
+    """Reward functor evaluated for all the agents sharing it in a single call
+
+    Subclasses implement batch_call instead of __call__, typically by stacking the per agent values of the
+    observations into arrays and computing the rewards of every agent with one vectorized operation.
+    """
+
+    @classmethod
+    @abc.abstractmethod
+    def batch_call(  # pylint: disable=arguments-differ
+        cls,
+        functors: typing.Sequence['BatchedRewardFuncBase'],
+        observation: OrderedDict,
+        action,
+        next_observation: OrderedDict,
+        state: StateDict,
+        next_state: StateDict,
+        observation_space: StateDict,
+        observation_units: StateDict,
+    ) -> typing.List[RewardDict]:
+        """The RewardDict of each functor, see BatchedEnvFunc.batch_call"""
+
+    def __call__(
+        self,
+        observation: OrderedDict,
+        action,
+        next_observation: OrderedDict,
+        state: StateDict,
+        next_state: StateDict,
+        observation_space: StateDict,
+        observation_units: StateDict,
+    ) -> RewardDict:
+        return self._pop_batched_result(
+            observation=observation,
+            action=action,
+            next_observation=next_observation,
+            state=state,
+            next_state=next_state,
+            observation_space=observation_space,
+            observation_units=observation_units,
+        )
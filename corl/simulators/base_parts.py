@@ -135,7 +135,7 @@ class BasePlatformPart(abc.ABC):
     def __init__(self, parent_platform, config, property_class) -> None:
         config["part_class"] = self.__class__
         self.config = self.get_validator(**config)
-        self._properties = property_class(**self.config.properties)
+        self._properties = property_class.shared(**self.config.properties)
         self._parent_platform = parent_platform
         self._valid = self.config.initial_validity
 
@@ -164,6 +164,12 @@ class BasePlatformPart(abc.ABC):
         """
         self._valid = False
 
+    def reset_part(self) -> None:
+        """
+        Returns the part to its initial state when its platform is reused for a new episode
+        """
+        self._valid = self.config.initial_validity
+
     @property
     def name(self) -> typing.Optional[str]:
         """
@@ -245,8 +251,8 @@ class BaseController(BasePlatformPart, abc.ABC):
         control
             The control to be validated
         """
-        if not self.control_properties.create_space().contains(control):
-            raise ValueError(f"{type(self).__name__} control {control} not in space {self.control_properties.create_space()} values")
+        if not self.control_properties.get_space().contains(control):
+            raise ValueError(f"{type(self).__name__} control {control} not in space {self.control_properties.get_space()} values")
 
     @abc.abstractmethod
     def apply_control(self, control: np.ndarray) -> None:
@@ -320,6 +326,10 @@ class BaseSensor(BasePlatformPart, abc.ABC):
         """
         ...
 
+    def reset_part(self) -> None:
+        super().reset_part()
+        self._last_measurement = None
+
     def calculate_and_cache_measurement(self, state: typing.Tuple):
         """
         Calculates the measurement and caches the result in the _last_measurement variable
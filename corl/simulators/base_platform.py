@@ -108,6 +108,16 @@ class BasePlatform(abc.ABC):
 
         return part_list
 
+    def reset_platform(self) -> None:
+        """
+        Returns the platform and its parts to their initial state, so a simulator can reuse the platform for a new
+        episode instead of building it again. Subclasses holding episode state extend this.
+        """
+        for part in self._sensors:
+            part.reset_part()
+        for part in self._controllers:
+            part.reset_part()
+
     def verify_unique_parts(self):
         """
         Verify all parts have a unique name
@@ -47,12 +47,15 @@ class BaseSimulatorValidator(BaseModel):
                                 this should pretty much only be used for behavior tree type
                                 agents
     frame_rate: the rate the simulator should run at (in Hz)
+    pool_platforms: build the platforms and their parts once and reset them in place on every episode,
+                    for simulators that support it. The part exclusivity checks then only run once.
     """
     worker_index: int = 0
     vector_index: int = 0
     agent_configs: typing.Mapping[str, AgentConfig]
     disable_exclusivity_check: bool = False
     frame_rate: float = 1.0
+    pool_platforms: bool = False
 
 
 class BaseSimulatorResetValidator(BaseModel):
@@ -135,6 +138,20 @@ class BaseSimulator(ABC):
         """
         return BaseSimulatorResetValidator
 
+    @classmethod
+    def parts_simulator(cls, config: typing.Mapping[str, typing.Any]) -> typing.Type['BaseSimulator']:  # pylint: disable=unused-argument
+        """
+        returns the simulator class the platform parts of the agents are looked up for,
+        simulators standing in for another simulator return the simulator they stand in for
+
+        Arguments:
+            config {typing.Mapping[str, typing.Any]} -- The simulator configuration given to the environment
+
+        Returns:
+            typing.Type[BaseSimulator] -- The simulator class the parts are registered with
+        """
+        return cls
+
     @property
     def frame_rate(self) -> float:
         """Return the frame rate (in Hz) this simulator will run at"""
@@ -68,6 +68,25 @@ class Deputy1D:
     def _get_config_validator(cls):
         return Deputy1dValidator
 
+    def reset(self, m=12, integration_method="RK45", **kwargs):
+        """
+        Resets the entity in place to the initial state of a new episode
+
+        Parameters
+        ----------
+        m: float
+            Mass of spacecraft in kilograms, by default 12
+        integration_method: str
+            Numerical integration method passed to dynamics model.
+        kwargs:
+            Additional keyword arguments passed to Deputy1dValidator
+        """
+        self.config = self._get_config_validator()(name=self.name, **kwargs)
+        if m != self.dynamics.m or integration_method != self.dynamics.integration_method:
+            self.dynamics = Docking1dDynamics(m=m, integration_method=integration_method)
+        self._state = self._build_state()
+        self.state_dot = np.zeros_like(self._state)
+
     def step(self, step_size, action=None):
         """
         Executes a state transition simulation step for the entity
@@ -58,6 +58,11 @@ class Docking1dPlatform(BasePlatform):
             return eq
         return False
 
+    def reset_platform(self) -> None:
+        super().reset_platform()
+        self._last_applied_action = np.array([0], dtype=np.float32)  # thrust
+        self._sim_time = 0.0
+
     def get_applied_action(self):
         """
         returns the action stored in this platform
@@ -56,12 +56,23 @@ class Docking1dSimulator(BaseSimulator):
         super().__init__(**kwargs)
         self._state = StateDict()
         self.clock = 0.0
+        self._platform_pool: typing.Tuple[Docking1dPlatform, ...] = ()
 
     def reset(self, config):
         config = self.get_reset_validator(**config)
         self._state.clear()
         self.clock = 0.0
 
+        if self.config.pool_platforms and self._platform_pool:
+            # reuse the platforms and entities of the previous episode with the new initial state
+            for agent_id, entity in self.sim_entities.items():
+                entity.reset(**config.platforms.get(agent_id, {}))
+            for platform in self._platform_pool:
+                platform.reset_platform()
+            self._state.sim_platforms = self._platform_pool
+            self.update_sensor_measurements()
+            return self._state
+
         # construct entities ("Gets the platform object associated with each simulation entity.")
         self.sim_entities = {}  # pylint: disable=attribute-defined-outside-init
         for agent_id, agent_config in self.config.agent_configs.items():
@@ -74,6 +85,8 @@ class Docking1dSimulator(BaseSimulator):
             agent_config = self.config.agent_configs[agent_id]
             sim_platforms.append(Docking1dPlatform(platform_name=agent_id, platform=entity, parts_list=agent_config.parts_list))
         self._state.sim_platforms = tuple(sim_platforms)
+        if self.config.pool_platforms:
+            self._platform_pool = self._state.sim_platforms
 
         self.update_sensor_measurements()
         return self._state
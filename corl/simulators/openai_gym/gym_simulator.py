@@ -74,6 +74,10 @@ class OpenAiGymPlatform(BasePlatform):
 
         super().__init__(**kwargs)
 
+        self.reset_platform()
+
+    def reset_platform(self) -> None:
+        super().reset_platform()
         if isinstance(self.action_space, gym.spaces.Discrete):
             self._last_applied_action = 0
         elif isinstance(self.action_space, gym.spaces.Box):
@@ -231,7 +235,12 @@ class OpenAIGymSimulator(BaseSimulator):
         for agent_name, agent_env in self.gym_env_dict.items():
             self._state.obs[agent_name] = agent_env.reset()
 
-        self.sim_platforms = self.get_platforms()
+        if self.config.pool_platforms and self.sim_platforms:
+            # the gym environments persist across episodes, only the platform state needs a reset
+            for sim_platform in self.sim_platforms:
+                sim_platform.reset_platform()
+        else:
+            self.sim_platforms = self.get_platforms()
         self.update_sensor_measurements()
         return self._state
 
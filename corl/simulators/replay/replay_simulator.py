@@ -0,0 +1,288 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+Simulator replaying the platform states of recorded episodes
+
+Episodes recorded by an EpisodeDataRecorder with record_platforms hold, for every step, the operability of
+the platforms, the measurements of their sensors and the recorded platform attributes. The ReplaySimulator
+feeds them back step by step to the parts of the recorded simulator, so the glues, rewards and dones of an
+environment are evaluated again on the stored episodes without running the recorded simulator.
+
+The environment config only swaps the simulator, the parts are still looked up for the recorded simulator:
+
+    simulator:
+      type: corl.simulators.replay.replay_simulator.ReplaySimulator
+      config:
+        simulator: corl.simulators.docking_1d.simulator.Docking1dSimulator
+        episodes: [<episode_recorder directory>]
+
+The recording starts after the warmup steps of the recorded environment, the replaying environment must use
+sim_warmup_steps 0. The actions of the agents are applied to the parts but do not change the replayed states.
+"""
+import os
+import typing
+
+from pydantic import PyObject, parse_obj_as, validator
+
+from corl.environment.utils.episode_data_recorder import EpisodeDataReader, list_recorded_episodes
+from corl.libraries.plugin_library import PluginLibrary
+from corl.libraries.state_dict import StateDict
+from corl.simulators.base_platform import BasePlatform, BasePlatformValidator
+from corl.simulators.base_simulator import BaseSimulator, BaseSimulatorValidator
+
+
+class ReplayPlatformValidator(BasePlatformValidator):
+    """ReplayPlatformValidator
+
+    Parameters
+    ----------
+        attributes: typing.Dict[str, typing.Any]
+            initial values of the platform attributes, the static attributes of the recording
+    """
+    attributes: typing.Dict[str, typing.Any] = {}
+
+
+class ReplayPlatform(BasePlatform):
+    """
+    A platform whose state is read from a recording. The sensors return the recorded measurements and the
+    recorded attributes of the platform are available as its attributes. Actions saved by the controllers are
+    kept for get_applied_action, like the platforms of the docking and gym simulators do.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        # the parts built by the base class may read the static attributes
+        self._attributes: typing.Dict[str, typing.Any] = dict(kwargs.get("attributes", {}))
+        self._operable = True
+        self._last_applied_action: typing.Any = None
+        self.config: ReplayPlatformValidator
+        super().__init__(**kwargs)
+
+    @property
+    def get_validator(self) -> typing.Type[ReplayPlatformValidator]:
+        return ReplayPlatformValidator
+
+    def __getattr__(self, name: str) -> typing.Any:
+        attributes = self.__dict__.get("_attributes", {})
+        if name in attributes:
+            return attributes[name]
+        raise AttributeError(
+            f"{type(self).__name__} {self.__dict__.get('_name')} has no attribute {name}, "
+            "record it with platform_attributes or static_platform_attributes"
+        )
+
+    def reset_platform(self) -> None:
+        super().reset_platform()
+        self._operable = True
+        self._last_applied_action = None
+
+    def set_static_attributes(self, attributes: typing.Mapping[str, typing.Any]) -> None:
+        """Set the static attributes of a new recording"""
+        self._attributes.update(attributes)
+
+    def replay(self, state: typing.Mapping[str, typing.Any]) -> None:
+        """
+        Set the recorded state of a step, see platform_state
+
+        Parameters
+        ----------
+        state : typing.Mapping[str, typing.Any]
+            operability, sensor measurements and attributes of the platform
+        """
+        self._operable = bool(state["operable"])
+        self._attributes.update(state.get("attributes", {}))
+        measurements = state.get("sensors", {})
+        for sensor in self._sensors:
+            # the recorded measurement takes the place of the one the sensor calculates in the recorded simulator
+            measurement = measurements[sensor.name] if state["measured"][sensor.name] else None
+            sensor._last_measurement = measurement  # pylint: disable=protected-access
+            if state["valid"][sensor.name]:
+                sensor.set_valid()
+            else:
+                sensor.set_invalid()
+
+    def get_applied_action(self) -> typing.Any:
+        """
+        returns the action stored in this platform
+
+        Returns:
+            typing.Any -- any sort of stored action
+        """
+        return self._last_applied_action
+
+    def save_action_to_platform(self, action: typing.Any) -> None:
+        """
+        saves an action to the platform
+
+        Arguments:
+            action typing.Any -- The action to store in the platform
+        """
+        self._last_applied_action = action
+
+    @property
+    def operable(self) -> bool:
+        return self._operable
+
+
+class ReplaySimulatorValidator(BaseSimulatorValidator):
+    """
+    simulator: the recorded simulator, the parts of the agents are the parts registered for it
+    episodes: episode files recorded with record_platforms, or directories holding them, replayed in order
+    """
+    simulator: PyObject
+    episodes: typing.List[str]
+
+    @validator("episodes")
+    def expand_directories(cls, v):
+        """Replace the directories by their episode files"""
+        episodes: typing.List[str] = []
+        for path in v:
+            if not os.path.exists(path):
+                raise ValueError(f"{path} does not exist")
+            episodes.extend(list_recorded_episodes(path) if os.path.isdir(path) else [path])
+        if not episodes:
+            raise ValueError(f"No recorded episodes in {v}")
+        return episodes
+
+
+class ReplaySimulator(BaseSimulator):
+    """
+    Simulator replaying recorded episodes. Every reset loads the next episode of the configuration, or the one
+    given to queue_episode, every step moves to the next recorded step.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.config: ReplaySimulatorValidator
+        super().__init__(**kwargs)
+        self._state = StateDict()
+        self._episode_index = 0
+        self._queued_episode: typing.Optional[str] = None
+        self._reader: typing.Optional[EpisodeDataReader] = None
+        self._episode = ""
+        self._step = 0
+        self._sim_time = 0.0
+        self._platforms: typing.Dict[str, ReplayPlatform] = {}
+        self._deleted: typing.Set[str] = set()
+
+    @property
+    def get_simulator_validator(self) -> typing.Type[ReplaySimulatorValidator]:
+        return ReplaySimulatorValidator
+
+    @classmethod
+    def parts_simulator(cls, config: typing.Mapping[str, typing.Any]) -> typing.Type[BaseSimulator]:
+        return parse_obj_as(PyObject, config["simulator"])
+
+    @property
+    def episode(self) -> str:
+        """The episode file being replayed"""
+        return self._episode
+
+    @property
+    def reader(self) -> EpisodeDataReader:
+        """The reader of the episode being replayed, it also provides the recorded actions, rewards and dones"""
+        if self._reader is None:
+            raise RuntimeError("No episode is replayed before the first reset")
+        return self._reader
+
+    @property
+    def replay_step(self) -> int:
+        """The recorded step of the current state, 0 after the reset"""
+        return self._step
+
+    @property
+    def replay_finished(self) -> bool:
+        """True once the last recorded step is reached"""
+        return self._step + 1 >= len(self.reader)
+
+    def queue_episode(self, path: str) -> None:
+        """Replay the episode file on the next reset instead of the next episode of the configuration"""
+        self._queued_episode = path
+
+    def reset(self, config):
+        config = self.get_reset_validator(**config)
+        if self._queued_episode is not None:
+            path, self._queued_episode = self._queued_episode, None
+        else:
+            path = self.config.episodes[self._episode_index % len(self.config.episodes)]
+            self._episode_index += 1
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = EpisodeDataReader(path)
+        self._episode = path
+        if "platform" not in self._reader.spaces:
+            raise ValueError(f"{path} was recorded without record_platforms")
+
+        recorded = self._reader.spaces["platform"].spaces
+        missing = set(self.config.agent_configs) - set(recorded)
+        if missing:
+            raise ValueError(f"{path} does not hold the platforms {sorted(missing)}")
+        if not self.config.pool_platforms:
+            self._platforms.clear()
+        for name, space in recorded.items():
+            static = self._reader.static.get(name, {})
+            platform = self._platforms.get(name)
+            if platform is not None:
+                platform.reset_platform()
+                platform.set_static_attributes(static)
+                continue
+            agent_config = self.config.agent_configs.get(name)
+            platform = ReplayPlatform(
+                platform_name=name,
+                parts_list=agent_config.parts_list if agent_config is not None else [],
+                attributes=static,
+                disable_exclusivity_check=self.config.disable_exclusivity_check,
+            )
+            recorded_sensors = set(space.spaces["sensors"].spaces) if "sensors" in space.spaces else set()
+            unrecorded = {sensor.name for sensor in platform.sensors} - recorded_sensors
+            if unrecorded:
+                raise ValueError(f"{path} does not hold the measurements of the sensors {sorted(unrecorded)} of {name}")
+            self._platforms[name] = platform
+
+        self._deleted.clear()
+        self._step = 0
+        return self._replay()
+
+    def step(self):
+        if self.replay_finished:
+            raise ValueError(f"{self._episode} has no step after step {self._step}")
+        self._step += 1
+        return self._replay()
+
+    def _replay(self) -> StateDict:
+        data = self.reader[self._step]
+        self._sim_time = data["sim_time"]
+        platforms = []
+        for name, state in data["platform"].items():
+            if name not in self._deleted:
+                self._platforms[name].replay(state)
+                platforms.append(self._platforms[name])
+        self._state.clear()
+        self._state.sim_platforms = tuple(platforms)
+        return self._state
+
+    @property
+    def sim_time(self) -> float:
+        return self._sim_time
+
+    @property
+    def platforms(self) -> typing.List:
+        return list(self._state.sim_platforms)
+
+    def delete_platform(self, name):
+        self._deleted.add(name)
+        self._state.sim_platforms = tuple(platform for platform in self._state.sim_platforms if platform.name != name)
+
+    def mark_episode_done(self, done_info, episode_state):
+        pass
+
+    def save_episode_information(self, dones, rewards, observations):
+        pass
+
+
+PluginLibrary.AddClassToGroup(ReplaySimulator, "ReplaySimulator", {})
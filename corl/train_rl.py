@@ -98,6 +98,13 @@ class MainUtilACT3Core:
             help="Tells your specified experiment to update its output directory.  Experiments may ignore this directive."
         )
 
+        parser.add_argument(
+            '--baseline',
+            action='store',
+            help="Path to a stored benchmark report to compare against, the run fails on a regression.  "
+            "Experiments may ignore this directive."
+        )
+
         parser.add_argument('--profile', action='store_true', help="Tells experiment to switch configuration to profile mode")
         parser.add_argument('--profile-iterations', type=int, default=10)
         return parser.parse_args(args=alternate_argv)
@@ -18,6 +18,15 @@ import yaml
 from corl.train_rl import MainUtilACT3Core
 from corl.parsers.yaml_loader import load_file
 from corl.experiments.base_experiment import ExperimentParse
+from corl.libraries.benchmark_util import (
+    BenchmarkRegressionError,
+    MemoryGrowthError,
+    MemoryTracker,
+    check_memory_growth,
+    check_regressions,
+    compare_reports,
+    read_report,
+)
 
 
 # Adjustments to the configuration files used in this test to match the current baseline is authorized, provided you make a post on
@@ -33,6 +42,10 @@ from corl.experiments.base_experiment import ExperimentParse
             'config/experiments/cartpole_v1_benchmark.yml',
             id='cartpole-v1-benchmark'
         ),
+        pytest.param(
+            'config/experiments/docking_1d_benchmark.yml',
+            id='docking-1d-benchmark'
+        ),
     ],
 )
 def test_tasks(
@@ -83,4 +96,45 @@ def test_tasks(
     experiment_class.config.tune_config['local_dir'] = str(tmp_path / "training")
     experiment_class.config.tune_config['checkpoint_freq'] = 1
     experiment_class.config.tune_config['max_failures'] = 1
+
+    experiment_class.config.benchmark_config.episodes = 2
+    experiment_class.config.benchmark_config.seeds = [0]
+    experiment_class.config.benchmark_config.output_file = str(tmp_path / "benchmark.json")
     experiment_class.run_experiment(args)
+
+    report = read_report(str(tmp_path / "benchmark.json"))
+    assert report["sps"]["count"] == 2
+    assert report["total_steps"] == report["step_latency_ms"]["count"]
+    assert report["reset_latency_ms"]["p50"] <= report["reset_latency_ms"]["p99"]
+    assert "simulator_step" in report["phases"]
+
+
+def test_compare_reports():
+    baseline = {"sps": {"mean": 1000.0}, "step_latency_ms": {"p50": 1.0, "p95": 2.0, "p99": 3.0}}
+
+    faster = {"sps": {"mean": 1050.0}, "step_latency_ms": {"p50": 0.9, "p95": 2.1, "p99": 3.0}}
+    check_regressions(compare_reports(faster, baseline, tolerance=0.1))
+
+    slower = {"sps": {"mean": 800.0}, "step_latency_ms": {"p50": 1.0, "p95": 2.0, "p99": 3.0}}
+    comparison = compare_reports(slower, baseline, tolerance=0.1)
+    assert comparison["sps.mean"]["regressed"]
+    assert not comparison["step_latency_ms.p99"]["regressed"]
+    with pytest.raises(BenchmarkRegressionError):
+        check_regressions(comparison)
+
+
+def test_memory_tracker_detects_growth():
+    leak = []
+    tracker = MemoryTracker(snapshot_interval=2, steady_state_snapshots=1)
+    tracker.start()
+    for episode in range(1, 11):
+        leak.append(bytearray(64 * 1024))
+        tracker.episode_done(episode)
+    tracker.stop()
+
+    report = tracker.report()
+    assert len(report["snapshots"]) == 5
+    assert report["growth_per_episode_kb"] > 32
+    check_memory_growth(report, max_growth_per_episode_kb=128)
+    with pytest.raises(MemoryGrowthError):
+        check_memory_growth(report, max_growth_per_episode_kb=16)
@@ -0,0 +1,64 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from corl.experiments.base_experiment import ExperimentParse
+from corl.experiments.dataset_experiment import flatten_actions, iter_dataset_shards
+from corl.libraries.benchmark_util import read_report
+from corl.parsers.yaml_loader import load_file
+from corl.train_rl import MainUtilACT3Core
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_dataset_experiment(num_workers, tmp_path, self_managed_ray):
+    args = MainUtilACT3Core.parse_args(["--cfg", "config/experiments/cartpole_v1_dataset.yml"])
+    config = load_file(config_filename=args.config)
+
+    experiment_parse = ExperimentParse(**config)
+    experiment_class = experiment_parse.experiment_class(**experiment_parse.config)
+
+    experiment_class.config.rllib_configs["local"] = {'horizon': 10, 'num_cpus_per_worker': 1, 'num_gpus': 0, 'seed': 1}
+    experiment_class.config.ray_config['ignore_reinit_error'] = True
+    if "_temp_dir" in experiment_class.config.ray_config:
+        del experiment_class.config.ray_config["_temp_dir"]
+    experiment_class.config.env_config["output_path"] = str(tmp_path / "env")
+
+    dataset_config = experiment_class.config.dataset_config
+    dataset_config.transitions = 200
+    dataset_config.num_workers = num_workers
+    dataset_config.rollout_fragment_length = 20
+    dataset_config.max_file_size_mb = 0.002
+    dataset_config.output_dir = str(tmp_path / "dataset")
+    experiment_class.run_experiment(args)
+
+    report = read_report(str(tmp_path / "dataset" / "dataset.json"))
+    assert report["transitions"] >= 200
+    assert report["transitions_per_s"] > 0
+
+    # the shards are size bounded, a small bound splits the dataset
+    assert len(glob.glob(os.path.join(str(tmp_path / "dataset"), "blue0", "part-*.npz"))) > 1
+    shards = list(iter_dataset_shards(str(tmp_path / "dataset"), "blue0"))
+    assert sum(len(shard["actions"]) for shard in shards) == report["transitions"]
+    for shard in shards:
+        assert shard["obs"].ndim == 2 and shard["actions"].ndim == 2
+        assert len(shard["obs"]) == len(shard["new_obs"]) == len(shard["rewards"]) == len(shard["actions"])
+
+
+def test_flatten_actions():
+    actions = {"b": np.array([[1.0, 2.0], [3.0, 4.0]]), "a": np.array([0, 1])}
+    flat = flatten_actions(actions, 2)
+    assert flat.dtype == np.float32
+    np.testing.assert_array_equal(flat, [[0, 1, 2], [1, 3, 4]])
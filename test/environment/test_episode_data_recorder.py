@@ -0,0 +1,102 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import os
+
+import gym
+import numpy as np
+import pytest
+
+from corl.environment.utils.episode_data_recorder import (
+    EpisodeDataReader,
+    EpisodeDataRecorder,
+    EpisodeDataRecorderConfig,
+    list_recorded_episodes,
+)
+
+
+def _spaces():
+    agent_space = gym.spaces.Dict({"position": gym.spaces.Box(-100, 100, shape=(2, )), "mode": gym.spaces.Discrete(3)})
+    action_space = gym.spaces.Dict({"thrust": gym.spaces.Box(-1, 1, shape=(1, ))})
+    normalized_space = gym.spaces.Dict({"position": gym.spaces.Box(-1, 1, shape=(2, ))})
+    return {
+        "action": gym.spaces.Dict({"blue0": action_space, "red0": action_space}),
+        "observation": gym.spaces.Dict({"blue0": agent_space, "red0": agent_space}),
+        "normalized_observation": gym.spaces.Dict({"blue0": normalized_space, "red0": normalized_space}),
+    }
+
+
+def _observation(step, agent_offset):
+    return {"position": np.array([step, agent_offset], dtype=np.float32), "mode": step % 3}
+
+
+def test_episode_data_recorder(tmp_path):
+    config = EpisodeDataRecorderConfig(chunk_steps=4, buffer_steps=8)
+    recorder = EpisodeDataRecorder(str(tmp_path), _spaces(), ["blue0", "red0"], config)
+
+    for episode, length in enumerate([10, 3]):
+        recorder.start_episode(episode, episode_id=100 + episode)
+        recorder.record(0.0, observation={"blue0": _observation(0, 1), "red0": _observation(0, 2)})
+        for step in range(1, length + 1):
+            # red0 is removed after its third step
+            agents = ["blue0", "red0"] if step <= 3 else ["blue0"]
+            recorder.record(
+                step * 0.1,
+                action={agent: {"thrust": np.array([step / 10], dtype=np.float32)} for agent in agents},
+                observation={agent: _observation(step, index + 1) for index, agent in enumerate(agents)},
+                normalized_observation={agent: {"position": np.array([step / 100, 0.5], dtype=np.float32)} for agent in agents},
+                reward={agent: float(step) for agent in agents},
+                done={**{agent: step == 3 and agent == "red0" for agent in agents}, "__all__": step == length},
+            )
+        if episode == 0:
+            recent = recorder.recent()
+            assert recent["step"].tolist() == list(range(3, 11))
+            np.testing.assert_allclose(recent["reward"][:, 0], np.arange(3, 11))
+    recorder.close()
+
+    episodes = list_recorded_episodes(str(tmp_path))
+    assert len(episodes) == 2
+    # the process is part of the names so a restarted worker does not replace the earlier episodes
+    assert all(f"-{os.getpid()}-" in os.path.basename(episode) for episode in episodes)
+
+    with EpisodeDataReader(episodes[0]) as reader:
+        assert len(reader) == 11
+        assert reader.num_chunks == 3
+        assert reader.meta["episode_id"] == 100
+
+        # random access in the middle of a chunk
+        step = reader[6]
+        assert step["sim_time"] == pytest.approx(0.6)
+        assert list(step["observation"]) == ["blue0"]
+        np.testing.assert_allclose(step["observation"]["blue0"]["position"], [6, 1])
+        assert step["observation"]["blue0"]["mode"] == 0
+        np.testing.assert_allclose(step["action"]["blue0"]["thrust"], [0.6], rtol=1e-6)
+        assert step["reward"] == {"blue0": 6.0}
+        assert step["done"] == {"blue0": False, "__all__": False}
+
+        step = reader[3]
+        assert step["done"] == {"blue0": False, "red0": True, "__all__": False}
+        np.testing.assert_allclose(step["normalized_observation"]["red0"]["position"], [0.03, 0.5], rtol=1e-6)
+
+        reset = reader[0]
+        assert reset["action"] == {} and reset["reward"] == {}
+        assert list(reset["observation"]) == ["blue0", "red0"]
+
+        assert reader[-1]["done"]["__all__"]
+        with pytest.raises(IndexError):
+            reader.step(11)
+
+        np.testing.assert_allclose(reader.column("sim_time"), np.arange(11) * 0.1)
+        assert reader.column("observation").shape == (11, 10)
+
+    with EpisodeDataReader(episodes[1]) as reader:
+        assert len(reader) == 4
+        assert reader[3]["done"]["__all__"]
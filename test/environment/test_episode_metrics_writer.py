@@ -0,0 +1,46 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import glob
+import os
+
+import numpy as np
+
+from corl.environment.utils.episode_metrics_writer import EpisodeMetricsWriter, EpisodeMetricsWriterConfig, read_episode_metrics
+
+
+def test_episode_metrics_writer(tmp_path):
+    config = EpisodeMetricsWriterConfig(partition_episodes=2, file_format="npz")
+    writer = EpisodeMetricsWriter(str(tmp_path), config)
+
+    for episode in range(5):
+        metrics = {
+            "done_status/blue0/WIN": int(episode % 2 == 0),
+            "rewards/blue0/DockingReward/blue0": float(episode),
+            "adr/env/not_recorded": 1.0,
+        }
+        if episode == 4:
+            metrics["variable/env/new_variable"] = 3.0
+        writer.record({"episode_id": 10**17 + episode, "length": 10 + episode}, metrics)
+    writer.close()
+
+    assert writer.dropped == 0
+    partitions = glob.glob(os.path.join(str(tmp_path), "part-*.npz"))
+    assert len(partitions) == 3
+    # the process is part of the names so a restarted trial does not replace the earlier partitions
+    assert all(f"-{os.getpid()}-" in os.path.basename(partition) for partition in partitions)
+
+    columns = read_episode_metrics(str(tmp_path))
+    assert "adr/env/not_recorded" not in columns
+    assert columns["episode_id"].tolist() == [10**17 + episode for episode in range(5)]
+    np.testing.assert_array_equal(columns["rewards/blue0/DockingReward/blue0"], np.arange(5, dtype=np.float64))
+    assert columns["done_status/blue0/WIN"].tolist() == [1, 0, 1, 0, 1]
+    assert columns["variable/env/new_variable"].tolist() == [None, None, None, None, 3.0]
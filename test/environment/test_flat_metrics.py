@@ -0,0 +1,55 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+from collections import defaultdict
+
+import pytest
+from flatten_dict import flatten
+
+from corl.environment.utils.flat_metrics import FlatMetrics
+
+
+def reward_info(step):
+    return {
+        "blue0": {"DockingReward": {"blue0": 1.0 * step}, "DistanceReward": {"blue0": 0.5}},
+        "blue1": {"DockingReward": {"blue1": -1.0}},
+    }
+
+
+def test_flat_metrics_matches_flatten():
+    flat_metrics = FlatMetrics("rewards/")
+    for step in range(3):
+        expected = {f"rewards/{key}": value for key, value in flatten(reward_info(step), reducer="path").items()}
+        assert dict(flat_metrics.items(reward_info(step))) == expected
+
+
+def test_flat_metrics_accumulate():
+    flat_metrics = FlatMetrics("rewards_cumulative/")
+    expected = defaultdict(float)
+    infos = [reward_info(step) for step in range(4)]
+    # the structure changes mid episode: a reward appears and another one disappears
+    infos.append({"blue0": {"DockingReward": {"blue0": 2.0}, "NewReward": {"blue0": 3.0}}})
+    infos.append(reward_info(5))
+
+    for info in infos:
+        flat_metrics.accumulate(info)
+        for key, value in flatten(info, reducer="path").items():
+            expected[f"rewards_cumulative/{key}"] += value
+
+    assert dict(flat_metrics.items()) == pytest.approx(dict(expected))
+
+    flat_metrics.reset()
+    flat_metrics.accumulate(reward_info(1))
+    totals = dict(flat_metrics.items())
+    assert totals["rewards_cumulative/blue0/DockingReward/blue0"] == pytest.approx(1.0)
+    # rewards of previous episodes that were not given in this one are not reported
+    assert "rewards_cumulative/blue0/NewReward/blue0" not in totals
+    assert len(totals) == 3
@@ -0,0 +1,46 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import pytest
+
+from corl.environment.utils.metric_reduction import MetricReducer, MetricReductionConfig
+
+METRICS = {
+    "rewards/blue0/DockingReward/blue0": 1.0,
+    "rewards_cumulative/blue0/DockingReward/blue0": 10.0,
+    "variable/env/foo": 2.0,
+    "done_status/blue0/WIN": 1,
+}
+
+
+def test_metric_selection():
+    reducer = MetricReducer(MetricReductionConfig(include=["rewards", "done_status"], exclude=["rewards/"]))
+    assert not reducer.passthrough
+    assert reducer.reduce(METRICS) == {"rewards_cumulative/blue0/DockingReward/blue0": 10.0, "done_status/blue0/WIN": 1}
+
+    assert MetricReducer(MetricReductionConfig()).passthrough
+
+
+def test_metric_aggregation():
+    reducer = MetricReducer(MetricReductionConfig(include=["variable/"], aggregate_episodes=3, reductions=["mean", "max", "nonzero"]))
+
+    assert reducer.reduce({**METRICS, "variable/env/foo": 1.0}) == {}
+    assert reducer.reduce({**METRICS, "variable/env/foo": 0.0}) == {}
+    summary = reducer.reduce({**METRICS, "variable/env/foo": 5.0})
+    assert summary == {"variable/env/foo_mean": pytest.approx(2.0), "variable/env/foo_max": 5.0, "variable/env/foo_nonzero": 2}
+
+    # the window starts over
+    assert reducer.reduce(METRICS) == {}
+
+
+def test_unknown_reduction():
+    with pytest.raises(ValueError):
+        MetricReductionConfig(reductions=["mode"])
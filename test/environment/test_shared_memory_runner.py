@@ -0,0 +1,106 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import os
+from collections import OrderedDict
+from functools import partial
+
+import gym
+import numpy as np
+import pytest
+
+from corl.environment.utils.shared_memory_runner import SharedMemoryEnvRunner, SpaceLayout
+
+
+class CounterEnv:
+    """Two agents moving a counter, the episode ends after episode_length steps"""
+
+    episode_length = 3
+
+    def __init__(self, index, closed_dir=None):
+        self.index = index
+        self.closed_dir = closed_dir
+        self.observation_space = gym.spaces.Dict(
+            OrderedDict(
+                [
+                    ("blue0", gym.spaces.Dict({"count": gym.spaces.Box(-100, 100, shape=(2, ))})),
+                    ("blue1", gym.spaces.Dict({"count": gym.spaces.Box(-100, 100, shape=(2, ))})),
+                ]
+            )
+        )
+        self.action_space = gym.spaces.Dict(OrderedDict([("blue0", gym.spaces.Discrete(3)), ("blue1", gym.spaces.Discrete(3))]))
+        self.steps = 0
+
+    def _observation(self, agents):
+        return OrderedDict((agent, {"count": np.array([self.index, self.steps], dtype=np.float32)}) for agent in agents)
+
+    def close(self):
+        if self.closed_dir is not None:
+            with open(os.path.join(self.closed_dir, f"closed-{self.index}"), "w", encoding="utf-8"):
+                pass
+
+    def reset(self):
+        self.steps = 0
+        return self._observation(["blue0", "blue1"])
+
+    def step(self, action):
+        if action["blue0"] == 2:
+            raise ValueError("invalid action")
+        self.steps += 1
+        done = self.steps >= self.episode_length
+        # blue1 is only observed on even steps
+        agents = ["blue0", "blue1"] if self.steps % 2 == 0 else ["blue0"]
+        reward = OrderedDict((agent, float(action[agent] + self.index)) for agent in action)
+        return self._observation(agents), reward, OrderedDict([("blue0", done), ("__all__", done)]), {}
+
+
+def test_space_layout_round_trip():
+    env = CounterEnv(1)
+    layout = SpaceLayout(env.action_space)
+    assert layout.size == 6
+    row = np.zeros(layout.size)
+    present = np.zeros(2, dtype=np.bool_)
+    layout.write(row, present, {"blue1": 2})
+    assert present.tolist() == [False, True]
+    assert layout.read(row, present) == OrderedDict([("blue1", 2)])
+
+
+def test_shared_memory_runner_steps_envs():
+    with SharedMemoryEnvRunner(CounterEnv, num_envs=3, timeout=30) as runner:
+        observations = runner.reset()
+        assert observations.shape == (3, 4)
+        np.testing.assert_array_equal(observations[:, 0], [0, 1, 2])
+        assert runner.observation_present.all()
+
+        observations, rewards, dones = runner.step([{"blue0": 1, "blue1": 0}] * 3)
+        np.testing.assert_array_equal(rewards, [[1, 0], [2, 1], [3, 2]])
+        assert not dones.any()
+        assert runner.observation_present[:, 1].tolist() == [False] * 3
+        assert list(runner.read_observations(2)) == ["blue0"]
+        np.testing.assert_array_equal(runner.read_observations(2)["blue0"]["count"], [2, 1])
+
+        # only blue0 is present, its action is the only one applied
+        runner.step([{"blue0": 0}] * 3)
+        np.testing.assert_array_equal(runner.rewards[:, 1], [0, 0, 0])
+
+        # the episode ends, the envs are reset
+        observations, rewards, dones = runner.step([{"blue0": 0, "blue1": 0}] * 3)
+        assert dones[:, 0].all() and dones[:, -1].all()
+        np.testing.assert_array_equal(observations[:, 1], [0, 0, 0])
+
+        with pytest.raises(RuntimeError, match="invalid action"):
+            runner.step([{"blue0": 2, "blue1": 0}] * 3)
+
+
+def test_shared_memory_runner_closes_envs(tmp_path):
+    with SharedMemoryEnvRunner(partial(CounterEnv, closed_dir=str(tmp_path)), num_envs=2, timeout=30) as runner:
+        runner.reset()
+    assert sorted(os.listdir(str(tmp_path))) == ["closed-0", "closed-1"]
@@ -0,0 +1,59 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import pickle
+
+import gym
+import numpy as np
+import pytest
+from ray.rllib.utils.filter import MeanStdFilter, NoFilter
+
+from corl.evaluation.agent_loaders import CheckpointFile
+
+
+class OffsetPolicy:
+    """Policy acting with the observation plus the offset of its state"""
+
+    def __init__(self, observation_space, action_space, config):
+        self.config = config
+        self.offset = None
+        self.explore = None
+
+    def set_state(self, state):
+        self.offset = state["offset"]
+
+    def compute_single_action(self, observation, explore=None):
+        self.explore = explore
+        return observation + self.offset, [], {}
+
+
+def _checkpoint(tmp_path, observation_filter):
+    worker_state = {"state": {"blue0": {"offset": 2.0}}, "filters": {"blue0": observation_filter}}
+    filename = str(tmp_path / "checkpoint-1")
+    with open(filename, "wb") as fp:
+        pickle.dump({"worker": pickle.dumps(worker_state)}, fp)
+    return filename
+
+
+def test_checkpoint_file(tmp_path):
+    space = gym.spaces.Box(-10, 10, shape=(1, ))
+    loader = CheckpointFile(checkpoint_filename=_checkpoint(tmp_path, NoFilter()), policy_id="blue0", policy_class=OffsetPolicy)
+    action_function = loader.load(space, space)
+    np.testing.assert_allclose(action_function(np.array([1.0])), [3.0])
+
+
+def test_checkpoint_file_rejects_observation_filters(tmp_path):
+    space = gym.spaces.Box(-10, 10, shape=(1, ))
+    loader = CheckpointFile(
+        checkpoint_filename=_checkpoint(tmp_path, MeanStdFilter((1, ))), policy_id="blue0", policy_class=OffsetPolicy
+    )
+    with pytest.raises(ValueError, match="MeanStdFilter"):
+        loader.load(space, space)
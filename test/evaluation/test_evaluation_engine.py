@@ -0,0 +1,127 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import json
+import os
+import types
+from collections import OrderedDict
+
+import gym
+import numpy as np
+
+from corl.episode_parameter_providers.simple import SimpleParameterProvider
+from corl.evaluation.agent_loaders import RandomAction
+from corl.evaluation.engine import EvaluationEngine
+from corl.evaluation.metrics import Average, CriteriaRate, EpisodeLength, TotalReward
+from corl.evaluation.recording import Folder
+from corl.evaluation.test_cases import load_test_cases
+from corl.libraries.parameters import ConstantParameter
+
+TEST_CASES = {
+    "episode_parameter_providers": {
+        "environment": {
+            "simulator_reset": {
+                "platforms": {
+                    "blue0": {
+                        "x": {
+                            "value": [2, 4, 6]
+                        }, "speed": {
+                            "value": [1, 2]
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+class DistanceEnv:
+    """blue0 travels x at speed, one step per time unit"""
+
+    def __init__(self):
+        parameters = {
+            ("simulator_reset", "platforms", "blue0", "x"): ConstantParameter(value=1, units="meter"),
+            ("simulator_reset", "platforms", "blue0", "speed"): ConstantParameter(value=1, units="m/s"),
+        }
+        self.config = types.SimpleNamespace(epp_registry={"environment": SimpleParameterProvider(parameters=parameters)})
+        self.agent_dict = {}
+        self.rng = np.random.default_rng(0)
+        self.observation_space = gym.spaces.Dict({"blue0": gym.spaces.Box(0, 100, shape=(1, ))})
+        self.action_space = gym.spaces.Dict({"blue0": gym.spaces.Discrete(2)})
+        self.remaining = 0.0
+        self.speed = 1.0
+
+    def reset(self):
+        parameters, _ = self.config.epp_registry["environment"].get_params(self.rng)
+        self.remaining = parameters[("simulator_reset", "platforms", "blue0", "x")].get_value(self.rng).value
+        self.speed = parameters[("simulator_reset", "platforms", "blue0", "speed")].get_value(self.rng).value
+        return OrderedDict(blue0=np.array([self.remaining], dtype=np.float32))
+
+    def step(self, action):
+        self.remaining -= self.speed
+        done = self.remaining <= 0
+        observation = OrderedDict(blue0=np.array([max(self.remaining, 0)], dtype=np.float32))
+        return observation, {"blue0": 1.0}, {"blue0": done, "__all__": done}, {}
+
+
+def _engine(tmp_path, test_cases, num_workers=0):
+    return EvaluationEngine(
+        env_creator=DistanceEnv,
+        agent_loaders={"blue0": RandomAction(seed=0)},
+        test_cases=test_cases,
+        metrics=[EpisodeLength(name="EpisodeLength"), TotalReward(name="TotalReward", agent="blue0")],
+        aggregates=[
+            Average(name="AverageLength", metrics_to_use="EpisodeLength"),
+            CriteriaRate(name="ShortEpisodes", metrics_to_use="EpisodeLength", operator="<", lhs=3),
+        ],
+        recorders=[Folder(dir=str(tmp_path))],
+        num_workers=num_workers,
+        start_method="fork",
+    )
+
+
+def test_load_test_cases():
+    test_cases = load_test_cases(TEST_CASES)
+    assert len(test_cases) == 6
+    blue0 = ("simulator_reset", "platforms", "blue0")
+    assert test_cases[1] == {"environment": {blue0 + ("x", ): 2, blue0 + ("speed", ): 2}}
+    shuffled = load_test_cases(TEST_CASES, randomize=True, seed=3)
+    assert sorted(map(str, shuffled)) == sorted(map(str, test_cases))
+
+
+def test_evaluation_engine_parallel_and_resume(tmp_path):
+    test_cases = load_test_cases(TEST_CASES)
+    # lengths: x / speed rounded up
+    expected_lengths = [2, 1, 4, 2, 6, 3]
+
+    summary = _engine(tmp_path / "serial", test_cases).run()
+    assert summary["evaluated"] == 6
+    assert summary["AverageLength"] == np.mean(expected_lengths)
+    assert summary["ShortEpisodes"] == 3 / 6
+
+    parallel = _engine(tmp_path / "parallel", test_cases, num_workers=2).run()
+    assert parallel == summary
+    with open(os.path.join(tmp_path, "parallel", Folder.EPISODES_FILE), encoding="utf-8") as fp:
+        records = [json.loads(line) for line in fp]
+    assert sorted((record["test_case"], record["steps"]) for record in records) == list(enumerate(expected_lengths))
+    assert all(record["metrics"]["TotalReward"] == record["steps"] for record in records)
+
+    # interrupt after 3 test cases, the last record is partial
+    resume_dir = tmp_path / "resume"
+    _engine(resume_dir, test_cases[:3]).run()
+    with open(os.path.join(resume_dir, Folder.EPISODES_FILE), "a", encoding="utf-8") as fp:
+        fp.write('{"test_case": 3, "ste')
+    resumed = _engine(resume_dir, test_cases).run()
+    assert resumed["resumed"] == 3 and resumed["evaluated"] == 3
+    assert resumed["AverageLength"] == summary["AverageLength"]
+    with open(os.path.join(resume_dir, Folder.METRICS_FILE), encoding="utf-8") as fp:
+        assert json.load(fp)["ShortEpisodes"] == summary["ShortEpisodes"]
@@ -0,0 +1,108 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import functools
+import types
+
+import gym
+import numpy as np
+
+from corl.environment.utils.episode_data_recorder import EpisodeDataRecorder, platform_state, platform_state_space
+from corl.evaluation.metrics import Average, TotalReward
+from corl.evaluation.recording import Folder
+from corl.evaluation.rescoring import RescoringEngine
+from corl.simulators.docking_1d.controllers import Thrust1dController
+from corl.simulators.docking_1d.sensors import PositionSensor
+from corl.simulators.docking_1d.simulator import Docking1dSimulator
+from corl.simulators.replay.replay_simulator import ReplaySimulator
+
+AGENT_CONFIGS = {"blue0": {"platform_config": {}, "parts_list": [(PositionSensor, {}), (Thrust1dController, {})]}}
+
+
+class ReplayDockingEnv:
+    """Rewards the distance travelled by blue0, the episode ends once it is half a meter from its start"""
+
+    def __init__(self, episodes):
+        self.config = types.SimpleNamespace(sim_warmup_steps=0)
+        self.simulator = ReplaySimulator(agent_configs=AGENT_CONFIGS, simulator=Docking1dSimulator, episodes=episodes)
+        self.done_info = {}
+        self.state = types.SimpleNamespace(episode_state={})
+        self.start = 0.0
+
+    def _position(self):
+        return float(self.simulator.platforms[0].sensors[0].get_measurement()[0])
+
+    def reset(self):
+        self.simulator.reset({})
+        self.start = self._position()
+        return {}
+
+    def step(self, action):
+        self.simulator.platforms[0].controllers[0].apply_control(action["blue0"])
+        self.simulator.step()
+        distance = self.start - self._position()
+        done = distance >= 0.5
+        return {}, {"blue0": distance}, {"blue0": done, "__all__": done}, {}
+
+
+def _record(output_dir, starts, steps=6):
+    simulator = Docking1dSimulator(agent_configs=AGENT_CONFIGS, step_size=1.0)
+    simulator.reset({})
+    action_space = gym.spaces.Dict({"blue0": gym.spaces.Box(-1, 1, shape=(1, ))})
+    recorder = EpisodeDataRecorder(
+        str(output_dir),
+        {
+            "action": action_space,
+            "observation": gym.spaces.Dict({}),
+            "normalized_observation": gym.spaces.Dict({}),
+            "platform": platform_state_space(simulator.platforms),
+        },
+        ["blue0"],
+    )
+    for episode, start in enumerate(starts):
+        simulator.reset({"platforms": {"blue0": {"x": {"value": start}}}})
+        recorder.start_episode(episode)
+        recorder.record(simulator.sim_time, platform=platform_state(simulator.platforms))
+        for _ in range(steps):
+            action = {"blue0": np.array([-1.0], dtype=np.float32)}
+            simulator.platforms[0].controllers[0].apply_control(action["blue0"])
+            simulator.step()
+            recorder.record(simulator.sim_time, action=action, reward={"blue0": 1.0}, platform=platform_state(simulator.platforms))
+    recorder.close()
+
+
+def test_rescoring_engine(tmp_path):
+    _record(tmp_path / "episodes", starts=[10, 20, 30])
+
+    def engine(output_dir, num_workers):
+        return RescoringEngine(
+            env_creator=functools.partial(ReplayDockingEnv, [str(tmp_path / "episodes")]),
+            episodes=[str(tmp_path / "episodes")],
+            metrics=[TotalReward(name="TotalReward", agent="blue0")],
+            aggregates=[Average(name="AverageReward", metrics_to_use="TotalReward")],
+            recorders=[Folder(dir=str(output_dir))],
+            num_workers=num_workers,
+            start_method="fork",
+        )
+
+    serial_dir = tmp_path / "serial"
+    summary = engine(serial_dir, 0).run()
+    assert summary["evaluated"] == 3
+    results = Folder(dir=str(serial_dir)).completed()
+    for result in results:
+        recording = result.parameters["recording"]
+        assert recording["steps"] == 6
+        # the rescored episodes end on the new done, before the end of the recording
+        assert result.steps < 6 and result.dones["__all__"]
+        assert recording["reward.blue0"] == result.steps
+        assert result.rewards["blue0"] > 0
+
+    assert engine(tmp_path / "parallel", 2).run() == summary
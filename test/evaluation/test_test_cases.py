@@ -0,0 +1,32 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import pandas as pd
+import pytest
+
+from corl.evaluation.test_cases import load_test_cases
+
+
+def test_load_test_cases_from_data_frame():
+    data_frame = pd.DataFrame(
+        {
+            "environment.simulator_reset.platforms.blue0.x": [2.0, 4.0, float("nan")],
+            "environment.simulator_reset.platforms.blue0.speed": [1, 2, 3],
+        }
+    )
+    test_cases = load_test_cases(data_frame)
+    blue0 = ("simulator_reset", "platforms", "blue0")
+    assert test_cases[1] == {"environment": {blue0 + ("x", ): 4.0, blue0 + ("speed", ): 2}}
+    # the empty cell is left to the episode parameter provider
+    assert test_cases[2] == {"environment": {blue0 + ("speed", ): 3}}
+
+    with pytest.raises(ValueError):
+        load_test_cases(pd.DataFrame({"speed": [1]}))
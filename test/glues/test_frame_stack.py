@@ -0,0 +1,65 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+from collections import OrderedDict
+from functools import lru_cache
+
+import gym
+import numpy as np
+import pytest
+
+from corl.glues.base_glue import BaseAgentGlue
+from corl.glues.common.frame_stack import FrameStackGlue
+
+
+class CounterGlue(BaseAgentGlue):
+    """Observes the number of get_observation calls"""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.count = 0
+
+    @lru_cache(maxsize=1)
+    def get_unique_name(self) -> str:
+        return "Counter"
+
+    @lru_cache(maxsize=1)
+    def observation_space(self) -> gym.spaces.Space:
+        return gym.spaces.Dict({"direct_observation": gym.spaces.Box(low=0.0, high=10.0, shape=(2, ), dtype=np.float32)})
+
+    def get_observation(self):
+        self.count += 1
+        return OrderedDict(direct_observation=np.full(2, self.count, dtype=np.float32))
+
+
+@pytest.mark.parametrize("zero_copy", [False, True])
+def test_frame_stack_glue(zero_copy):
+    inner = CounterGlue(name="Counter", agent_name="blue0")
+    glue = FrameStackGlue(name="CounterFrameStack", agent_name="blue0", wrapped=inner, num_frames=3, zero_copy=zero_copy)
+
+    assert glue.get_unique_name() == "CounterFrameStack"
+    space = glue.observation_space()["direct_observation"]
+    assert space.shape == (3, 2)
+    np.testing.assert_allclose(space.low, -1.0)
+    np.testing.assert_allclose(space.high, 1.0)
+    assert glue.normalized_observation_space() == glue.observation_space()
+
+    def normalized(count):
+        return count / 5.0 - 1.0
+
+    # the first observation fills the stack
+    np.testing.assert_allclose(glue.get_observation()["direct_observation"][:, 0], [normalized(1)] * 3, rtol=1e-6)
+
+    stacks = [glue.get_observation()["direct_observation"].copy() for _ in range(5)]
+    for step, stack in enumerate(stacks, start=2):
+        expected = [normalized(max(count, 1)) for count in range(step - 2, step + 1)]
+        np.testing.assert_allclose(stack[:, 0], expected, rtol=1e-6)
+        assert space.contains(stack)
@@ -0,0 +1,108 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from corl.dones.openai_gym_done import OpenAIGymDone
+from corl.libraries.env_func_base import evaluate_batched
+from corl.libraries.environment_dict import DoneDict, RewardDict
+from corl.libraries.state_dict import StateDict
+from corl.rewards.reward_func_base import BatchedRewardFuncBase, RewardFuncBaseValidator
+
+
+class DistanceRewardValidator(RewardFuncBaseValidator):
+    scale: float = 1.0
+
+
+class DistanceReward(BatchedRewardFuncBase):
+    """Negative distance of the agent position to the origin, computed for all the agents at once"""
+    batch_calls = 0
+
+    @property
+    def get_validator(self):
+        return DistanceRewardValidator
+
+    @classmethod
+    def batch_call(cls, functors, observation, action, next_observation, state, next_state, observation_space, observation_units):
+        cls.batch_calls += 1
+        positions = np.stack([next_observation[functor.config.agent_name]["position"] for functor in functors])
+        scales = np.array([functor.config.scale for functor in functors])
+        rewards = -scales * np.linalg.norm(positions, axis=1)
+        results = []
+        for functor, value in zip(functors, rewards):
+            reward_dict = RewardDict()
+            reward_dict[functor.config.agent_name] = float(value)
+            results.append(reward_dict)
+        return results
+
+
+def _call_kwargs(next_observation, next_state=None):
+    return {
+        "observation": OrderedDict(),
+        "action": OrderedDict(),
+        "next_observation": next_observation,
+        "state": next_state,
+        "next_state": next_state,
+        "observation_space": StateDict(),
+        "observation_units": StateDict(),
+    }
+
+
+def test_batched_reward_matches_per_agent_call():
+    agents = [f"blue{index}" for index in range(4)]
+    next_observation = OrderedDict((agent, {"position": np.array([index, 1.0, 2.0])}) for index, agent in enumerate(agents))
+    reward_dicts = {
+        agent: RewardDict(processing_funcs=[DistanceReward(agent_name=agent, scale=2.0 if agent == "blue3" else 1.0)])
+        for agent in agents
+    }
+    kwargs = _call_kwargs(next_observation)
+
+    # functors called directly are evaluated as a group of one
+    DistanceReward.batch_calls = 0
+    expected = {agent: reward_dict(**kwargs) for agent, reward_dict in reward_dicts.items()}
+    assert DistanceReward.batch_calls == len(agents)
+
+    # blue3 has a different config and gets its own group
+    DistanceReward.batch_calls = 0
+    evaluate_batched((func for reward_dict in reward_dicts.values() for func in reward_dict.filtered_process_callbacks), **kwargs)
+    assert DistanceReward.batch_calls == 1
+    batched = {agent: reward_dict(**kwargs) for agent, reward_dict in reward_dicts.items()}
+    assert DistanceReward.batch_calls == 2
+
+    for agent in agents:
+        assert batched[agent][0] == expected[agent][0]
+        assert batched[agent][1] == expected[agent][1]
+
+    # the precomputed results are consumed by the call
+    DistanceReward.batch_calls = 0
+    reward_dicts["blue0"](**kwargs)
+    assert DistanceReward.batch_calls == 1
+
+
+def test_batched_done_matches_per_agent_call():
+    agents = ["blue0", "blue1", "red0"]
+    next_state = StateDict({"dones": {"blue0": False, "blue1": True, "red0": False}})
+    done_dicts = {
+        agent: DoneDict(processing_funcs=[OpenAIGymDone(agent_name=agent, platform_name=agent, early_stop=True)])
+        for agent in agents
+    }
+    kwargs = _call_kwargs(OrderedDict(), next_state)
+    del kwargs["state"]
+
+    expected = {agent: done_dict(**kwargs) for agent, done_dict in done_dicts.items()}
+    evaluate_batched((func for done_dict in done_dicts.values() for func in done_dict.filtered_process_callbacks), **kwargs)
+    batched = {agent: done_dict(**kwargs) for agent, done_dict in done_dicts.items()}
+
+    assert batched == expected
+    assert batched["blue1"][0]["blue1"] is True
+    assert batched["blue0"][0]["blue0"] is False
@@ -486,3 +486,21 @@ def test_turn_orig_space_box_to_cont_sample_powerspace():
         outactions,
         [-5.0000005, -3.577709, -2.3237903, -1.2649109, -0.44721362, 0.0, 0.44721392, 1.2649112, 2.3237903, 3.577709, 5.0000005]
     )
+
+
+def test_sample_batch_from_space():
+    space = spaces.Dict(
+        {
+            "box": spaces.Box(low=-2.0, high=3.0, shape=(2, )),
+            "int_box": spaces.Box(low=0, high=4, shape=(3, ), dtype=np.int32),
+            "unbounded": spaces.Box(low=-np.inf, high=np.inf, shape=(1, )),
+            "tuple": spaces.Tuple((spaces.Discrete(5), spaces.MultiDiscrete([2, 3]), spaces.MultiBinary(4))),
+        }
+    )
+    samples = EnvSpaceUtil.sample_batch_from_space(space, 64, np.random.default_rng(0))
+
+    assert len(samples) == 64
+    for sample in samples:
+        assert space.contains(sample)
+    # rows are independent draws
+    assert len({tuple(sample["box"]) for sample in samples}) == 64
@@ -0,0 +1,115 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from corl.libraries.environment_dict import DoneDict, RewardDict
+
+
+def position_reward(**kwargs):
+    reward = RewardDict()
+    reward["blue0"] = kwargs["x"]
+    reward["blue1"] = 1.0
+    return reward
+
+
+def all_reward(**kwargs):
+    reward = RewardDict()
+    reward["blue0"] = 0.5
+    reward["__all__"] = 2.0
+    return reward
+
+
+class NamedDone:
+    name = "named_done"
+
+    def __call__(self, **kwargs):
+        done = DoneDict()
+        done["blue0"] = np.bool_(kwargs["x"] > 1.0)
+        done["__all__"] = False
+        return done
+
+
+def test_reward_dict_reduction_and_info():
+    reward_dict = RewardDict(processing_funcs=[position_reward, all_reward])
+    reward_dict.set_scale_down(2)
+
+    for x in (1.0, 3.0):
+        reward, info = reward_dict(x=x)
+        assert list(reward.items()) == [("__all__", 1.0), ("blue0", (x + 0.5) / 2), ("blue1", 0.5)]
+        assert list(info) == ["position_reward", "all_reward"]
+        assert dict(info["position_reward"]) == {"blue0": x, "blue1": 1.0}
+        # __all__ is reduced but not reported in the info
+        assert dict(info["all_reward"]) == {"blue0": 0.5}
+
+
+def test_reward_dict_plan_follows_registration():
+    reward_dict = RewardDict(processing_funcs=[position_reward])
+    assert dict(reward_dict(x=1.0)[0]) == {"blue0": 1.0, "blue1": 1.0}
+
+    reward_dict.register_func(all_reward)
+    assert dict(reward_dict(x=1.0)[0]) == {"__all__": 2.0, "blue0": 1.5, "blue1": 1.0}
+
+    reward_dict.unregister_func(position_reward)
+    # keys of the previous calls are not reported
+    assert dict(reward_dict(x=1.0)[0]) == {"__all__": 2.0, "blue0": 0.5}
+
+    reward_dict.unregister_funcs()
+    assert not reward_dict(x=1.0)[0]
+
+
+def test_done_dict_nested_and_duplicate_names():
+    inner = DoneDict(processing_funcs=[NamedDone()])
+    done_dict = DoneDict(processing_funcs=[inner])
+    done, info = done_dict(x=2.0)
+    assert done["blue0"] is True
+    assert done["__all__"] is False
+    assert info["named_done"]["blue0"] is True
+
+    duplicate = DoneDict(processing_funcs=[NamedDone(), NamedDone()])
+    with pytest.raises(DoneDict.DuplicateName):
+        duplicate(x=0.0)
+
+
+class SlowReward:
+    thread_safe = True
+
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.thread = None
+
+    def __call__(self, **kwargs):
+        time.sleep(self.delay)
+        self.thread = threading.current_thread()
+        reward = RewardDict()
+        reward["blue0"] = self.delay
+        return reward
+
+
+def test_reward_dict_submit_merges_in_plan_order():
+    functors = [SlowReward("slow", 0.05), SlowReward("fast", 0.0)]
+    reward_dict = RewardDict(processing_funcs=functors + [position_reward])
+    expected = reward_dict(x=1.0)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        reward_dict.submit(executor, x=1.0)
+        reward, info = reward_dict(x=1.0)
+
+    assert all(functor.thread is not threading.main_thread() for functor in functors)
+    assert reward == expected[0]
+    assert list(info) == ["slow", "fast", "position_reward"]
+    assert info == expected[1]
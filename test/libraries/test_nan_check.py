@@ -12,7 +12,7 @@ limitation or restriction. See accompanying README and LICENSE for details.
 
 import pytest
 import numpy as np
-from corl.libraries.nan_check import nan_check_result
+from corl.libraries.nan_check import find_nan, has_nan, nan_check_observations, nan_check_result
 
 
 def test_nan_check():
@@ -29,4 +29,29 @@ def test_nan_check():
         nan_check_result(np.array([np.nan,]))
 
 
+def test_has_nan_nested():
+    sample = {"a": np.array([1.0, 2.0]), "b": [{"c": 1.0, "d": np.array([[0.0]])}], "e": (np.array([1, 2]), True)}
+    assert not has_nan(sample)
+    assert find_nan(sample) is None
 
+    sample["b"][0]["d"][0, 0] = np.nan
+    assert has_nan(sample)
+    assert find_nan(sample) == ("b", 0, "d")
+
+    assert has_nan({"a": None})
+    assert find_nan({"a": None}) == ("a", )
+
+    with pytest.raises(ValueError, match=r"\['b'\]\[0\]\['d'\]"):
+        nan_check_result(sample, skip_trace=True)
+
+
+def test_nan_check_observations():
+    observations = {
+        "blue0": {"ObserveSensor_Sensor_Position": np.array([0.0, 1.0]), "ObserveSensor_Sensor_Velocity": {"direct_observation": 2.0}},
+        "red0": {"ObserveSensor_Sensor_Position": np.array([0.0, 1.0])},
+    }
+    nan_check_observations(observations)
+
+    observations["blue0"]["ObserveSensor_Sensor_Velocity"]["direct_observation"] = float("nan")
+    with pytest.raises(ValueError, match="ObserveSensor_Sensor_Velocity\\['direct_observation'\\] of agent blue0"):
+        nan_check_observations(observations)
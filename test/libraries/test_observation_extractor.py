@@ -0,0 +1,73 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+from collections import OrderedDict
+
+import gym
+import numpy as np
+import pytest
+
+from corl.libraries.observation_extractor import CompiledObservationExtractor, ObservationExtractor
+
+
+def build_space():
+    return gym.spaces.Dict(
+        OrderedDict(
+            [
+                (
+                    "ObserveSensor_Sensor_Fuel",
+                    gym.spaces.Dict(OrderedDict([("direct_observation", gym.spaces.Box(0.0, 1.0, shape=(1, )))]))
+                ),
+                ("ObserveSensor_Sensor_Mode", gym.spaces.Discrete(3)),
+                (
+                    "ObserveSensor_Sensor_Position",
+                    gym.spaces.Dict(OrderedDict([("direct_observation", gym.spaces.Box(-10.0, 10.0, shape=(2, 3)))]))
+                ),
+            ]
+        )
+    )
+
+
+def test_compiled_extractor_matches_observation_extractor():
+    space = build_space()
+    observation = space.sample()
+    for fields, indices in [
+        (["ObserveSensor_Sensor_Fuel", "direct_observation"], 0),
+        (["ObserveSensor_Sensor_Position", "direct_observation"], [1, 2]),
+        (["ObserveSensor_Sensor_Position"], []),
+    ]:
+        extractor = CompiledObservationExtractor(fields, indices, observation_space=space)
+        np.testing.assert_array_equal(extractor(observation), ObservationExtractor(observation, fields, indices))
+
+
+def test_compiled_extractor_validates_fields():
+    with pytest.raises(RuntimeError):
+        CompiledObservationExtractor(["ObserveSensor_Sensor_Speed"], observation_space=build_space())
+
+    extractor = CompiledObservationExtractor(["ObserveSensor_Sensor_Speed"])
+    with pytest.raises(RuntimeError):
+        extractor(build_space().sample())
+
+
+def test_compiled_extractor_batches():
+    space = build_space()
+    observations = [space.sample() for _ in range(5)]
+    flat_observations = np.stack([gym.spaces.flatten(space, observation) for observation in observations])
+
+    extractor = CompiledObservationExtractor(["ObserveSensor_Sensor_Position", "direct_observation"], [1], observation_space=space)
+    expected = np.stack([observation["ObserveSensor_Sensor_Position"]["direct_observation"][1] for observation in observations])
+    np.testing.assert_array_equal(extractor.extract_batch(observations), expected)
+    np.testing.assert_array_equal(extractor.extract_flat(flat_observations), expected)
+
+    discrete_extractor = CompiledObservationExtractor(["ObserveSensor_Sensor_Mode"], observation_space=space)
+    assert discrete_extractor.flat_positions is None
+    with pytest.raises(RuntimeError):
+        discrete_extractor.extract_flat(flat_observations)
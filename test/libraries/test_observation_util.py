@@ -10,7 +10,7 @@ limitation or restriction. See accompanying README and LICENSE for details.
 ---------------------------------------------------------------------------
 """
 from typing import OrderedDict
-from corl.libraries.observation_util import filter_observations, mutate_observations
+from corl.libraries.observation_util import export_observations, filter_observations, mutate_observations
 
 
 def build_sample_observations() -> OrderedDict:
@@ -58,3 +58,36 @@ def test_filter_observations():
     for _agent_id, obs_samples in filtered_observations.items():
         for _obs_name, obs_value in obs_samples.items():
             assert(obs_value >= 5.0)
+
+
+def test_export_observations():
+    observations = build_sample_observations()
+    export_plan = {
+        'red0': OrderedDict([('Test_Observation_b', lambda obs: obs * 2), ('Test_Observation_e', lambda obs: obs * 2)]),
+        'blue0': OrderedDict([('Test_Observation_j', lambda obs: None)]),
+    }
+
+    normalized_observations, filtered_observations = export_observations(observations, export_plan)
+
+    expected_filtered = filter_observations(observations, lambda agent_id, obs_name, _obs: obs_name in export_plan.get(agent_id, {}))
+    expected_normalized = mutate_observations(expected_filtered, lambda agent_id, obs_name, obs: export_plan[agent_id][obs_name](obs))
+    assert filtered_observations == expected_filtered
+    assert normalized_observations == expected_normalized
+    assert list(normalized_observations) == ['red0']
+    assert list(normalized_observations['red0'].items()) == [('Test_Observation_b', 2.0), ('Test_Observation_e', 8.0)]
+
+
+def test_export_observations_reuses_containers():
+    observations = build_sample_observations()
+    export_plan = {agent_id: {'Test_Observation_a': lambda obs: obs + 1} for agent_id in observations}
+    out = export_observations(observations, export_plan)
+    red_normalized = out[0]['red0']
+
+    del observations['blue0']
+    observations['red0']['Test_Observation_a'] = 10.0
+    normalized_observations, filtered_observations = export_observations(observations, export_plan, out=out)
+
+    assert normalized_observations is out[0] and filtered_observations is out[1]
+    assert normalized_observations['red0'] is red_normalized
+    assert normalized_observations == {'red0': {'Test_Observation_a': 11.0}}
+    assert filtered_observations == {'red0': {'Test_Observation_a': 10.0}}
@@ -17,6 +17,7 @@ from gym import spaces
 import typing
 
 from corl.libraries.property import BoxProp, DiscreteProp, MultiBinary, RepeatedProp
+from corl.libraries.units import Convert
 
 
 def test_box_prop():
@@ -98,3 +99,32 @@ def test_MultiBinary_prop():
     output_gym_space = act3_prop.create_space()
     assert isinstance(output_gym_space, spaces.MultiBinary)
     assert (output_gym_space.n == expected_gym_space.n)
+
+
+def test_box_prop_caches():
+
+    class TestProp(BoxProp):
+        name: str = "test"
+        low: typing.List[float] = [0.0, -10.0]
+        high: typing.List[float] = [100.0, 10.0]
+        unit: typing.List[str] = ["m", "ft"]
+        description: str = "test"
+
+    act3_prop = TestProp.shared()
+    assert TestProp.shared() is act3_prop
+    assert TestProp.shared(high=[50.0, 10.0]) is not act3_prop
+
+    assert act3_prop.get_space() is act3_prop.get_space()
+    assert act3_prop.get_space() == act3_prop.create_space()
+    assert not act3_prop.low_array.flags.writeable
+    np.testing.assert_array_equal(act3_prop.high_array, np.array([100.0, 10.0], dtype=np.float32))
+
+    convert = ["ft", "m"]
+    to_factors, from_factors = act3_prop.conversion_factors(convert)
+    values = np.array([3.0, 7.0])
+    expected = [Convert(value, unit, out_unit) for value, unit, out_unit in zip(values.tolist(), act3_prop.unit, convert)]
+    assert (values * to_factors / from_factors).tolist() == expected
+    assert act3_prop.get_converted_space(convert) is act3_prop.get_converted_space(convert)
+
+    with pytest.raises(TypeError):
+        act3_prop.low = [1.0, 1.0]
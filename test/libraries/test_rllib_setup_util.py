@@ -0,0 +1,47 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+from corl.libraries.benchmark_util import write_report
+from corl.libraries.rllib_setup_util import AutoRllibConfigSetup, auto_configure_rllib_config, select_scaling_point
+
+SCALING_CURVE = {
+    "name": "test",
+    "cpus": 16,
+    "points": [
+        {"num_workers": 1, "num_envs_per_worker": 1, "rollout_fragment_length": 200, "throughput": 1000.0, "efficiency": 1.0},
+        {"num_workers": 4, "num_envs_per_worker": 2, "rollout_fragment_length": 200, "throughput": 3800.0, "efficiency": 0.95},
+        {"num_workers": 8, "num_envs_per_worker": 2, "rollout_fragment_length": 100, "throughput": 4200.0, "efficiency": 0.52},
+        {"num_workers": 16, "num_envs_per_worker": 1, "rollout_fragment_length": 200, "throughput": 9000.0, "efficiency": 0.9},
+    ]
+}
+
+
+def test_select_scaling_point():
+    # 16 workers do not fit, 8 workers are over-subscribed
+    point = select_scaling_point(SCALING_CURVE, max_workers=10, min_worker_efficiency=0.7)
+    assert point["num_workers"] == 4
+
+    assert select_scaling_point(SCALING_CURVE, max_workers=10, min_worker_efficiency=0.5)["num_workers"] == 8
+    assert select_scaling_point(SCALING_CURVE, max_workers=0, min_worker_efficiency=0.7) is None
+
+
+def test_auto_configure_from_scaling_curve(tmp_path):
+    curve_file = str(tmp_path / "scaling_curve.json")
+    write_report(SCALING_CURVE, curve_file)
+
+    rllib_config = {"horizon": 1000, "num_cpus_for_driver": 1, "num_cpus_per_worker": 1}
+    setup = AutoRllibConfigSetup(scaling_curve_file=curve_file, ignore_hyper_threads=False)
+    auto_configure_rllib_config(rllib_config, setup, {"CPU": 12})
+
+    assert rllib_config["num_workers"] == {"grid_search": [4]}
+    assert rllib_config["num_envs_per_worker"] == 2
+    assert rllib_config["rollout_fragment_length"] == {"grid_search": [200]}
+    assert rllib_config["train_batch_size"] == {"grid_search": [1600]}
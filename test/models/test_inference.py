@@ -0,0 +1,111 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import gym
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from corl.models.inference import export_torch_frame_stack, parameters_version  # noqa: E402 pylint: disable=wrong-import-position
+from corl.models.torch_frame_stack import TorchFrameStack  # noqa: E402 pylint: disable=wrong-import-position
+
+NUM_FRAMES = 4
+OBS_SIZE = 6
+NUM_ACTIONS = 3
+BATCH_SIZE = 8
+
+# the traced float export runs the same operations as the model
+FLOAT_ATOL = 1e-5
+# dynamic int8 quantization of the Linear layers, the logits and value heads are initialized small
+QUANTIZED_ATOL = 5e-2
+
+
+def build_model(inference_export=False, seed=0):
+    torch.manual_seed(seed)
+    obs_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(NUM_FRAMES, OBS_SIZE), dtype=np.float32)
+    model_config = {
+        "fcnet_hiddens": [32, 32],
+        "fcnet_activation": "tanh",
+        "vf_share_layers": False,
+        "custom_model_config": {
+            "num_frames": NUM_FRAMES, "env_frame_stack": True, "inference_export": inference_export
+        },
+    }
+    return TorchFrameStack(obs_space, gym.spaces.Discrete(NUM_ACTIONS), NUM_ACTIONS, model_config, "test").eval()
+
+
+def observations(seed=0):
+    rng = np.random.default_rng(seed)
+    return torch.from_numpy(rng.uniform(-1.0, 1.0, size=(BATCH_SIZE, NUM_FRAMES * OBS_SIZE)).astype(np.float32))
+
+
+def float_outputs(model, obs):
+    # with autograd enabled the model never takes the inference path
+    logits, _ = model.forward({"obs_flat": obs}, [], None)
+    return logits.detach(), model.value_function().detach()
+
+
+@pytest.mark.parametrize("quantize, atol", [(False, FLOAT_ATOL), (True, QUANTIZED_ATOL)])
+def test_export_matches_float_model(quantize, atol):
+    model = build_model()
+    obs = observations()
+    reference_logits, reference_value = float_outputs(model, obs)
+
+    exported = export_torch_frame_stack(model, quantize=quantize)
+    with torch.inference_mode():
+        logits, value = exported(obs.reshape(BATCH_SIZE, NUM_FRAMES, OBS_SIZE))
+
+    assert logits.shape == reference_logits.shape
+    assert value.shape == reference_value.shape
+    np.testing.assert_allclose(logits.numpy(), reference_logits.numpy(), atol=atol)
+    np.testing.assert_allclose(value.numpy(), reference_value.numpy(), atol=atol)
+
+
+def test_value_function_after_inference_forward():
+    model = build_model(inference_export=True)
+    obs = observations()
+    reference_logits, reference_value = float_outputs(model, obs)
+
+    with torch.no_grad():
+        logits, _ = model.forward({"obs_flat": obs}, [], None)
+        value = model.value_function()
+
+    # pylint: disable=protected-access
+    assert model._inference_module is not None
+    assert value is model._inference_value
+    np.testing.assert_allclose(logits.numpy(), reference_logits.numpy(), atol=FLOAT_ATOL)
+    np.testing.assert_allclose(value.numpy(), reference_value.numpy(), atol=FLOAT_ATOL)
+
+
+def test_export_rebuilt_after_set_weights():
+    model = build_model(inference_export=True)
+    obs = observations()
+    with torch.no_grad():
+        model.forward({"obs_flat": obs}, [], None)
+    # pylint: disable=protected-access
+    first_export = model._inference_module
+    first_version = parameters_version(model)
+
+    # policy.set_weights loads the state dict into the existing parameters
+    other = build_model(seed=1)
+    model.load_state_dict(other.state_dict())
+    assert parameters_version(model) != first_version
+    reference_logits, reference_value = float_outputs(other, obs)
+
+    with torch.no_grad():
+        logits, _ = model.forward({"obs_flat": obs}, [], None)
+        value = model.value_function()
+
+    assert model._inference_module is not first_export
+    assert model._inference_version == parameters_version(model)
+    np.testing.assert_allclose(logits.numpy(), reference_logits.numpy(), atol=FLOAT_ATOL)
+    np.testing.assert_allclose(value.numpy(), reference_value.numpy(), atol=FLOAT_ATOL)
@@ -0,0 +1,42 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import pytest
+
+from corl.parsers.config_cache import CACHE_DIR_ENV
+from corl.parsers.yaml_loader import load_file
+
+
+@pytest.fixture
+def config_tree(tmp_path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    (tmp_path / "root.yml").write_text("agent: !include agent.yml\nitems: [1, !include-extend items.yml, 4]\n")
+    (tmp_path / "agent.yml").write_text("glue: !include glue.json\n")
+    (tmp_path / "items.yml").write_text("- 2\n- 3\n")
+    (tmp_path / "glue.json").write_text('{"name": "first"}')
+    return tmp_path
+
+
+def test_cached_config_matches_parsed_config(config_tree):
+    expected = {"agent": {"glue": {"name": "first"}}, "items": [1, 2, 3, 4]}
+
+    assert load_file(str(config_tree / "root.yml"), use_cache=False) == expected
+    assert load_file(str(config_tree / "root.yml"), use_cache=True) == expected
+    assert list((config_tree / "cache").glob("*.manifest"))
+    assert load_file(str(config_tree / "root.yml"), use_cache=True) == expected
+
+
+def test_cache_invalidated_by_nested_include(config_tree):
+    load_file(str(config_tree / "root.yml"), use_cache=True)
+
+    (config_tree / "glue.json").write_text('{"name": "second"}')
+
+    assert load_file(str(config_tree / "root.yml"), use_cache=True)["agent"]["glue"]["name"] == "second"
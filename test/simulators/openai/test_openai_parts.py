@@ -1,7 +1,7 @@
 import gym
 from corl.simulators.openai_gym.gym_controllers import OpenAIGymMainController
 from corl.simulators.openai_gym.gym_sensors import OpenAiGymStateSensor
-from corl.simulators.openai_gym.gym_simulator import OpenAiGymPlatform
+from corl.simulators.openai_gym.gym_simulator import OpenAiGymPlatform, OpenAIGymSimulator
 
 def test_openai_controller_prop():
     base_environment = gym.make("CartPole-v1")
@@ -17,4 +17,26 @@ def test_openai_controller_prop():
     openai_platform = OpenAiGymPlatform(platform_name="blue0", platform=base_environment, parts_list=base_platform_parts)
 
     assert openai_platform.controllers[0].control_properties.create_space() == base_action_space
-    assert openai_platform.sensors[0].measurement_properties.create_space() == base_obs_space
\ No newline at end of file
+    assert openai_platform.sensors[0].measurement_properties.create_space() == base_obs_space
+
+def test_openai_pooled_platforms():
+    simulator = OpenAIGymSimulator(
+        gym_env="CartPole-v1",
+        pool_platforms=True,
+        agent_configs={
+            "blue0": {
+                "platform_config": {"platform_class": "corl.simulators.openai_gym.gym_simulator.OpenAiGymPlatform"},
+                "parts_list": [(OpenAIGymMainController, {}), (OpenAiGymStateSensor, {})],
+            }
+        },
+    )
+    simulator.reset({})
+    openai_platform = simulator.platforms[0]
+    sensor = openai_platform.sensors[0]
+    openai_platform.operable = False
+
+    state = simulator.reset({})
+    assert simulator.platforms[0] is openai_platform
+    assert openai_platform.sensors[0] is sensor
+    assert openai_platform.operable
+    assert (sensor.get_measurement() == state.obs["blue0"]).all()
@@ -0,0 +1,111 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import gym
+import numpy as np
+import pytest
+
+from corl.environment.utils.episode_data_recorder import (
+    EpisodeDataRecorder,
+    EpisodeDataRecorderConfig,
+    platform_state,
+    platform_state_space,
+    platform_static_attributes,
+)
+from corl.simulators.docking_1d.controllers import Thrust1dController
+from corl.simulators.docking_1d.sensors import PositionSensor, VelocitySensor
+from corl.simulators.docking_1d.simulator import Docking1dSimulator
+from corl.simulators.replay.replay_simulator import ReplaySimulator
+
+AGENT_CONFIGS = {
+    "blue0": {
+        "platform_config": {},
+        "parts_list": [(PositionSensor, {}), (VelocitySensor, {}), (Thrust1dController, {})],
+    }
+}
+
+
+def _record(output_dir, episodes=2, steps=5):
+    """Run the docking simulator and record the platform states"""
+    simulator = Docking1dSimulator(agent_configs=AGENT_CONFIGS, step_size=1.0)
+    simulator.reset({"platforms": {"blue0": {"x": {"value": 10}}}})
+    empty = gym.spaces.Dict({})
+    spaces = {"action": empty, "observation": empty, "normalized_observation": empty}
+    recorder = EpisodeDataRecorder(
+        str(output_dir),
+        {**spaces, "platform": platform_state_space(simulator.platforms, ["position"])},
+        ["blue0"],
+        EpisodeDataRecorderConfig(chunk_steps=2, buffer_steps=4),
+        platform_static_attributes(simulator.platforms, ["name"]),
+    )
+    expected = []
+    for episode in range(episodes):
+        simulator.reset({"platforms": {"blue0": {"x": {"value": 10 * (episode + 1)}}}})
+        recorder.start_episode(episode)
+        recorder.record(simulator.sim_time, platform=platform_state(simulator.platforms, ["position"]))
+        positions = [simulator.platforms[0].position.copy()]
+        for _ in range(steps):
+            simulator.platforms[0].controllers[0].apply_control(np.array([-1.0], dtype=np.float32))
+            simulator.step()
+            recorder.record(simulator.sim_time, platform=platform_state(simulator.platforms, ["position"]))
+            positions.append(simulator.platforms[0].position.copy())
+        expected.append(positions)
+    recorder.close()
+    return expected
+
+
+def test_replay_simulator(tmp_path):
+    expected = _record(tmp_path)
+    config = {"simulator": "corl.simulators.docking_1d.simulator.Docking1dSimulator", "episodes": [str(tmp_path)]}
+    assert ReplaySimulator.parts_simulator(config) is Docking1dSimulator
+
+    simulator = ReplaySimulator(agent_configs=AGENT_CONFIGS, pool_platforms=True, **config)
+    for positions in expected:
+        state = simulator.reset({})
+        platform = state.sim_platforms[0]
+        assert platform.name == "blue0" and platform.operable
+        # the parts of the recorded simulator are built on the replay platform
+        assert isinstance(platform.sensors[0], PositionSensor)
+        for step, position in enumerate(positions):
+            if step:
+                state = simulator.step()
+            np.testing.assert_allclose(platform.sensors[0].get_measurement(), position)
+            np.testing.assert_allclose(platform.position, position)
+            assert simulator.sim_time == pytest.approx(step if step else 0.0)
+        assert simulator.replay_finished
+        with pytest.raises(ValueError):
+            simulator.step()
+        assert platform.name == simulator.reader.static["blue0"]["name"]
+
+    # controls are kept by the platform for the parts reading them back
+    platform.controllers[0].apply_control(np.array([0.5], dtype=np.float32))
+    np.testing.assert_allclose(platform.controllers[0].get_applied_control(), [0.5])
+
+    # the configured episodes start over, a queued episode is replayed first
+    simulator.queue_episode(simulator.config.episodes[1])
+    simulator.reset({})
+    np.testing.assert_allclose(simulator.platforms[0].position, expected[1][0])
+    simulator.reset({})
+    np.testing.assert_allclose(simulator.platforms[0].position, expected[0][0])
+
+    simulator.delete_platform("blue0")
+    assert not simulator.platforms
+    assert not simulator.step().sim_platforms
+
+
+def test_replay_simulator_checks_recording(tmp_path):
+    _record(tmp_path, episodes=1)
+    agent_configs = {**AGENT_CONFIGS, "red0": AGENT_CONFIGS["blue0"]}
+    simulator = ReplaySimulator(agent_configs=agent_configs, simulator=Docking1dSimulator, episodes=[str(tmp_path)])
+    with pytest.raises(ValueError, match="red0"):
+        simulator.reset({})
+    with pytest.raises(ValueError):
+        ReplaySimulator(agent_configs=AGENT_CONFIGS, simulator=Docking1dSimulator, episodes=[str(tmp_path / "missing")])
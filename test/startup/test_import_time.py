@@ -0,0 +1,66 @@
+"""
+---------------------------------------------------------------------------
+Air Force Research Laboratory (AFRL) Autonomous Capabilities Team (ACT3)
+Reinforcement Learning (RL) Core.
+
+This is a US Government Work not subject to copyright protection in the US.
+
+The use, dissemination or disclosure of data in this file is subject to
+limitation or restriction. See accompanying README and LICENSE for details.
+---------------------------------------------------------------------------
+"""
+import subprocess
+import sys
+
+import pytest
+
+from corl.profile_startup import parse_import_time, profile_imports
+
+# generous bounds to absorb CI variance, ray.rllib alone accounts for most of both
+MAX_IMPORT_SECONDS = 30.0
+MAX_MODULE_COUNT = 4000
+
+
+def test_parse_import_time():
+    report = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:        10 |         10 |     json.scanner",
+            "import time:        20 |         30 |   json.decoder",
+            "import time:        40 |         70 | json",
+        ]
+    )
+    records = parse_import_time(report)
+    assert [record.module for record in records] == ["json.scanner", "json.decoder", "json"]
+    assert [record.depth for record in records] == [2, 1, 0]
+    assert records[-1].self_us == 40
+    assert records[-1].cumulative_us == 70
+
+
+def test_multi_agent_env_import_cost():
+    profile = profile_imports("corl.environment.multi_agent_env")
+    imported = {record.module for record in profile.records}
+
+    assert profile.wall_time < MAX_IMPORT_SECONDS
+    assert profile.module_count < MAX_MODULE_COUNT
+    assert not any(module.startswith(("corl.models.", "corl.experiments.", "corl.policies.")) for module in imported)
+
+
+@pytest.mark.parametrize("package", ["corl.models", "corl.experiments", "corl.policies"])
+def test_lazy_package_skips_heavy_modules(package):
+    # run in a fresh interpreter, the test session has already imported ray
+    probe = (
+        f"import sys, {package}; "
+        "print(sorted(m for m in sys.modules if m in ('ray.rllib', 'torch') or m.startswith(('ray.rllib.', 'torch.'))))"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_plugin_walk_skips_lazy_packages():
+    probe = (
+        "import sys; from corl.libraries.plugin_library import PluginLibrary; PluginLibrary.add_paths(['corl']); "
+        "print(sorted(m for m in sys.modules if m.startswith(('corl.models.', 'corl.experiments.rllib', 'corl.experiments.benchmark'))))"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"